@@ -23,10 +23,19 @@ from constants import \
     separator, \
     namespace, \
     olympicsParameters
+from TermCache import TermCache
+from person_index import person_keys_from_graph
 
 class ConstructRDF:
 
-    def __init__(self, g, namespace: dict):
+    def __init__(self, g, namespace: dict, term_cache_size: int = 100000, person_keys: set = None):
+        """
+        :param g: Le graphe rdflib, ou un TripleSink qui écrit les triplets au fil de l'eau.
+        :param namespace: Le dictionnaire des namespaces.
+        :param term_cache_size: Nombre maximal d'URIs (et de littéraux) gardés en cache.
+        :param person_keys: Noms locaux des personnes déjà présentes (voir person_index.py),
+            calculés à partir du graphe s'ils ne sont pas donnés.
+        """
         self.g = g
         self.namespace = namespace
         self.EX = namespace[""][1]
@@ -46,6 +55,8 @@ class ConstructRDF:
         self.records = {}
         self.committees = {}
         self.coordinates = {}
+        self.terms = TermCache.shared(self.EX, term_cache_size)
+        self.person_keys = person_keys
 
     SET_OPERATION = 'SET'
     ADD_OPERATION = 'ADD'
@@ -77,12 +88,21 @@ class ConstructRDF:
             raise ValueError("Opération non valide. Utilisez 'set' ou 'add'.")
 
     def checkIfURIExists(self, name):
-        uri = URIRef(self.EX[name])
+        uri = self.terms.uri(name)
         if (uri, None, None) in self.g:
             return True
         else:
             return False
 
+    def person_index(self):
+        """
+        Ensemble des noms locaux des personnes existantes, construit une seule fois
+        pour remplacer un checkIfURIExists par ligne.
+        """
+        if self.person_keys is None:
+            self.person_keys = person_keys_from_graph(self.g, self.EX)
+        return self.person_keys
+
     def get_property_values(self, element_name, property_name):
         """
         Récupère les valeurs d'une propriété pour un élément donné, en utilisant RDFLib.
@@ -91,8 +111,8 @@ class ConstructRDF:
         :param property_name: Le nom de la propriété (URI simplifié, par ex. "hasMember").
         :return: Liste des noms simplifiés des objets liés par la propriété.
         """
-        element_uri = URIRef(self.EX[element_name])
-        property_uri = URIRef(self.EX[property_name])
+        element_uri = self.terms.uri(element_name)
+        property_uri = self.terms.uri(property_name)
 
         # Récupérer tous les objets liés par la propriété
         objects = [
@@ -113,19 +133,19 @@ class ConstructRDF:
         if teamWirtting in self.teams:
             return False
         operation = self.choose_operation(operation)
-        team_uri = URIRef(self.EX[teamWirtting])
-        self.g.set((team_uri, RDF.type, self.EX["Team"]))
+        team_uri = self.terms.uri(teamWirtting)
+        self.g.set((team_uri, RDF.type, self.terms.uri("Team")))
         if teamName:
-            operation((team_uri, self.EX["name"], Literal(teamName, datatype=XSD.string)))
+            operation((team_uri, self.terms.uri("name"), self.terms.literal(teamName, XSD.string)))
         if teamDescription:
-            operation((team_uri, self.EX["description"], Literal(teamDescription, datatype=XSD.string)))
+            operation((team_uri, self.terms.uri("description"), self.terms.literal(teamDescription, XSD.string)))
         if isDisabled:
-            operation((team_uri, self.EX["isDisabled"], Literal(isDisabled, datatype=XSD.boolean)))
+            operation((team_uri, self.terms.uri("isDisabled"), self.terms.literal(isDisabled, XSD.boolean)))
         if represent:
-            operation((team_uri, self.EX["represent"], URIRef(self.EX[represent])))
+            operation((team_uri, self.terms.uri("represent"), self.terms.uri(represent)))
         if hasMember:
             for member in hasMember:
-                operation((team_uri, self.EX["hasMember"], URIRef(self.EX[member])))
+                operation((team_uri, self.terms.uri("hasMember"), self.terms.uri(member)))
         self.teams[teamWirtting] = team_uri
         return True
 
@@ -134,28 +154,28 @@ class ConstructRDF:
         if personWriting in self.persons:
             return False
         operation = self.choose_operation(operation)
-        person_uri = URIRef(self.EX[personWriting])
-        self.g.set((person_uri, RDF.type, self.EX["Person"]))
+        person_uri = self.terms.uri(personWriting)
+        self.g.set((person_uri, RDF.type, self.terms.uri("Person")))
         if surname:
-            operation((person_uri, self.EX["surname"], Literal(surname, datatype=XSD.string)))
+            operation((person_uri, self.terms.uri("surname"), self.terms.literal(surname, XSD.string)))
         if height:
-            operation((person_uri, self.EX["height"], Literal(height, datatype=XSD.decimal)))
+            operation((person_uri, self.terms.uri("height"), self.terms.literal(height, XSD.decimal)))
         if weight:
-            operation((person_uri, self.EX["weight"], Literal(weight, datatype=XSD.decimal)))
+            operation((person_uri, self.terms.uri("weight"), self.terms.literal(weight, XSD.decimal)))
         if birthDate:
-            operation((person_uri, self.EX["birthDate"], Literal(birthDate, datatype=XSD.date)))
+            operation((person_uri, self.terms.uri("birthDate"), self.terms.literal(birthDate, XSD.date)))
         if deathDate:
-            operation((person_uri, self.EX["deathDate"], Literal(deathDate, datatype=XSD.date)))
+            operation((person_uri, self.terms.uri("deathDate"), self.terms.literal(deathDate, XSD.date)))
         if gender:
-            operation((person_uri, self.EX["gender"], Literal(gender, datatype=XSD.string)))
+            operation((person_uri, self.terms.uri("gender"), self.terms.literal(gender, XSD.string)))
         if hasNationality:
-            operation((person_uri, self.EX["hasNationality"], URIRef(self.EX[hasNationality])))
+            operation((person_uri, self.terms.uri("hasNationality"), self.terms.uri(hasNationality)))
         if isDisabled:
-            operation((person_uri, self.EX["isDisabled"], Literal(isDisabled, datatype=XSD.boolean)))
+            operation((person_uri, self.terms.uri("isDisabled"), self.terms.literal(isDisabled, XSD.boolean)))
         if personName:
-            operation((person_uri, self.EX["name"], Literal(personName, datatype=XSD.string)))
+            operation((person_uri, self.terms.uri("name"), self.terms.literal(personName, XSD.string)))
         if personDescription:
-            operation((person_uri, self.EX["description"], Literal(personDescription, datatype=XSD.string)))
+            operation((person_uri, self.terms.uri("description"), self.terms.literal(personDescription, XSD.string)))
 
         self.persons[personWriting] = person_uri
         return True
@@ -164,17 +184,17 @@ class ConstructRDF:
         if athleteWriting in self.athletes:
             return False
         operation = self.choose_operation(operation)
-        athlete_uri = URIRef(self.EX[athleteWriting])
-        self.g.set((athlete_uri, RDF.type, self.EX["Athlete"]))
+        athlete_uri = self.terms.uri(athleteWriting)
+        self.g.set((athlete_uri, RDF.type, self.terms.uri("Athlete")))
         if isDisabled:
-            operation((athlete_uri, self.EX["isDisabled"], Literal(isDisabled, datatype=XSD.boolean)))
+            operation((athlete_uri, self.terms.uri("isDisabled"), self.terms.literal(isDisabled, XSD.boolean)))
         if represent:
-            operation((athlete_uri, self.EX["represent"], URIRef(self.EX[represent])))
+            operation((athlete_uri, self.terms.uri("represent"), self.terms.uri(represent)))
         if isPartOfTeam :
             for team in isPartOfTeam:
-                operation((athlete_uri, self.EX["isPartOfTeam"], URIRef(self.EX[team])))
+                operation((athlete_uri, self.terms.uri("isPartOfTeam"), self.terms.uri(team)))
         if isPersonOf:
-            operation((athlete_uri, self.EX["isPersonOf"], URIRef(self.EX[isPersonOf])))
+            operation((athlete_uri, self.terms.uri("isPersonOf"), self.terms.uri(isPersonOf)))
         self.athletes[athleteWriting] = athlete_uri
         return True
 
@@ -182,14 +202,14 @@ class ConstructRDF:
         if unitWriting in self.units:
             return False
         operation = self.choose_operation(operation)
-        unit_uri = URIRef(self.EX[unitWriting])
-        self.g.set((unit_uri, RDF.type, self.EX["Unit"]))
+        unit_uri = self.terms.uri(unitWriting)
+        self.g.set((unit_uri, RDF.type, self.terms.uri("Unit")))
         if unitsInScientificDomain:
-            operation((unit_uri, self.EX["unitsInScientificDomain"], Literal(unitsInScientificDomain, datatype=XSD.string)))
+            operation((unit_uri, self.terms.uri("unitsInScientificDomain"), self.terms.literal(unitsInScientificDomain, XSD.string)))
         if unitName:
-            operation((unit_uri, self.EX["unitName"], Literal(unitName, datatype=XSD.string)))
+            operation((unit_uri, self.terms.uri("unitName"), self.terms.literal(unitName, XSD.string)))
         if unitDescription:
-            operation((unit_uri, self.EX["unitDescription"], Literal(unitDescription, datatype=XSD.string)))
+            operation((unit_uri, self.terms.uri("unitDescription"), self.terms.literal(unitDescription, XSD.string)))
         self.units[unitWriting] = unit_uri
         return True
 
@@ -197,16 +217,16 @@ class ConstructRDF:
         if countryWriting in self.countries:
             return False
         operation = self.choose_operation(operation)
-        country_uri = URIRef(self.EX[countryWriting])
-        self.g.set((country_uri, RDF.type, self.EX["Country"]))
+        country_uri = self.terms.uri(countryWriting)
+        self.g.set((country_uri, RDF.type, self.terms.uri("Country")))
         if countryName:
-            operation((country_uri, self.EX["countryName"], Literal(countryName, datatype=XSD.string)))
+            operation((country_uri, self.terms.uri("countryName"), self.terms.literal(countryName, XSD.string)))
         if countryDescription:
-            operation((country_uri, self.EX["countryDescription"], Literal(countryDescription, datatype=XSD.string)))
+            operation((country_uri, self.terms.uri("countryDescription"), self.terms.literal(countryDescription, XSD.string)))
         if countryCode:
-            operation((country_uri, self.EX["countryCode"], Literal(countryCode, datatype=XSD.string)))
+            operation((country_uri, self.terms.uri("countryCode"), self.terms.literal(countryCode, XSD.string)))
         if Coordinate:
-            operation((country_uri, self.EX["Coordinate"], URIRef(self.EX[Coordinate])))
+            operation((country_uri, self.terms.uri("Coordinate"), self.terms.uri(Coordinate)))
         self.countries[countryWriting] = country_uri
         return True
 
@@ -214,18 +234,18 @@ class ConstructRDF:
         if cityWriting in self.cities:
             return False
         operation = self.choose_operation(operation)
-        city_uri = URIRef(self.EX[cityWriting])
-        self.g.set((city_uri, RDF.type, self.EX["City"]))
+        city_uri = self.terms.uri(cityWriting)
+        self.g.set((city_uri, RDF.type, self.terms.uri("City")))
         if cityName:
-            operation((city_uri, self.EX["cityName"], Literal(cityName, datatype=XSD.string)))
+            operation((city_uri, self.terms.uri("cityName"), self.terms.literal(cityName, XSD.string)))
         if cityDescription:
-            operation((city_uri, self.EX["cityDescription"], Literal(cityDescription, datatype=XSD.string)))
+            operation((city_uri, self.terms.uri("cityDescription"), self.terms.literal(cityDescription, XSD.string)))
         if cityCode:
-            operation((city_uri, self.EX["cityCode"], Literal(cityCode, datatype=XSD.string)))
+            operation((city_uri, self.terms.uri("cityCode"), self.terms.literal(cityCode, XSD.string)))
         if Coordinate:
-            operation((city_uri, self.EX["Coordinate"], URIRef(self.EX[Coordinate])))
+            operation((city_uri, self.terms.uri("Coordinate"), self.terms.uri(Coordinate)))
         if hasCountry:
-            operation((city_uri, self.EX["hasCountry"], URIRef(self.EX[hasCountry])))
+            operation((city_uri, self.terms.uri("hasCountry"), self.terms.uri(hasCountry)))
         self.cities[cityWriting] = city_uri
         return True
 
@@ -234,25 +254,25 @@ class ConstructRDF:
         if venueWriting in self.venues:
             return False
         operation = self.choose_operation(operation)
-        venue_uri = URIRef(self.EX[venueWriting])
-        self.g.set((venue_uri, RDF.type, self.EX["Venue"]))
+        venue_uri = self.terms.uri(venueWriting)
+        self.g.set((venue_uri, RDF.type, self.terms.uri("Venue")))
         if venueName:
-            operation((venue_uri, self.EX["venueName"], Literal(venueName, datatype=XSD.string)))
+            operation((venue_uri, self.terms.uri("venueName"), self.terms.literal(venueName, XSD.string)))
         if venueDescription:
-            operation((venue_uri, self.EX["venueDescription"], Literal(venueDescription, datatype=XSD.string)))
+            operation((venue_uri, self.terms.uri("venueDescription"), self.terms.literal(venueDescription, XSD.string)))
         if Coordinate:
-            operation((venue_uri, self.EX["Coordinate"], URIRef(self.EX[Coordinate])))
+            operation((venue_uri, self.terms.uri("Coordinate"), self.terms.uri(Coordinate)))
         if hasCity:
-            operation((venue_uri, self.EX["hasCity"], URIRef(self.EX[hasCity])))
+            operation((venue_uri, self.terms.uri("hasCity"), self.terms.uri(hasCity)))
         if hasCountry:
-            operation((venue_uri, self.EX["hasCountry"], URIRef(self.EX[hasCountry])))
+            operation((venue_uri, self.terms.uri("hasCountry"), self.terms.uri(hasCountry)))
         if hasCode:
-            operation((venue_uri, self.EX["hasCode"], Literal(hasCode, datatype=XSD.string)))
+            operation((venue_uri, self.terms.uri("hasCode"), self.terms.literal(hasCode, XSD.string)))
         if hasCapacity:
-            operation((venue_uri, self.EX["hasCapacity"], Literal(hasCapacity, datatype=XSD.decimal)))
+            operation((venue_uri, self.terms.uri("hasCapacity"), self.terms.literal(hasCapacity, XSD.decimal)))
         if hostEvent:
             for event in hostEvent:
-                operation((venue_uri, self.EX["hosts"], URIRef(self.EX[event])))
+                operation((venue_uri, self.terms.uri("hosts"), self.terms.uri(event)))
         self.venues[venueWriting] = venue_uri
         return True
 
@@ -261,49 +281,49 @@ class ConstructRDF:
         if olympicWriting in self.olympics:
             return False
         operation = self.choose_operation(operation)
-        olympic_uri = URIRef(self.EX[olympicWriting])
-        self.g.set((olympic_uri, RDF.type, self.EX["Olympics"]))
+        olympic_uri = self.terms.uri(olympicWriting)
+        self.g.set((olympic_uri, RDF.type, self.terms.uri("Olympics")))
         if hostCountry:
-            operation((olympic_uri, self.EX["hostCountry"], URIRef(self.EX[hostCountry])))
+            operation((olympic_uri, self.terms.uri("hostCountry"), self.terms.uri(hostCountry)))
         if season:
-            operation((olympic_uri, self.EX["season"], Literal(season, datatype=XSD.string)))
+            operation((olympic_uri, self.terms.uri("season"), self.terms.literal(season, XSD.string)))
         if hasOfficialCity:
-            operation((olympic_uri, self.EX["hasOfficialCity"], URIRef(self.EX[hasOfficialCity])))
+            operation((olympic_uri, self.terms.uri("hasOfficialCity"), self.terms.uri(hasOfficialCity)))
         if hasTrial:
             for trial in hasTrial:
-                operation((olympic_uri, self.EX["hasTrial"], URIRef(self.EX[trial])))
+                operation((olympic_uri, self.terms.uri("hasTrial"), self.terms.uri(trial)))
         if hasVenue:
             for venue in hasVenue:
-                operation((olympic_uri, self.EX["hasVenue"], URIRef(self.EX[venue])))
+                operation((olympic_uri, self.terms.uri("hasVenue"), self.terms.uri(venue)))
         if startDate:
-            operation((olympic_uri, self.EX["startDate"], Literal(startDate, datatype=XSD.date)))
+            operation((olympic_uri, self.terms.uri("startDate"), self.terms.literal(startDate, XSD.date)))
         if endDate:
-            operation((olympic_uri, self.EX["endDate"], Literal(endDate, datatype=XSD.date)))
+            operation((olympic_uri, self.terms.uri("endDate"), self.terms.literal(endDate, XSD.date)))
         if olympicHasEvent:
             for event in olympicHasEvent:
-                operation((olympic_uri, self.EX["olympicHasEvent"], URIRef(self.EX[event])))
+                operation((olympic_uri, self.terms.uri("olympicHasEvent"), self.terms.uri(event)))
         if hasAnnexCity:
             for annex_city in hasAnnexCity:
-                operation((olympic_uri, self.EX["hasAnnexCity"], URIRef(self.EX[annex_city])))
+                operation((olympic_uri, self.terms.uri("hasAnnexCity"), self.terms.uri(annex_city)))
         if name:
-            operation((olympic_uri, self.EX["name"], Literal(name, datatype=XSD.string)))
+            operation((olympic_uri, self.terms.uri("name"), self.terms.literal(name, XSD.string)))
         if description:
-            operation((olympic_uri, self.EX["description"], Literal(description, datatype=XSD.string)))
+            operation((olympic_uri, self.terms.uri("description"), self.terms.literal(description, XSD.string)))
         return True
 
     def createDiscipline(self, operation, disciplineWriting, disciplineHasTrial, name=None, description=None):
         if disciplineWriting in self.disciplines:
             return False
         operation = self.choose_operation(operation)
-        discipline_uri = URIRef(self.EX[disciplineWriting])
-        self.g.set((discipline_uri, RDF.type, self.EX["Discipline"]))
+        discipline_uri = self.terms.uri(disciplineWriting)
+        self.g.set((discipline_uri, RDF.type, self.terms.uri("Discipline")))
         if disciplineHasTrial:
             for trial in disciplineHasTrial:
-                operation((discipline_uri, self.EX["disciplineHasTrial"], URIRef(self.EX[trial])))
+                operation((discipline_uri, self.terms.uri("disciplineHasTrial"), self.terms.uri(trial)))
         if name:
-            operation((discipline_uri, self.EX["name"], Literal(name, datatype=XSD.string)))
+            operation((discipline_uri, self.terms.uri("name"), self.terms.literal(name, XSD.string)))
         if description:
-            operation((discipline_uri, self.EX["description"], Literal(description, datatype=XSD.string)))
+            operation((discipline_uri, self.terms.uri("description"), self.terms.literal(description, XSD.string)))
         return True
 
     def createEvent(self, operation, eventWriting, belongsToTrial, hasDate,
@@ -313,43 +333,43 @@ class ConstructRDF:
         if eventWriting in self.olympics:
             return False
         operation = self.choose_operation(operation)
-        event_uri = URIRef(self.EX[eventWriting])
-        self.g.set((event_uri, RDF.type, self.EX["Event"]))
+        event_uri = self.terms.uri(eventWriting)
+        self.g.set((event_uri, RDF.type, self.terms.uri("Event")))
         if belongsToTrial:
-            operation((event_uri, self.EX["belongsToTrial"], URIRef(self.EX[belongsToTrial])))
+            operation((event_uri, self.terms.uri("belongsToTrial"), self.terms.uri(belongsToTrial)))
         if hasDate:
-            operation((event_uri, self.EX["hasDate"], Literal(hasDate, datatype=XSD.dateTime)))
+            operation((event_uri, self.terms.uri("hasDate"), self.terms.literal(hasDate, XSD.dateTime)))
         if eventHasPerformance:
             for performance in eventHasPerformance:
-                operation((event_uri, self.EX["eventHasPerformance"], URIRef(self.EX[performance])))
+                operation((event_uri, self.terms.uri("eventHasPerformance"), self.terms.uri(performance)))
         if belongToOlympics:
             for participant in hasParticipant:
-                operation((event_uri, self.EX["hasParticipant"], URIRef(self.EX[participant])))
+                operation((event_uri, self.terms.uri("hasParticipant"), self.terms.uri(participant)))
         if hostedBy:
             for venue in hostedBy:
-                operation((event_uri, self.EX["hostedBy"], URIRef(self.EX[venue])))
+                operation((event_uri, self.terms.uri("hostedBy"), self.terms.uri(venue)))
         if belongToOlympics:
-            operation((event_uri, self.EX["belongToOlympics"], URIRef(self.EX[belongToOlympics])))
+            operation((event_uri, self.terms.uri("belongToOlympics"), self.terms.uri(belongToOlympics)))
         if name:
-            operation((event_uri, self.EX["name"], Literal(name, datatype=XSD.string)))
+            operation((event_uri, self.terms.uri("name"), self.terms.literal(name, XSD.string)))
         if description:
-            operation((event_uri, self.EX["description"], Literal(description, datatype=XSD.string)))
+            operation((event_uri, self.terms.uri("description"), self.terms.literal(description, XSD.string)))
         return True
 
     def createTrial(self, operation, trialWriting, belongsToDiscipline, isTeamTrial, name=None, description=None):
         if trialWriting in self.trial:
             return False
         operation = self.choose_operation(operation)
-        trial_uri = URIRef(self.EX[trialWriting])
-        self.g.set((trial_uri, RDF.type, self.EX["Trial"]))
+        trial_uri = self.terms.uri(trialWriting)
+        self.g.set((trial_uri, RDF.type, self.terms.uri("Trial")))
         if belongsToDiscipline:
-            operation((trial_uri, self.EX["belongsToDiscipline"], URIRef(self.EX[belongsToDiscipline])))
+            operation((trial_uri, self.terms.uri("belongsToDiscipline"), self.terms.uri(belongsToDiscipline)))
         if isTeamTrial:
-            operation((trial_uri, self.EX["isTeamTrial"], Literal(isTeamTrial, datatype=XSD.boolean)))
+            operation((trial_uri, self.terms.uri("isTeamTrial"), self.terms.literal(isTeamTrial, XSD.boolean)))
         if name:
-            operation((trial_uri, self.EX["name"], Literal(name, datatype=XSD.string)))
+            operation((trial_uri, self.terms.uri("name"), self.terms.literal(name, XSD.string)))
         if description:
-            operation((trial_uri, self.EX["description"], Literal(description, datatype=XSD.string)))
+            operation((trial_uri, self.terms.uri("description"), self.terms.literal(description, XSD.string)))
         return True
 
     def createPerformance(self, operation, performanceWriting, hasResult, rank, hasEvent, playedBy, hasResultUnit,
@@ -357,70 +377,70 @@ class ConstructRDF:
         if performanceWriting in self.olympics:
             return False
         operation = self.choose_operation(operation)
-        performance_uri = URIRef(self.EX[performanceWriting])
-        self.g.set((performance_uri, RDF.type, self.EX["Performance"]))
+        performance_uri = self.terms.uri(performanceWriting)
+        self.g.set((performance_uri, RDF.type, self.terms.uri("Performance")))
         if hasResult:
-            operation((performance_uri, self.EX["hasResult"], Literal(hasResult, datatype=XSD.string)))
+            operation((performance_uri, self.terms.uri("hasResult"), self.terms.literal(hasResult, XSD.string)))
         if rank:
-            operation((performance_uri, self.EX["rank"], Literal(rank, datatype=XSD.string)))
+            operation((performance_uri, self.terms.uri("rank"), self.terms.literal(rank, XSD.string)))
         if hasEvent:
-            operation((performance_uri, self.EX["hasEvent"], URIRef(self.EX[hasEvent])))
+            operation((performance_uri, self.terms.uri("hasEvent"), self.terms.uri(hasEvent)))
         if playedBy:
-            operation((performance_uri, self.EX["playedBy"], URIRef(self.EX[playedBy])))
+            operation((performance_uri, self.terms.uri("playedBy"), self.terms.uri(playedBy)))
         if hasResultUnit:
-            operation((performance_uri, self.EX["hasResultUnit"], URIRef(self.EX[hasResultUnit])))
+            operation((performance_uri, self.terms.uri("hasResultUnit"), self.terms.uri(hasResultUnit)))
         if isScheduledAtTime:
-            operation((performance_uri, self.EX["isScheduledAtTime"], Literal(isScheduledAtTime, datatype=XSD.dateTime)))
+            operation((performance_uri, self.terms.uri("isScheduledAtTime"), self.terms.literal(isScheduledAtTime, XSD.dateTime)))
         if awarded:
-            operation((performance_uri, self.EX["awarded"], URIRef(self.EX[awarded])))
+            operation((performance_uri, self.terms.uri("awarded"), self.terms.uri(awarded)))
         if name:
-            operation((performance_uri, self.EX["name"], Literal(name, datatype=XSD.string)))
+            operation((performance_uri, self.terms.uri("name"), self.terms.literal(name, XSD.string)))
         if description:
-            operation((performance_uri, self.EX["description"], Literal(description, datatype=XSD.string)))
+            operation((performance_uri, self.terms.uri("description"), self.terms.literal(description, XSD.string)))
         return True
 
     def createMedal(self, operation, medalWriting, name=None, description=None):
         if medalWriting in self.medals:
             return False
         operation = self.choose_operation(operation)
-        medal_uri = URIRef(self.EX[medalWriting])
-        self.g.set((medal_uri, RDF.type, self.EX["Medal"]))
+        medal_uri = self.terms.uri(medalWriting)
+        self.g.set((medal_uri, RDF.type, self.terms.uri("Medal")))
         if name:
-            operation((medal_uri, self.EX["name"], Literal(name, datatype=XSD.string)))
+            operation((medal_uri, self.terms.uri("name"), self.terms.literal(name, XSD.string)))
         if description:
-            operation((medal_uri, self.EX["description"], Literal(description, datatype=XSD.string)))
+            operation((medal_uri, self.terms.uri("description"), self.terms.literal(description, XSD.string)))
         return True
 
     def createWorldRecord(self, operation, recordWriting, recordForTrial, recordHasPerformance, name=None, description=None):
         if recordWriting in self.records:
             return False
         operation = self.choose_operation(operation)
-        record_uri = URIRef(self.EX[recordWriting])
-        self.g.set((record_uri, RDF.type, self.EX["WorldRecord"]))
+        record_uri = self.terms.uri(recordWriting)
+        self.g.set((record_uri, RDF.type, self.terms.uri("WorldRecord")))
         if recordForTrial:
-            operation((record_uri, self.EX["recordForTrial"], URIRef(self.EX[recordForTrial])))
+            operation((record_uri, self.terms.uri("recordForTrial"), self.terms.uri(recordForTrial)))
         if recordHasPerformance:
-            operation((record_uri, self.EX["recordHasPerformance"], URIRef(self.EX[recordHasPerformance])))
+            operation((record_uri, self.terms.uri("recordHasPerformance"), self.terms.uri(recordHasPerformance)))
         if name:
-            operation((record_uri, self.EX["name"], Literal(name, datatype=XSD.string)))
+            operation((record_uri, self.terms.uri("name"), self.terms.literal(name, XSD.string)))
         if description:
-            operation((record_uri, self.EX["description"], Literal(description, datatype=XSD.string)))
+            operation((record_uri, self.terms.uri("description"), self.terms.literal(description, XSD.string)))
         return True
 
     def createOlympicRecord(self, operation, recordWriting, recordForTrial, recordHasPerformance, name=None, description=None):
         if recordWriting in self.records:
             return False
         operation = self.choose_operation(operation)
-        record_uri = URIRef(self.EX[recordWriting])
-        self.g.set((record_uri, RDF.type, self.EX["OlympicRecord"]))
+        record_uri = self.terms.uri(recordWriting)
+        self.g.set((record_uri, RDF.type, self.terms.uri("OlympicRecord")))
         if recordForTrial:
-            operation((record_uri, self.EX["recordForTrial"], URIRef(self.EX[recordForTrial])))
+            operation((record_uri, self.terms.uri("recordForTrial"), self.terms.uri(recordForTrial)))
         if recordHasPerformance:
-            operation((record_uri, self.EX["recordHasPerformance"], URIRef(self.EX[recordHasPerformance])))
+            operation((record_uri, self.terms.uri("recordHasPerformance"), self.terms.uri(recordHasPerformance)))
         if name:
-            operation((record_uri, self.EX["name"], Literal(name, datatype=XSD.string)))
+            operation((record_uri, self.terms.uri("name"), self.terms.literal(name, XSD.string)))
         if description:
-            operation((record_uri, self.EX["description"], Literal(description, datatype=XSD.string)))
+            operation((record_uri, self.terms.uri("description"), self.terms.literal(description, XSD.string)))
         return True
 
     def createOlympicCommittee(self, operation, committeeWriting, recordForTrial, recordHasPerformance, name=None,
@@ -428,30 +448,30 @@ class ConstructRDF:
         if committeeWriting in self.committees:
             return False
         operation = self.choose_operation(operation)
-        committee_uri = URIRef(self.EX[committeeWriting])
-        self.g.set((committee_uri, RDF.type, self.EX["OlympicCommittee"]))
+        committee_uri = self.terms.uri(committeeWriting)
+        self.g.set((committee_uri, RDF.type, self.terms.uri("OlympicCommittee")))
         if recordForTrial:
-            operation((committee_uri, self.EX["recordForTrial"], URIRef(self.EX[recordForTrial])))
+            operation((committee_uri, self.terms.uri("recordForTrial"), self.terms.uri(recordForTrial)))
         if recordHasPerformance:
-            operation((committee_uri, self.EX["recordHasPerformance"], URIRef(self.EX[recordHasPerformance])))
+            operation((committee_uri, self.terms.uri("recordHasPerformance"), self.terms.uri(recordHasPerformance)))
         if name:
-            operation((committee_uri, self.EX["name"], Literal(name, datatype=XSD.string)))
+            operation((committee_uri, self.terms.uri("name"), self.terms.literal(name, XSD.string)))
         if description:
-            operation((committee_uri, self.EX["description"], Literal(description, datatype=XSD.string)))
+            operation((committee_uri, self.terms.uri("description"), self.terms.literal(description, XSD.string)))
         return True
 
     def createCoordinate(self, operation, coordinateWriting, hasLongitude, hasLatitude, name=None, description=None):
         if coordinateWriting in self.coordinates:
             return
         operation = self.choose_operation(operation)
-        coordinate_uri = URIRef(self.EX[coordinateWriting])
-        self.g.set((coordinate_uri, RDF.type, self.EX["Coordinate"]))
+        coordinate_uri = self.terms.uri(coordinateWriting)
+        self.g.set((coordinate_uri, RDF.type, self.terms.uri("Coordinate")))
         if hasLongitude:
-            operation((coordinate_uri, self.EX["hasLongitude"], Literal(hasLongitude, datatype=XSD.decimal)))
+            operation((coordinate_uri, self.terms.uri("hasLongitude"), self.terms.literal(hasLongitude, XSD.decimal)))
         if hasLatitude:
-            operation((coordinate_uri, self.EX["hasLatitude"], Literal(hasLatitude, datatype=XSD.decimal)))
+            operation((coordinate_uri, self.terms.uri("hasLatitude"), self.terms.literal(hasLatitude, XSD.decimal)))
         if name:
-            operation((coordinate_uri, self.EX["name"], Literal(name, datatype=XSD.string)))
+            operation((coordinate_uri, self.terms.uri("name"), self.terms.literal(name, XSD.string)))
         if description:
-            operation((coordinate_uri, self.EX["description"], Literal(description, datatype=XSD.string)))
+            operation((coordinate_uri, self.terms.uri("description"), self.terms.literal(description, XSD.string)))
         return True
\ No newline at end of file
@@ -0,0 +1,357 @@
+import os
+import sqlite3
+import threading
+import uuid
+
+from rdflib import Graph, URIRef, BNode, Literal
+from rdflib.store import Store, VALID_STORE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    datatype TEXT NOT NULL,
+    lang TEXT NOT NULL,
+    UNIQUE (kind, value, datatype, lang)
+);
+CREATE TABLE IF NOT EXISTS triples (
+    s INTEGER NOT NULL,
+    p INTEGER NOT NULL,
+    o INTEGER NOT NULL,
+    PRIMARY KEY (s, p, o)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS triples_pos ON triples (p, o, s);
+CREATE INDEX IF NOT EXISTS triples_osp ON triples (o, s, p);
+CREATE TABLE IF NOT EXISTS namespaces (prefix TEXT PRIMARY KEY, namespace TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+SELECT_TRIPLES = """
+SELECT ts.kind, ts.value, ts.datatype, ts.lang,
+       tp.kind, tp.value, tp.datatype, tp.lang,
+       tobj.kind, tobj.value, tobj.datatype, tobj.lang
+FROM triples t
+JOIN terms ts ON ts.id = t.s
+JOIN terms tp ON tp.id = t.p
+JOIN terms tobj ON tobj.id = t.o
+"""
+
+
+def term_key(term):
+    """Columns (kind, value, datatype, lang) of a term in the terms table"""
+    if isinstance(term, Literal):
+        return "L", str(term), str(term.datatype or ""), term.language or ""
+    if isinstance(term, BNode):
+        return "B", str(term), "", ""
+    return "U", str(term), "", ""
+
+
+def make_term(kind, value, datatype, lang):
+    if kind == "L":
+        return Literal(value, lang=lang or None, datatype=URIRef(datatype) if datatype else None)
+    if kind == "B":
+        return BNode(value)
+    return URIRef(value)
+
+
+class SQLiteStore(Store):
+    """
+    rdflib Store persisted in a SQLite file, to use in place of the in-memory store:
+
+        g = Graph(store=SQLiteStore())
+        g.open("graph.sqlite", create=True)
+
+    The terms are dictionary-encoded (terms table) and the triples are stored as three term ids
+    with SPO, POS and OSP indexes, so any triple pattern is an index lookup. The file is opened
+    in WAL mode: several processes (e.g. Streamlit workers) can read it while one writes.
+
+    The store holds a single graph (not context aware). The changes are committed by addN,
+    commit() and close(). rebuild() replaces the whole content in a single transaction.
+
+    The term ids are cached per connection. Each rebuild writes a new 'generation' in the meta
+    table: when another connection commits a new generation, the caches are dropped.
+    """
+
+    context_aware = False
+    formula_aware = False
+    transaction_aware = False
+    graph_aware = False
+
+    def __init__(self, configuration=None, identifier=None, term_cache_size: int = 200000):
+        self.connection = None
+        self.lock = threading.RLock()
+        self.term_cache_size = term_cache_size
+        self.term_ids = {}
+        self.terms = {}
+        self.in_rebuild = False
+        self.data_version = None
+        self.generation = None
+        super().__init__(configuration, identifier)
+
+    def open(self, configuration, create=True):
+        self.connection = sqlite3.connect(configuration, timeout=60, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        if create:
+            self.connection.executescript(SCHEMA)
+            self.connection.commit()
+        self.generation = self.get_meta("generation")
+        return VALID_STORE
+
+    def close(self, commit_pending_transaction=True):
+        if self.connection is None:
+            return
+        with self.lock:
+            if commit_pending_transaction:
+                self.connection.commit()
+            self.connection.close()
+            self.connection = None
+
+    def commit(self):
+        with self.lock:
+            self.connection.commit()
+
+    def clear_caches(self):
+        self.term_ids.clear()
+        self.terms.clear()
+
+    def check_generation(self):
+        """
+        Drop the term caches if another connection rebuilt the store since the last call:
+        the same term may have a new id. PRAGMA data_version only changes when
+        another connection commits, so the meta table is rarely read.
+        """
+        if self.in_rebuild:
+            return
+        data_version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == self.data_version:
+            return
+        self.data_version = data_version
+        generation = self.get_meta("generation")
+        if generation != self.generation:
+            self.generation = generation
+            self.clear_caches()
+
+    def term_id(self, term, create=False):
+        """Id of a term, or None if it is not in the store (and create is False)"""
+        key = term_key(term)
+        term_id = self.term_ids.get(key)
+        if term_id is not None:
+            return term_id
+        if create:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO terms (kind, value, datatype, lang) VALUES (?, ?, ?, ?)", key)
+        row = self.connection.execute(
+            "SELECT id FROM terms WHERE kind = ? AND value = ? AND datatype = ? AND lang = ?", key).fetchone()
+        if row is None:
+            return None
+        if len(self.term_ids) >= self.term_cache_size:
+            self.term_ids.clear()
+        self.term_ids[key] = row[0]
+        return row[0]
+
+    def make_term(self, columns):
+        term = self.terms.get(columns)
+        if term is None:
+            if len(self.terms) >= self.term_cache_size:
+                self.terms.clear()
+            term = self.terms[columns] = make_term(*columns)
+        return term
+
+    def add(self, triple, context, quoted=False):
+        with self.lock:
+            self.check_generation()
+            ids = tuple(self.term_id(term, create=True) for term in triple)
+            self.connection.execute("INSERT OR IGNORE INTO triples (s, p, o) VALUES (?, ?, ?)", ids)
+        Store.add(self, triple, context, quoted)
+
+    def addN(self, quads, batch_size: int = 10000):
+        batch = []
+        with self.lock:
+            self.check_generation()
+            for s, p, o, _ in quads:
+                batch.append((self.term_id(s, create=True), self.term_id(p, create=True),
+                              self.term_id(o, create=True)))
+                if len(batch) >= batch_size:
+                    self.connection.executemany("INSERT OR IGNORE INTO triples (s, p, o) VALUES (?, ?, ?)", batch)
+                    batch = []
+            if batch:
+                self.connection.executemany("INSERT OR IGNORE INTO triples (s, p, o) VALUES (?, ?, ?)", batch)
+            if not self.in_rebuild:
+                self.connection.commit()
+
+    def pattern_condition(self, triple_pattern):
+        """
+        SQL condition and parameters of a triple pattern, or None if a bound term is not in the store.
+        """
+        conditions = []
+        parameters = []
+        for column, term in zip(("t.s", "t.p", "t.o"), triple_pattern):
+            if term is None:
+                continue
+            term_id = self.term_id(term)
+            if term_id is None:
+                return None
+            conditions.append(f"{column} = ?")
+            parameters.append(term_id)
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), parameters
+
+    def remove(self, triple_pattern, context=None):
+        with self.lock:
+            self.check_generation()
+            condition = self.pattern_condition(triple_pattern)
+            if condition is None:
+                return
+            where, parameters = condition
+            self.connection.execute(f"DELETE FROM triples AS t{where}", parameters)
+        Store.remove(self, triple_pattern, context)
+
+    def triples(self, triple_pattern, context=None):
+        with self.lock:
+            self.check_generation()
+            condition = self.pattern_condition(triple_pattern)
+            if condition is None:
+                return
+            where, parameters = condition
+            cursor = self.connection.execute(SELECT_TRIPLES + where, parameters)
+        while True:
+            # The lock is not held while the caller consumes the triples (nested patterns of SPARQL)
+            with self.lock:
+                rows = cursor.fetchmany(1000)
+            if not rows:
+                return
+            for row in rows:
+                triple = (self.make_term(row[0:4]), self.make_term(row[4:8]), self.make_term(row[8:12]))
+                yield triple, iter(())
+
+    def __len__(self, context=None):
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM triples").fetchone()[0]
+
+    def contexts(self, triple=None):
+        return iter(())
+
+    def bind(self, prefix, namespace, override=True):
+        prefix, namespace = str(prefix), str(namespace)
+        with self.lock:
+            bound_namespace = self.connection.execute(
+                "SELECT namespace FROM namespaces WHERE prefix = ?", (prefix,)).fetchone()
+            bound_prefix = self.connection.execute(
+                "SELECT prefix FROM namespaces WHERE namespace = ?", (namespace,)).fetchone()
+            if not override and (bound_namespace or bound_prefix):
+                return
+            self.connection.execute("DELETE FROM namespaces WHERE prefix = ? OR namespace = ?", (prefix, namespace))
+            self.connection.execute("INSERT INTO namespaces (prefix, namespace) VALUES (?, ?)", (prefix, namespace))
+
+    def namespace(self, prefix):
+        with self.lock:
+            row = self.connection.execute("SELECT namespace FROM namespaces WHERE prefix = ?", (prefix,)).fetchone()
+        return URIRef(row[0]) if row else None
+
+    def prefix(self, namespace):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT prefix FROM namespaces WHERE namespace = ?", (str(namespace),)).fetchone()
+        return row[0] if row else None
+
+    def namespaces(self):
+        with self.lock:
+            rows = self.connection.execute("SELECT prefix, namespace FROM namespaces").fetchall()
+        for prefix, namespace in rows:
+            yield prefix, URIRef(namespace)
+
+    def clear(self):
+        """Remove all the triples and terms of the store"""
+        self.rebuild(None, lambda: None)
+
+    def rebuild(self, source, load, timeout: float = 3600):
+        """
+        Replace the content of the store in a single transaction: remove everything, call load()
+        (which adds the triples through the graph), then record source in the meta table.
+
+        The transaction takes the write lock of the database (BEGIN IMMEDIATE): the readers of
+        other processes keep seeing the previous content until the commit, and a concurrent
+        rebuild waits (up to timeout seconds) then finds the store up to date.
+
+        Parameters:
+            source (str): Version of the loaded data. None always rebuilds and leaves no source.
+            load (callable): Called without argument inside the transaction.
+
+        Returns:
+            bool: False if the store already held source (nothing was done).
+        """
+        with self.lock:
+            if source is not None and self.get_meta("source") == source:
+                return False
+            if self.connection.in_transaction:
+                self.connection.commit()
+            self.connection.execute(f"PRAGMA busy_timeout = {int(timeout * 1000)}")
+            try:
+                self.connection.execute("BEGIN IMMEDIATE")
+            finally:
+                self.connection.execute("PRAGMA busy_timeout = 60000")
+            self.in_rebuild = True
+            try:
+                if source is not None and self.get_meta("source") == source:
+                    self.connection.rollback()
+                    return False
+                self.connection.execute("DELETE FROM triples")
+                self.connection.execute("DELETE FROM terms")
+                self.connection.execute("DELETE FROM meta")
+                self.clear_caches()
+                load()
+                self.generation = uuid.uuid4().hex
+                self.connection.execute("INSERT INTO meta (key, value) VALUES ('generation', ?)", (self.generation,))
+                if source is not None:
+                    self.connection.execute("INSERT INTO meta (key, value) VALUES ('source', ?)", (source,))
+                self.connection.commit()
+            except BaseException:
+                self.connection.rollback()
+                self.generation = None
+                self.clear_caches()
+                raise
+            finally:
+                self.in_rebuild = False
+            self.data_version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+            return True
+
+    def get_meta(self, key):
+        with self.lock:
+            row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        with self.lock:
+            self.connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+            if not self.in_rebuild:
+                self.connection.commit()
+
+
+def open_sqlite_graph(path: str):
+    """Open (or create) a Graph persisted in the SQLite file path"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    g = Graph(store=SQLiteStore())
+    g.open(path, create=True)
+    return g
+
+
+def bulk_load(g: Graph, file_path: str, format: str = "turtle", batch_size: int = 50000):
+    """
+    Load an RDF file into a graph backed by a SQLiteStore: the file is parsed in memory once,
+    then its triples are inserted in bulk, batch_size at a time.
+    Call it from the load function of SQLiteStore.rebuild to replace the content atomically.
+    """
+    file_graph = Graph()
+    file_graph.parse(file_path, format=format)
+    for prefix, namespace in file_graph.namespaces():
+        g.bind(prefix, namespace, override=False)
+    store = g.store
+    batch = []
+    for s, p, o in file_graph:
+        batch.append((s, p, o, g))
+        if len(batch) >= batch_size:
+            store.addN(batch)
+            batch = []
+    store.addN(batch)
+    return len(file_graph)
@@ -0,0 +1,67 @@
+from functools import lru_cache
+
+from rdflib import URIRef, Literal
+
+from cache_stats import cache_info_stats
+
+
+class TermCache:
+    """
+    Bounded cache of the rdflib terms built by ConstructRDF.
+
+    The same countries, disciplines, trials, medals and property names come
+    back on every CSV row: each URIRef / Literal is built once and the same
+    object is reused by all the triples that mention it.
+
+    ConstructRDF uses the cache shared by the whole process (see shared), so
+    the terms are also reused between the ConstructRDF of the shards, of the
+    rows of the incremental mode and of successive passes.
+    """
+
+    # Shared caches, by (namespace, maxsize)
+    instances = {}
+
+    @classmethod
+    def shared(cls, namespace, maxsize: int = 100000):
+        """
+        Return the cache shared by the process for this namespace and size.
+        """
+        key = (str(namespace), maxsize)
+        if key not in cls.instances:
+            cls.instances[key] = cls(namespace, maxsize)
+        return cls.instances[key]
+
+    @classmethod
+    def shared_stats(cls):
+        """
+        Return the stats of the shared caches, by namespace.
+        """
+        return {namespace: cache.stats() for (namespace, _), cache in cls.instances.items()}
+
+    def __init__(self, namespace, maxsize: int = 100000):
+        """
+        Parameters:
+            namespace (Namespace): The namespace of the local names.
+            maxsize (int): The maximum number of URIs (and of literals) kept in the cache.
+        """
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.uri = lru_cache(maxsize=maxsize)(self.create_uri)
+        # typed=True: 0 and 0.0 (or 1 and True) must not share the same literal
+        self.literal = lru_cache(maxsize=maxsize, typed=True)(self.create_literal)
+
+    def create_uri(self, name):
+        return URIRef(self.namespace[name])
+
+    def create_literal(self, value, datatype):
+        return Literal(value, datatype=datatype)
+
+    def stats(self):
+        """
+        Return the hits, misses, size and hit rate of the URI and literal caches.
+        """
+        return {"uri": cache_info_stats(self.uri), "literal": cache_info_stats(self.literal)}
+
+    def clear(self):
+        self.uri.cache_clear()
+        self.literal.cache_clear()
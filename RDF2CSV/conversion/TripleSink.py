@@ -0,0 +1,219 @@
+from rdflib import Graph
+from rdflib.namespace import NamespaceManager
+from rdflib.plugins.serializers.nt import _nt_row
+
+
+class TripleSink:
+    """
+    Destination of the triples emitted by ConstructRDF.
+
+    A sink exposes the small part of the rdflib Graph interface used by
+    ConstructRDF (add, set and bind), so it can be given to ConstructRDF
+    in place of a Graph. Streaming sinks write each triple to disk as soon
+    as it is emitted instead of keeping the whole graph in memory.
+    """
+
+    def add(self, triple):
+        raise NotImplementedError
+
+    def set(self, triple):
+        raise NotImplementedError
+
+    def bind(self, prefix, namespace):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class GraphBufferSink(TripleSink):
+    """
+    Accumulate the triples in a buffer and insert them into an rdflib Graph
+    in bulk (one addN per batch) instead of one add/set per triple.
+
+    SET semantics are resolved on the buffer before flushing: a SET drops the
+    triples with the same subject and predicate buffered before it, and the
+    matching triples already in the graph are removed once per batch.
+    """
+
+    def __init__(self, graph: Graph, batch_size: int = 10000):
+        self.graph = graph
+        self.batch_size = batch_size
+        self.buffer = []
+        self.last_set = {}
+        self.buffered_subjects = set()
+        self.count = 0
+
+    def add(self, triple):
+        self.buffer.append(triple)
+        self.buffered_subjects.add(triple[0])
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def set(self, triple):
+        self.last_set[(triple[0], triple[1])] = len(self.buffer)
+        self.add(triple)
+
+    def flush(self):
+        if not self.buffer:
+            return
+        last_set = self.last_set
+        for subject, predicate in last_set:
+            self.graph.remove((subject, predicate, None))
+        graph = self.graph
+        self.graph.addN(
+            (s, p, o, graph)
+            for i, (s, p, o) in enumerate(self.buffer)
+            if last_set.get((s, p), i) <= i
+        )
+        self.count += len(self.buffer)
+        self.buffer = []
+        self.last_set = {}
+        self.buffered_subjects = set()
+
+    def bind(self, prefix, namespace):
+        self.graph.bind(prefix, namespace)
+
+    def __contains__(self, triple):
+        subject, predicate, obj = triple
+        # A buffered SET never removes the last triple of a subject,
+        # so a subject lookup does not need to flush the buffer.
+        if predicate is None and obj is None:
+            return subject in self.buffered_subjects or triple in self.graph
+        self.flush()
+        return triple in self.graph
+
+    def triples(self, triple):
+        self.flush()
+        return self.graph.triples(triple)
+
+    def subjects(self, predicate=None, object=None, unique=False):
+        self.flush()
+        return self.graph.subjects(predicate, object, unique)
+
+    def qname(self, uri):
+        return self.graph.qname(uri)
+
+    def close(self):
+        self.flush()
+
+
+class NTriplesSink(TripleSink):
+    """
+    Write the triples incrementally to an N-Triples file.
+
+    Duplicate triples are dropped by keeping the N-Triples line of every
+    distinct triple written (exact comparison, no hash collision), and the
+    value of every subject/predicate pair written with SET. This state grows
+    with the output: about the size of the output file plus the overhead of
+    a Python set entry (~100 bytes) per triple. With dedup=False, only the
+    SET pairs are kept, for inputs known to be free of duplicates.
+
+    A stream cannot retract a line already written: a SET replacing a value
+    that has already been written raises a ValueError.
+    """
+
+    def __init__(self, destination: str, dedup: bool = True, encoding: str = "utf-8"):
+        self.destination = destination
+        self.dedup = dedup
+        self.file = open(destination, "w", encoding=encoding)
+        self.written = set()
+        self.set_values = {}
+        self.count = 0
+
+    def format_triple(self, triple):
+        return _nt_row(triple)
+
+    def write(self, triple, line):
+        self.file.write(line)
+
+    def add(self, triple):
+        line = self.format_triple(triple)
+        if self.dedup:
+            if line in self.written:
+                return
+            self.written.add(line)
+        self.count += 1
+        self.write(triple, line)
+
+    def set(self, triple):
+        subject, predicate, obj = triple
+        key = (subject, predicate)
+        if key in self.set_values:
+            if self.set_values[key] == obj:
+                return
+            raise ValueError(
+                f"Cannot replace the value of {predicate} for {subject}: "
+                f"the previous value has already been written to '{self.destination}'."
+            )
+        self.set_values[key] = obj
+        self.add(triple)
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+class TurtleSink(NTriplesSink):
+    """
+    Write the triples incrementally to a Turtle file.
+
+    Consecutive triples sharing the same subject (as emitted by one createX
+    call of ConstructRDF) are grouped in a single block using ';'.
+    Prefixes must be bound before the first triple is written.
+    """
+
+    def __init__(self, destination: str, dedup: bool = True, encoding: str = "utf-8"):
+        super().__init__(destination, dedup, encoding)
+        self.namespace_manager = NamespaceManager(Graph(), bind_namespaces="none")
+        self.current_subject = None
+
+    def bind(self, prefix, namespace):
+        if self.count:
+            raise ValueError("Prefixes must be bound before the first triple is written.")
+        self.namespace_manager.bind(prefix, namespace, override=True, replace=True)
+        self.file.write(f"@prefix {prefix}: <{namespace}> .\n")
+
+    def format_triple(self, triple):
+        return " ".join(term.n3(self.namespace_manager) for term in triple)
+
+    def write(self, triple, line):
+        subject = triple[0]
+        predicate_object = line[len(subject.n3(self.namespace_manager)) + 1:]
+        if subject == self.current_subject:
+            self.file.write(f" ;\n    {predicate_object}")
+        else:
+            if self.current_subject is not None:
+                self.file.write(" .\n")
+            self.file.write(f"\n{subject.n3(self.namespace_manager)}\n    {predicate_object}")
+            self.current_subject = subject
+
+    def close(self):
+        if not self.file.closed and self.current_subject is not None:
+            self.file.write(" .\n")
+        super().close()
+
+
+STREAM_SINKS = {
+    "nt": NTriplesSink,
+    "turtle": TurtleSink,
+}
+
+
+def open_sink(destination: str, stream_format: str, **kwargs):
+    """
+    Open a streaming sink writing to the given file.
+
+    Parameters:
+        destination (str): The output file path.
+        stream_format (str): 'nt' (N-Triples) or 'turtle'.
+    """
+    if stream_format not in STREAM_SINKS:
+        raise ValueError(f"Unknown stream format '{stream_format}'. Use one of {list(STREAM_SINKS)}.")
+    return STREAM_SINKS[stream_format](destination, **kwargs)
@@ -31,6 +31,10 @@ from ConstructRDF import ConstructRDF
 
 def function_for_athlete_og_24(reader, constructorRDF):
     globalOperation = ConstructRDF.SET_OPERATION
+    # Jointure par hachage : les personnes existantes sont indexées une seule fois,
+    # puis chaque ligne du CSV est cherchée dans l'index au lieu d'interroger le graphe
+    persons = constructorRDF.person_index()
+    enriched = 0
     for row in reader:
         givenName= capitalize_words(row["Preferred Given Name"].replace(" ", separator))
         familyName= row["Preferred Family Name"].replace(" ", separator).upper()
@@ -40,9 +44,9 @@ def function_for_athlete_og_24(reader, constructorRDF):
         #death = birthday+ 1 day
         dateOfDeath = addXDays(dateOfBirth, 1)
         personWriting = givenName + separator + familyName + "_person"
-        if not constructorRDF.checkIfURIExists(personWriting):
+        if personWriting not in persons:
             continue
-        print(familyName, givenName, dateOfBirth)
+        enriched += 1
 
         constructorRDF.createPerson(operation = globalOperation,
                                     personWriting = personWriting,
@@ -56,3 +60,5 @@ def function_for_athlete_og_24(reader, constructorRDF):
                                     hasNationality = None,
                                     isDisabled = None,
                                     personDescription = None)
+
+    print(f"{enriched} athletes enriched out of {len(persons)} persons")
@@ -0,0 +1,323 @@
+import argparse
+import csv
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+MEDAL_FIELDS = ["Medal_type", "Medal_code", "Medal_date", "Name", "Gender", "Discipline", "Code_Discipline",
+                "Event", "url_event", "Country_code", "Country"]
+ATHLETE_FIELDS = ["Preferred Family Name", "Preferred Given Name", "National Olympic Committee", "Nationality",
+                  "Gender", "Date of Birth", "Discipline", "Event"]
+VENUE_FIELDS = ["venue", "sports", "date_start", "date_end", "tag", "url"]
+
+MEDAL_TYPES = [("Gold Medal", 1), ("Silver Medal", 2), ("Bronze Medal", 3)]
+SYLLABLES = ["ka", "lo", "mi", "ra", "te", "vo", "su", "ne", "di", "an", "el", "or", "is", "ul", "be", "zo"]
+
+RESULTS_FILE = "benchmark_results.jsonl"
+
+
+def fake_word(rng, min_syllables=2, max_syllables=4):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(min_syllables, max_syllables)))
+
+
+def make_universe(rng, disciplines=40, events_per_discipline=12, countries=200, persons=None):
+    """
+    Draw the disciplines, events, countries and athletes shared by the generated files.
+    """
+    universe = {"disciplines": [], "countries": [], "persons": []}
+    for i in range(disciplines):
+        name = fake_word(rng).capitalize() + " " + fake_word(rng).capitalize()
+        code = (name.replace(" ", "").upper() + "XXX")[:3] + str(i)
+        events = [f"{rng.choice(['Men', 'Women', 'Mixed'])}'s {fake_word(rng).capitalize()} {rng.randint(1, 400)}m"
+                  for _ in range(events_per_discipline)]
+        universe["disciplines"].append((name, code, events))
+    for i in range(countries):
+        code = "".join(chr(ord("A") + i // 26 ** k % 26) for k in (2, 1, 0))
+        universe["countries"].append((code, fake_word(rng, 2, 3).capitalize()))
+    for i in range(persons):
+        # A single given name: the athlete pass rebuilds the person name from the two name columns
+        universe["persons"].append((fake_word(rng).capitalize(), (fake_word(rng, 2, 3) + str(i)).upper(),
+                                    rng.choice("MW"), rng.choice(universe["countries"])))
+    return universe
+
+
+def edition_days(editions, first_year=2024):
+    """
+    Competition days of the Games editions (one edition every 4 years, going back from first_year).
+    """
+    days = []
+    for edition in range(editions):
+        start = date(first_year - 4 * edition, 7, 27)
+        days.extend(start + timedelta(days=d) for d in range(16))
+    return days
+
+
+def generate_medals(file_path, rows, universe, days, rng):
+    with open(file_path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(MEDAL_FIELDS)
+        for _ in range(rows):
+            medal_type, medal_code = rng.choice(MEDAL_TYPES)
+            discipline, code, events = rng.choice(universe["disciplines"])
+            event = rng.choice(events)
+            given, family, gender, (country_code, country) = rng.choice(universe["persons"])
+            writer.writerow([
+                medal_type, medal_code, rng.choice(days).strftime("%d/%m/%Y"), f"{given} {family}", gender,
+                discipline, code, event,
+                f"https://olympics.com/en/results/{discipline.lower().replace(' ', '-')}/{rng.randint(0, 10**6)}",
+                country_code, country,
+            ])
+
+
+def generate_athletes(file_path, rows, universe, rng, match_rate=0.5):
+    """
+    Generate the athlete file: about match_rate of the rows are medal winners of the medal file.
+    """
+    with open(file_path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(ATHLETE_FIELDS)
+        for i in range(rows):
+            if rng.random() < match_rate:
+                given, family, gender, (country_code, _) = rng.choice(universe["persons"])
+            else:
+                given, family, gender = fake_word(rng).capitalize(), (fake_word(rng) + "X" + str(i)).upper(), "M"
+                country_code = rng.choice(universe["countries"])[0]
+            discipline, code, events = rng.choice(universe["disciplines"])
+            birth = date(1960, 1, 1) + timedelta(days=rng.randint(0, 16000))
+            writer.writerow([family, given.upper(), country_code, country_code, gender, birth.isoformat(), code,
+                             rng.choice(events)])
+
+
+def generate_venues(file_path, universe, rng, venues=35):
+    with open(file_path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(VENUE_FIELDS)
+        disciplines = [name for name, _, _ in universe["disciplines"]]
+        for i in range(venues):
+            name = f"{fake_word(rng).capitalize()} Arena {i}"
+            sports = rng.sample(disciplines, min(len(disciplines), rng.randint(1, 3)))
+            tag = name.lower().replace(" ", "-")
+            writer.writerow([name, repr(sports), "2024-07-27T09:00:00Z", "2024-08-11T16:00:00Z", tag,
+                             f"https://olympics.com/en/venues/{tag}"])
+
+
+def generate_dataset(data_dir, medal_rows, athlete_rows, editions=10, seed=0):
+    """
+    Generate synthetic medal, athlete and venue CSV files with the schemas of the files of RDF2CSV/data.
+
+    Returns:
+        dict: The paths of the generated files.
+    """
+    rng = random.Random(seed)
+    os.makedirs(data_dir, exist_ok=True)
+    universe = make_universe(rng, persons=max(100, medal_rows // 3))
+    files = {
+        "medal": os.path.join(data_dir, "medal_og_24.csv"),
+        "athlete": os.path.join(data_dir, "athlete_og_24.csv"),
+        "venue": os.path.join(data_dir, "venues_og_24.csv"),
+    }
+    generate_venues(files["venue"], universe, rng)
+    generate_medals(files["medal"], medal_rows, universe, edition_days(editions), rng)
+    generate_athletes(files["athlete"], athlete_rows, universe, rng)
+    return files
+
+
+def benchmark_generate_rdf(g, f, namespace, fileName, person_keys=None):
+    """
+    Same dispatch as function_generate_rdf, on the name of the file whatever the path separator.
+    """
+    from constants import BlankCoordinateWritting, BlankCoordinateLongitude, BlankCoordinateLatitude, \
+        BlankCoordinateName, BlankCoordinateDescription
+    from ConstructRDF import ConstructRDF
+    from medal_og_24 import function_for_medal_og_24
+    from athlete_og_24 import function_for_athlete_og_24
+
+    constructorRDF = ConstructRDF(g, namespace, person_keys=person_keys)
+    reader = csv.DictReader(f, delimiter=';')
+    constructorRDF.createCoordinate(ConstructRDF.SET_OPERATION, BlankCoordinateWritting, BlankCoordinateLongitude,
+                                    BlankCoordinateLatitude, BlankCoordinateName, BlankCoordinateDescription)
+    if os.path.basename(fileName) == "medal_og_24.csv":
+        function_for_medal_og_24(reader, constructorRDF)
+    else:
+        function_for_athlete_og_24(reader, constructorRDF)
+
+
+def count_rows(file_path):
+    with open(file_path, encoding='utf-8-sig') as f:
+        return sum(1 for line in f if line.strip()) - 1
+
+
+def count_triples(rdf_file):
+    from delta import load_graph_with_deltas
+    return len(load_graph_with_deltas(rdf_file))
+
+
+def run_pass(data_dir, output_dir, csv_file, venue_file, overwrite, options):
+    """
+    Run one conversion pass (in a dedicated process, so that its peak RSS is its own).
+
+    The peak RSS of the pass process and the largest peak RSS of its worker processes
+    (sharded conversion) are reported separately: ru_maxrss is a maximum, not a sum,
+    and the workers are children of the pass process.
+    """
+    import medal_og_24
+    from constants import namespace
+    from csvTOrdfv2 import CSV2RDF
+
+    # The medal pass reads the venues from a path relative to the working directory
+    medal_og_24.pathToVenueData = venue_file
+
+    csv2rdf = CSV2RDF(data_dir, output_dir, csv_file, "output_og_24.ttl", overwrite, "utf-8-sig")
+    start = time.perf_counter()
+    csv2rdf.create_rdf(namespace, benchmark_generate_rdf, options["stream_format"], options["batch_size"],
+                       options["workers"], False, False, options["delta"])
+    seconds = time.perf_counter() - start
+    # ru_maxrss is in kilobytes on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    peak_children_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024
+
+    rdf_file = csv2rdf.rdf_file
+    output_size = os.path.getsize(rdf_file) + sum(
+        os.path.getsize(os.path.join(output_dir, name)) for name in os.listdir(output_dir) if ".delta-" in name
+    )
+    return {
+        "seconds": seconds,
+        "peak_rss_bytes": peak_rss,
+        "peak_children_rss_bytes": peak_children_rss,
+        "output_bytes": output_size,
+        "triples": count_triples(rdf_file),
+    }
+
+
+def run_benchmark(medal_rows, athlete_rows, editions=10, seed=0, stream_format=None, batch_size=10000,
+                  workers=None, delta=False, work_dir=None):
+    """
+    Generate a synthetic dataset, run the medal pass then the athlete pass and measure them.
+
+    Returns:
+        dict: The parameters of the run and, for each pass, rows/s, triples/s, peak RSS and output size.
+    """
+    options = {"stream_format": stream_format, "batch_size": batch_size, "workers": workers, "delta": delta}
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp_dir:
+        data_dir = os.path.join(tmp_dir, "data")
+        output_dir = os.path.join(tmp_dir, "output")
+        files = generate_dataset(data_dir, medal_rows, athlete_rows, editions, seed)
+
+        passes = {}
+        # The streaming and sharded modes only create a file (medal pass), the delta mode only updates one
+        medal_options = {**options, "delta": False}
+        athlete_options = {**options, "stream_format": None, "workers": None}
+        for name, csv_file, overwrite, pass_options in (("medal", "medal_og_24.csv", "All", medal_options),
+                                                        ("athlete", "athlete_og_24.csv", None, athlete_options)):
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                result = executor.submit(run_pass, data_dir, output_dir, csv_file, files["venue"], overwrite,
+                                         pass_options).result()
+            rows = count_rows(files[name])
+            result["rows"] = rows
+            result["rows_per_second"] = rows / result["seconds"]
+            # Triples of the RDF file after the pass (the athlete pass mostly replaces existing values)
+            result["triples_per_second"] = result["triples"] / result["seconds"]
+            passes[name] = result
+
+    return {
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": git_commit(),
+        "parameters": {"medal_rows": medal_rows, "athlete_rows": athlete_rows, "editions": editions, "seed": seed,
+                       **options},
+        "passes": passes,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_results(results_file=RESULTS_FILE):
+    if not os.path.isfile(results_file):
+        return []
+    with open(results_file, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def save_result(result, results_file=RESULTS_FILE):
+    with open(results_file, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(result) + "\n")
+
+
+def compare(result, previous_results, tolerance=0.1):
+    """
+    Compare a run with the last stored run with the same parameters.
+
+    Returns:
+        list: The regressions, as strings (rows/s lower or peak RSS higher by more than tolerance).
+    """
+    same = [previous for previous in previous_results if previous["parameters"] == result["parameters"]]
+    if not same:
+        return []
+    reference = same[-1]
+    regressions = []
+    for name, metrics in result["passes"].items():
+        before = reference["passes"].get(name)
+        if not before:
+            continue
+        if metrics["rows_per_second"] < before["rows_per_second"] * (1 - tolerance):
+            regressions.append(f"{name}: {before['rows_per_second']:.0f} -> {metrics['rows_per_second']:.0f} lignes/s "
+                               f"(commit de référence {reference['commit']})")
+        for key, label in (("peak_rss_bytes", "RSS max"), ("peak_children_rss_bytes", "RSS max des workers")):
+            # The results stored before the workers were measured have no peak_children_rss_bytes
+            if key in before and metrics[key] > before[key] * (1 + tolerance):
+                regressions.append(f"{name}: {before[key] / 2**20:.0f} -> {metrics[key] / 2**20:.0f} Mo de {label} "
+                                   f"(commit de référence {reference['commit']})")
+    return regressions
+
+
+def print_result(result):
+    print(f"Paramètres : {result['parameters']}")
+    for name, metrics in result["passes"].items():
+        print(f"  {name:8s} {metrics['rows']:>10d} lignes  {metrics['seconds']:8.2f} s  "
+              f"{metrics['rows_per_second']:10.0f} lignes/s  {metrics['triples_per_second']:10.0f} triplets/s  "
+              f"RSS max {metrics['peak_rss_bytes'] / 2**20:8.1f} Mo  "
+              f"workers {metrics['peak_children_rss_bytes'] / 2**20:8.1f} Mo  sortie {metrics['output_bytes'] / 2**20:8.1f} Mo")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la conversion CSV -> RDF sur des données synthétiques")
+    parser.add_argument("--medals", type=int, default=10000, help="Nombre de lignes du fichier des médailles")
+    parser.add_argument("--athletes", type=int, default=10000, help="Nombre de lignes du fichier des athlètes")
+    parser.add_argument("--editions", type=int, default=10, help="Nombre d'éditions des Jeux")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stream-format", choices=["nt", "turtle"], help="Passe des médailles en streaming")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--workers", type=int, help="Passe des médailles en parallèle")
+    parser.add_argument("--delta", action="store_true", help="Passe des athlètes en mode delta")
+    parser.add_argument("--results", default=RESULTS_FILE, help="Fichier des résultats (JSON lines)")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Écart toléré avant de signaler une régression")
+    parser.add_argument("--work-dir", help="Dossier des fichiers temporaires")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.medals, args.athletes, args.editions, args.seed, args.stream_format,
+                           args.batch_size, args.workers, args.delta, args.work_dir)
+    print_result(result)
+
+    regressions = compare(result, load_results(args.results), args.tolerance)
+    save_result(result, args.results)
+    if regressions:
+        print("Régressions :")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
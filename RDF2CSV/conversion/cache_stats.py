@@ -0,0 +1,18 @@
+def cache_stats(hits: int, misses: int, size: int = None):
+    """
+    Return the hits, misses, size (if known) and hit rate of a cache.
+    """
+    calls = hits + misses
+    stats = {"hits": hits, "misses": misses}
+    if size is not None:
+        stats["size"] = size
+    stats["hit_rate"] = hits / calls if calls else 0.
+    return stats
+
+
+def cache_info_stats(function):
+    """
+    cache_stats of a function memoized with functools.lru_cache.
+    """
+    info = function.cache_info()
+    return cache_stats(info.hits, info.misses, info.currsize)
@@ -1,6 +1,8 @@
 import csv
 import json
 import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from rdflib import Graph, Namespace, URIRef
 from rdflib.namespace import RDF
 from rdflib import Graph, Namespace, URIRef, Literal
@@ -35,8 +37,18 @@ from utils import \
     write_in_file
 
 from ConstructRDF import ConstructRDF
+from TermCache import TermCache
+from TripleSink import open_sink, GraphBufferSink
+from shards import split_csv_byte_ranges, convert_shard, merge_shards, stream_ntriples
+from incremental import convert_incremental
+from views import materialize_views
+from person_index import person_keys_from_graph, read_person_keys, write_person_keys
+from delta import DeltaSink, next_delta_file, load_graph_with_deltas, compact
+from SQLiteStore import open_sqlite_graph, bulk_load
 
-from medal_og_24 import function_for_medal_og_24
+import dates
+import normalization
+from medal_og_24 import function_for_medal_og_24, read_discipline_venues
 from athlete_og_24 import function_for_athlete_og_24
 
 class CSV2RDF :
@@ -96,36 +108,294 @@ class CSV2RDF :
                 print(f"The file '{should_file_name}' has been created in the data folder '{self.data_path}'.")
                 self.newTurtleFile = True
 
-    def create_rdf(self, namespace : dict, callable_function : callable):
+    def create_rdf(self, namespace : dict, callable_function : callable, stream_format : str = None, batch_size : int = None,
+                   workers : int = None, incremental : bool = False, materialize : bool = False,
+                   delta : bool = False, store_path : str = None):
         """
         Convert the CSV file to RDF and save it to a file.
 
         Parameters:
             namespace (dict): The namespace dictionary.
             callable_function (callable): The function to apply on the RDF graph.
+            stream_format (str): If set ('nt' or 'turtle'), the triples are written to the RDF file
+                while the rows are read instead of building the whole graph in memory.
+            batch_size (int): If set, the triples are buffered and inserted into the graph
+                in bulk, batch_size triples at a time.
+            workers (int): If set, the CSV file is split into shards converted in parallel
+                by this number of processes (see create_rdf_sharded).
+            incremental (bool): If True, only the rows changed since the last conversion are
+                converted (see create_rdf_incremental).
+            materialize (bool): If True, the aggregation tables of the dashboard are computed
+                and saved to the views file of the application (see materialize_views).
+            delta (bool): If True, an update of an existing RDF file (overwriteFiles=None) writes
+                the new triples to a delta file instead of rewriting the RDF file (see create_rdf_delta).
+            store_path (str): If set, the graph is kept in this SQLite file (see SQLiteStore) instead
+                of in memory. An update of the RDF file reuses the store when it matches the RDF file
+                instead of parsing the file.
         """
+        g = None
+        if incremental:
+            self.create_rdf_incremental(namespace, callable_function)
+        elif delta and self.file_to_overwrite == None and self.newTurtleFile == False :
+            self.create_rdf_delta(namespace, callable_function)
+            self.print_cache_stats()
+            # The RDF file is unchanged: its views are computed again when the deltas are merged
+            return
+        elif workers:
+            self.create_rdf_sharded(namespace, callable_function, workers, stream_format)
+        elif stream_format:
+            self.stream_rdf(namespace, callable_function, stream_format)
+        else:
+            update = self.file_to_overwrite == None and self.newTurtleFile == False
+            if store_path:
+                g = self.open_store(store_path, update)
+            else:
+                g = Graph()
+                if update:
+                    g.parse(self.rdf_file, format="turtle")
+            person_keys = read_person_keys(self.rdf_file) if update else None
+            for prefix, uri in namespace.items():
+                g.bind(prefix, uri[0])
+
+            with open(self.csv_file, encoding=self.csvFileEncoding) as f:
+                if batch_size:
+                    with GraphBufferSink(g, batch_size) as sink:
+                        callable_function(sink, f, namespace, self.csv_file, person_keys)
+                else:
+                    callable_function(g, f, namespace, self.csv_file, person_keys)
+
+            g.serialize(destination=self.rdf_file, format="turtle")
+            write_person_keys(person_keys_from_graph(g, namespace[""][1]), self.rdf_file)
+            if store_path:
+                g.store.set_meta("source", self.rdf_file_version())
+            print(f"RDF exporté avec succès dans {self.rdf_file}")
+
+        # The caches of the sharded mode are in the worker processes
+        if not workers or incremental:
+            self.print_cache_stats()
+        if materialize:
+            self.materialize_views(g)
+        if store_path and g is not None:
+            g.close()
+
+    def print_cache_stats(self):
+        """
+        Print the hit rates of the caches of the conversion (terms, name normalization, medal dates),
+        once at the end of the conversion of the file.
+        """
+        print(f"Term cache: {TermCache.shared_stats()}")
+        print(f"Normalization cache: {normalization.stats()}")
+        print(f"Medal date cache: {dates.stats()}")
+
+    def rdf_file_version(self):
+        stat = os.stat(self.rdf_file)
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def open_store(self, store_path : str, update : bool):
+        """
+        Open the graph persisted in the SQLite file store_path.
+
+        For an update, the store is used as is when it was saved with the current RDF file,
+        otherwise the RDF file is bulk-loaded into it. For a new RDF file, the store is emptied.
+        Both are done in a single transaction (see SQLiteStore.rebuild).
+        """
+        g = open_sqlite_graph(store_path)
+        if not update:
+            g.store.clear()
+            return g
+
+        def load():
+            count = bulk_load(g, self.rdf_file)
+            print(f"{count} triplets chargés dans {store_path}")
+
+        if not g.store.rebuild(self.rdf_file_version(), load):
+            print(f"Graphe repris depuis {store_path} ({len(g)} triplets)")
+        return g
+
+    def materialize_views(self, g : Graph = None):
+        """
+        Compute the aggregation tables of the dashboard from the RDF file and save them
+        to the views file of the application (see views.materialize_views).
+
+        Parameters:
+            g (Graph): The graph of the RDF file, parsed from the file if not given.
+        """
+        if g is None:
+            g = Graph()
+            g.parse(self.rdf_file, format="nt" if self.rdf_file.endswith(".nt") else "turtle")
+        materialize_views(g, self.rdf_file)
+
+    def create_rdf_delta(self, namespace : dict, callable_function : callable):
+        """
+        Update the existing RDF file without parsing nor rewriting it: the triples emitted by
+        callable_function are written to a new delta file next to it ('<rdf_file>.delta-NNNNN.nt'),
+        to be merged later into the RDF file by compact_deltas (or 'python delta.py').
+
+        callable_function only sees an empty sink: it receives the keys of the existing persons
+        (see person_index.py) to join the rows against, like the athlete pass.
+
+        Parameters:
+            namespace (dict): The namespace dictionary.
+            callable_function (callable): The function to apply on the delta sink.
+        """
+        person_keys = read_person_keys(self.rdf_file)
+        if person_keys is None:
+            # No up to date key file: the RDF file (and its deltas) are read once to create it
+            person_keys = person_keys_from_graph(load_graph_with_deltas(self.rdf_file), namespace[""][1])
+            write_person_keys(person_keys, self.rdf_file)
+
+        delta_file = next_delta_file(self.rdf_file)
+        with DeltaSink(delta_file) as sink:
+            with open(self.csv_file, encoding=self.csvFileEncoding) as f:
+                callable_function(sink, f, namespace, self.csv_file, person_keys)
+
+        if sink.count:
+            print(f"Delta écrit avec succès dans {delta_file} ({sink.count} triplets)")
+        else:
+            print(f"Aucun triplet à ajouter à {self.rdf_file}")
+
+    def compact_deltas(self, namespace : dict, materialize : bool = False):
+        """
+        Merge the delta files into the RDF file (see delta.compact).
+        """
+        return compact(self.rdf_file, namespace, materialize)
+
+    def stream_rdf(self, namespace : dict, callable_function : callable, stream_format : str):
+        """
+        Convert the CSV file to RDF, writing the triples incrementally to the RDF file.
+
+        A stream can only create a new file: it cannot update an existing RDF file
+        (overwriteFiles=None), which requires the whole graph to be loaded.
+
+        Parameters:
+            namespace (dict): The namespace dictionary.
+            callable_function (callable): The function to apply on the triple sink.
+            stream_format (str): 'nt' (N-Triples) or 'turtle'.
+        """
+        if self.file_to_overwrite == None and self.newTurtleFile == False :
+            raise ValueError(
+                f"The file '{self.rdf_file}' already exists and cannot be updated in streaming mode."
+            )
 
-        g = Graph()
+        with open_sink(self.rdf_file, stream_format) as sink:
+            for prefix, uri in namespace.items():
+                sink.bind(prefix, uri[0])
+
+            with open(self.csv_file, encoding=self.csvFileEncoding) as f:
+                callable_function(sink, f, namespace, self.csv_file)
+
+        print(f"RDF exporté avec succès dans {self.rdf_file} ({sink.count} triplets)")
+
+    def create_rdf_sharded(self, namespace : dict, callable_function : callable, workers : int,
+                           stream_format : str = None, shards_per_worker : int = 4):
+        """
+        Convert the CSV file to RDF in parallel and save it to a file.
+
+        The CSV file is split into byte ranges, each one converted by a worker process with
+        its own ConstructRDF, then the shards are merged line by line (see shards.merge_shards):
+        the entities emitted by several shards (countries, disciplines, trials, events...) give
+        the same N-Triples lines, kept once, so the result holds the same triples as a
+        sequential conversion.
+
+        The workers cannot read the existing RDF file, so the sharded mode can only create
+        a new file (callable_function must not depend on the content of the graph).
+
+        Parameters:
+            namespace (dict): The namespace dictionary.
+            callable_function (callable): The function to apply on each shard (must be picklable).
+            workers (int): The number of worker processes.
+            stream_format (str): If set ('nt' or 'turtle'), the shards are merged by streaming
+                them to the RDF file instead of building the whole graph in memory
+                ('nt': the merged shard lines are the RDF file).
+            shards_per_worker (int): The number of shards per worker, to balance the load.
+        """
         if self.file_to_overwrite == None and self.newTurtleFile == False :
-            g.parse(self.rdf_file, format="turtle")
-        for prefix, uri in namespace.items():
-            g.bind(prefix, uri[0])
+            raise ValueError(
+                f"The file '{self.rdf_file}' already exists and cannot be updated in sharded mode."
+            )
+
+        ranges = split_csv_byte_ranges(self.csv_file, workers * shards_per_worker)
+        print(f"Processing {len(ranges)} shards with {workers} workers")
 
-        with open(self.csv_file, encoding=self.csvFileEncoding) as f:
-            callable_function(g, f, namespace, self.csv_file)
+        with tempfile.TemporaryDirectory() as shard_dir:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(convert_shard, self.csv_file, self.csvFileEncoding, start, end,
+                                    callable_function, namespace, os.path.join(shard_dir, f"shard_{i}.nt"))
+                    for i, (start, end) in enumerate(ranges)
+                ]
+                shard_files = [future.result()[0] for future in futures]
+
+            if stream_format == "nt":
+                count = merge_shards(shard_files, self.rdf_file)
+                print(f"RDF exporté avec succès dans {self.rdf_file} ({count} triplets)")
+                return
+
+            merged_file = os.path.join(shard_dir, "merged.nt")
+            merge_shards(shard_files, merged_file)
+            if stream_format:
+                with open_sink(self.rdf_file, stream_format) as sink:
+                    for prefix, uri in namespace.items():
+                        sink.bind(prefix, uri[0])
+                    stream_ntriples(merged_file, sink)
+                print(f"RDF exporté avec succès dans {self.rdf_file} ({sink.count} triplets)")
+                return
+
+            g = Graph()
+            for prefix, uri in namespace.items():
+                g.bind(prefix, uri[0])
+            g.parse(merged_file, format="nt")
 
         g.serialize(destination=self.rdf_file, format="turtle")
         print(f"RDF exporté avec succès dans {self.rdf_file}")
 
-def function_generate_rdf(g, f, namespace: dict, fileName: str):
-    constructorRDF = ConstructRDF(g, namespace)
+    def create_rdf_incremental(self, namespace : dict, callable_function : callable):
+        """
+        Convert the rows of the CSV file added, changed or deleted since the last conversion
+        and apply the triple delta to the RDF file.
+
+        A manifest of the hash of each row and of the triples it produces is stored next to
+        the RDF file ('<rdf_file>.manifest.json'). Without manifest, or when the RDF file has
+        just been created, all the rows are converted. The RDF file must be an N-Triples file
+        (.nt), patched line by line without being parsed; serialize it to Turtle afterwards if needed.
+
+        The rows are converted one at a time, so callable_function must not depend on the
+        content of the graph (the athlete pass, which updates existing persons, is not supported).
+        It receives a context keyword argument, the same dictionary for all the rows of the file,
+        to keep its per-file setup (see function_generate_rdf).
+
+        Parameters:
+            namespace (dict): The namespace dictionary.
+            callable_function (callable): The function to apply on each row.
+        """
+        manifest_file = self.rdf_file + ".manifest.json"
+        convert_incremental(self.csv_file, self.csvFileEncoding, self.rdf_file, manifest_file,
+                            callable_function, namespace, rebuild=self.newTurtleFile)
+        print(f"RDF mis à jour avec succès dans {self.rdf_file}")
+
+def function_generate_rdf(g, f, namespace: dict, fileName: str, person_keys: set = None, context: dict = None):
+    """
+    Convert the rows of f with the pass of the file (medals or athletes).
+
+    context is a dictionary kept by the caller between the calls for the same file (the
+    incremental mode converts one row per call): the per-file setup (venues of the disciplines)
+    is done on the first call only, and the file name is only printed once.
+    """
+    if context is None:
+        context = {}
+    first_call = "file" not in context
+    context["file"] = fileName
+    constructorRDF = ConstructRDF(g, namespace, person_keys=person_keys)
     reader = csv.DictReader(f, delimiter=';')
     constructorRDF.createCoordinate(ConstructRDF.SET_OPERATION, BlankCoordinateWritting, BlankCoordinateLongitude, BlankCoordinateLatitude, BlankCoordinateName, BlankCoordinateDescription)
     if fileName == "../data\medal_og_24.csv":
-        print("Processing the file 'medal_og_24.csv'")
-        function_for_medal_og_24(reader, constructorRDF)
+        if first_call:
+            print("Processing the file 'medal_og_24.csv'")
+            context["venues"] = read_discipline_venues()
+        function_for_medal_og_24(reader, constructorRDF, context["venues"])
         return
     if fileName == "../data\\athlete_og_24.csv":
-        print("Processing the file 'athlete_og_24.csv'")
+        if first_call:
+            print("Processing the file 'athlete_og_24.csv'")
         function_for_athlete_og_24(reader, constructorRDF)
         return
@@ -0,0 +1,40 @@
+from datetime import datetime
+from functools import lru_cache
+
+from cache_stats import cache_info_stats
+
+# Les médailles ne sont remises que sur une quinzaine de jours de compétition :
+# chaque date distincte n'est analysée qu'une fois, puis ses formats sont réutilisés.
+
+
+@lru_cache(maxsize=4096)
+def medal_date_forms(date_str):
+    """
+    Formats dérivés d'une date de médaille au format "%d/%m/%Y" :
+    - la date au format xsd:dateTime (convertir_en_rdf_dateTime)
+    - la date utilisée dans les noms locaux d'URI (transformer_date de la précédente)
+
+    :return: Tuple (rdf_dateTime, date pour les URIs).
+    """
+    date_obj = datetime.strptime(date_str, "%d/%m/%Y")
+    return date_obj.strftime("%Y-%m-%dT%H:%M:%SZ"), date_obj.strftime("%d_%m_%Y_at_time_%Hh%M")
+
+
+def parse_medal_dates(date_strs):
+    """
+    Formats dérivés (voir medal_date_forms) de toute une colonne de dates.
+    Seules les dates distinctes de la colonne sont analysées.
+
+    :param date_strs: Itérable de dates au format "%d/%m/%Y".
+    :return: Liste de tuples (rdf_dateTime, date pour les URIs), dans l'ordre de la colonne.
+    """
+    date_strs = list(date_strs)
+    forms = {date_str: medal_date_forms(date_str) for date_str in dict.fromkeys(date_strs)}
+    return [forms[date_str] for date_str in date_strs]
+
+
+def stats():
+    """
+    Retourne les hits, misses, taille et taux de hits du cache de medal_date_forms.
+    """
+    return cache_info_stats(medal_date_forms)
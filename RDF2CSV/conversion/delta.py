@@ -0,0 +1,133 @@
+import argparse
+import glob
+import os
+
+from rdflib import Graph
+from rdflib.plugins.serializers.nt import _nt_row
+from rdflib.util import from_n3
+
+from TripleSink import TripleSink
+from person_index import person_keys_from_graph, write_person_keys
+from views import materialize_views
+
+SET_MARKER = "#SET "
+
+
+class DeltaSink(TripleSink):
+    """
+    Collect the triples emitted by an update pass and write them to a delta file
+    instead of rewriting the whole RDF file.
+
+    A delta file is an N-Triples file: any N-Triples parser reads the added triples.
+    The subject/predicate pairs written with SET are listed first as '#SET <s> <p>'
+    comment lines, so that compaction removes their previous values from the base file.
+    SET semantics inside the pass are resolved as in GraphBufferSink.
+    """
+
+    def __init__(self, destination: str):
+        self.destination = destination
+        self.buffer = []
+        self.last_set = {}
+        self.count = 0
+
+    def add(self, triple):
+        self.buffer.append(triple)
+
+    def set(self, triple):
+        self.last_set[(triple[0], triple[1])] = len(self.buffer)
+        self.buffer.append(triple)
+
+    def close(self):
+        last_set = self.last_set
+        lines = dict.fromkeys(
+            _nt_row(triple)
+            for i, triple in enumerate(self.buffer)
+            if last_set.get((triple[0], triple[1]), i) <= i
+        )
+        self.count = len(lines)
+        if lines:
+            with open(self.destination, 'w', encoding='utf-8') as f:
+                f.writelines(f"{SET_MARKER}{subject.n3()} {predicate.n3()}\n" for subject, predicate in last_set)
+                f.writelines(lines)
+        self.buffer = []
+        self.last_set = {}
+
+
+def delta_files(rdf_file: str):
+    """
+    Return the delta files of the RDF file, in the order they were written.
+    """
+    return sorted(glob.glob(glob.escape(rdf_file) + ".delta-*.nt"))
+
+
+def next_delta_file(rdf_file: str):
+    existing = delta_files(rdf_file)
+    number = int(existing[-1][len(rdf_file) + len(".delta-"):-len(".nt")]) + 1 if existing else 1
+    return f"{rdf_file}.delta-{number:05d}.nt"
+
+
+def apply_delta_file(g: Graph, delta_file: str):
+    """
+    Apply a delta file to the graph: remove the previous values of the SET pairs, then add the triples.
+    """
+    with open(delta_file, encoding='utf-8') as f:
+        for line in f:
+            if line.startswith(SET_MARKER):
+                subject, predicate = line[len(SET_MARKER):].split()
+                g.remove((from_n3(subject), from_n3(predicate), None))
+    g.parse(delta_file, format="nt")
+
+
+def load_graph_with_deltas(rdf_file: str, g: Graph = None):
+    """
+    Parse the RDF file (Turtle) and apply its pending delta files.
+    """
+    if g is None:
+        g = Graph()
+    g.parse(rdf_file, format="turtle")
+    for delta_file in delta_files(rdf_file):
+        apply_delta_file(g, delta_file)
+    return g
+
+
+def compact(rdf_file: str, namespace: dict = None, materialize: bool = False):
+    """
+    Merge the delta files into the RDF file and remove them.
+    With materialize, the aggregation tables of the dashboard are computed again.
+
+    Returns:
+        int: The number of delta files merged.
+    """
+    deltas = delta_files(rdf_file)
+    if not deltas:
+        return 0
+    g = load_graph_with_deltas(rdf_file)
+    for prefix, uri in (namespace or {}).items():
+        g.bind(prefix, uri[0])
+
+    tmp_file = rdf_file + ".tmp"
+    g.serialize(destination=tmp_file, format="turtle")
+    os.replace(tmp_file, rdf_file)
+    for delta_file in deltas:
+        os.remove(delta_file)
+    if namespace:
+        write_person_keys(person_keys_from_graph(g, namespace[""][1]), rdf_file)
+    if materialize:
+        materialize_views(g, rdf_file)
+    print(f"{len(deltas)} delta(s) fusionné(s) dans {rdf_file} ({len(g)} triplets)")
+    return len(deltas)
+
+
+def main():
+    from constants import namespace
+
+    parser = argparse.ArgumentParser(description="Fusionne les fichiers delta dans le fichier RDF")
+    parser.add_argument("rdf_file", nargs="?", default="../output/output_og_24.ttl")
+    parser.add_argument("--no-views", action="store_true", help="Ne pas recalculer les tables d'agrégation")
+    args = parser.parse_args()
+    if not compact(args.rdf_file, namespace, not args.no_views):
+        print(f"Aucun delta à fusionner pour {args.rdf_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+from collections import Counter
+
+from rdflib.plugins.serializers.nt import _nt_row
+
+from TripleSink import TripleSink
+
+
+def stable_hash(text: str):
+    """
+    Hash stable between runs (unlike hash()), used for the rows and triples of the manifest.
+    """
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+class RowTriplesSink(TripleSink):
+    """
+    Collect the N-Triples lines emitted for one CSV row, without duplicates.
+    """
+
+    def __init__(self):
+        self.lines = {}
+
+    def add(self, triple):
+        self.lines.setdefault(_nt_row(triple), None)
+
+    def set(self, triple):
+        self.add(triple)
+
+
+def read_csv_rows(file_path: str, encoding: str):
+    """
+    Return the header line and the non-empty data lines of a CSV file.
+    """
+    with open(file_path, encoding=encoding) as f:
+        header = f.readline()
+        rows = [line if line.endswith("\n") else line + "\n" for line in f if line.strip()]
+    return header, rows
+
+
+def convert_row(callable_function: callable, namespace: dict, file_path: str, header: str, line: str,
+                context: dict):
+    """
+    Convert a single CSV row and return its N-Triples lines.
+
+    context is the same dictionary for all the rows of the file: callable_function keeps its
+    per-file setup in it (see function_generate_rdf) instead of redoing it for each row.
+    """
+    sink = RowTriplesSink()
+    callable_function(sink, [header, line], namespace, file_path, context=context)
+    return list(sink.lines)
+
+
+def load_manifest(manifest_file: str):
+    if not os.path.isfile(manifest_file):
+        return {}
+    with open(manifest_file, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(manifest_file: str, manifest: dict):
+    tmp_file = manifest_file + ".tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_file, manifest_file)
+
+
+def compute_delta(manifest_rows: dict, header: str, lines: list, callable_function: callable,
+                  namespace: dict, file_path: str):
+    """
+    Compare the rows of the CSV file with the rows of the manifest and convert the new rows.
+
+    Each row of the manifest keeps the hashes of the triples it produces. A triple shared by
+    several rows (country, discipline, trial...) is counted once per row, so it is only removed
+    from the output when the last row producing it is deleted.
+
+    Returns:
+        tuple: The updated manifest rows, the hashes of the triples to remove and
+            the N-Triples lines to add.
+    """
+    current = Counter()
+    line_of = {}
+    for line in lines:
+        row_hash = stable_hash(line.rstrip("\r\n"))
+        current[row_hash] += 1
+        line_of.setdefault(row_hash, line)
+    previous = Counter({row_hash: row["count"] for row_hash, row in manifest_rows.items()})
+    added = current - previous
+    deleted = previous - current
+
+    refcount = Counter()
+    for row in manifest_rows.values():
+        for triple_hash in row["triples"]:
+            refcount[triple_hash] += row["count"]
+    touched = {}
+
+    rows = {row_hash: dict(row) for row_hash, row in manifest_rows.items()}
+    for row_hash, count in deleted.items():
+        for triple_hash in rows[row_hash]["triples"]:
+            touched.setdefault(triple_hash, refcount[triple_hash])
+            refcount[triple_hash] -= count
+        rows[row_hash]["count"] -= count
+        if rows[row_hash]["count"] == 0:
+            del rows[row_hash]
+
+    new_lines = {}
+    context = {}
+    for row_hash, count in added.items():
+        if row_hash in rows:
+            rows[row_hash]["count"] += count
+        else:
+            row_lines = convert_row(callable_function, namespace, file_path, header, line_of[row_hash], context)
+            triple_hashes = []
+            for row_line in row_lines:
+                triple_hash = stable_hash(row_line)
+                new_lines.setdefault(triple_hash, row_line)
+                triple_hashes.append(triple_hash)
+            rows[row_hash] = {"count": count, "triples": triple_hashes}
+        for triple_hash in rows[row_hash]["triples"]:
+            touched.setdefault(triple_hash, refcount[triple_hash])
+            refcount[triple_hash] += count
+
+    removed = {triple_hash for triple_hash, before in touched.items() if before > 0 and refcount[triple_hash] == 0}
+    added_lines = [new_lines[triple_hash] for triple_hash, before in touched.items()
+                   if before == 0 and refcount[triple_hash] > 0]
+    print(f"{sum(added.values())} lignes ajoutées, {sum(deleted.values())} lignes supprimées : "
+          f"{len(added_lines)} triplets ajoutés, {len(removed)} triplets supprimés")
+    return rows, removed, added_lines
+
+
+def apply_delta(rdf_file: str, removed: set, added_lines: list, reset: bool = False):
+    """
+    Apply a triple delta to an N-Triples file, patched line by line without parsing it.
+
+    Parameters:
+        reset (bool): Ignore the current content of the file (first conversion).
+    """
+    tmp_file = rdf_file + ".tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as dst:
+        if not reset:
+            with open(rdf_file, encoding='utf-8') as src:
+                for line in src:
+                    if stable_hash(line) not in removed:
+                        dst.write(line)
+        dst.writelines(added_lines)
+    os.replace(tmp_file, rdf_file)
+
+
+def convert_incremental(csv_file: str, encoding: str, rdf_file: str, manifest_file: str,
+                        callable_function: callable, namespace: dict, rebuild: bool = False):
+    """
+    Convert only the rows of the CSV file added, changed or deleted since the last conversion
+    and apply the resulting triple delta to the RDF file, which must be an N-Triples file (.nt).
+
+    The rows are converted one at a time, so callable_function must not depend on the content
+    of the graph nor on the other rows (except through triples that are merged by union).
+
+    Parameters:
+        rebuild (bool): Ignore the manifest and the current RDF file and convert all the rows.
+    """
+    if not rdf_file.endswith(".nt"):
+        raise ValueError(f"The incremental mode patches an N-Triples file (.nt), not '{rdf_file}'.")
+    manifest = {} if rebuild else load_manifest(manifest_file)
+    if manifest and manifest.get("csv_file") != os.path.basename(csv_file):
+        raise ValueError(f"The manifest '{manifest_file}' was created for the file '{manifest['csv_file']}'.")
+
+    header, lines = read_csv_rows(csv_file, encoding)
+    if manifest and manifest.get("header") != stable_hash(header.rstrip("\r\n")):
+        print("L'en-tête du CSV a changé : reconstruction complète")
+        manifest = {}
+    rows, removed, added_lines = compute_delta(manifest.get("rows", {}), header, lines,
+                                               callable_function, namespace, csv_file)
+
+    if removed or added_lines or not manifest:
+        apply_delta(rdf_file, removed, added_lines, reset=not manifest)
+
+    save_manifest(manifest_file, {
+        "csv_file": os.path.basename(csv_file),
+        "header": stable_hash(header.rstrip("\r\n")),
+        "rows": rows,
+    })
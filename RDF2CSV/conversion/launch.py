@@ -6,6 +6,23 @@ rdfFileName = "output_og_24.ttl"
 csvFileName = "medal_og_24.csv"
 overwriteFiles = "All"
 csvFileEncoding = "utf-8-sig"
+# "nt" ou "turtle" pour écrire les triplets au fil de la lecture (nouveau fichier uniquement)
+streamFormat = None
+# Nombre de triplets insérés en une fois dans le graphe (None pour insérer triplet par triplet)
+batchSize = None
+# Nombre de processus pour convertir le CSV par morceaux en parallèle (None pour une conversion séquentielle)
+workers = None
+# Ne convertir que les lignes modifiées depuis la dernière conversion (manifeste à côté du fichier RDF,
+# rdfFileName doit être un fichier .nt)
+incremental = False
+# Calculer les tables d'agrégation du tableau de bord (data/data/views.json, lues par l'application
+# quand son fichier RDF a le même contenu que le fichier converti)
+materializeViews = False
+# Avec overwriteFiles=None, écrire les triplets ajoutés dans un fichier delta au lieu de réécrire
+# le fichier RDF ; les deltas sont fusionnés dans le fichier RDF avec 'python delta.py'
+appendDelta = False
+# Fichier SQLite où garder le graphe entre deux passes (None pour un graphe en mémoire)
+storePath = None
 
 
 
@@ -24,5 +41,7 @@ if "athlete" == file :
 
 
 
-csv2rdf = CSV2RDF(dataFolderPath, outputFolderPath, csvFileName, rdfFileName, overwriteFiles, csvFileEncoding)
-csv2rdf.create_rdf(namespace, function_generate_rdf)
\ No newline at end of file
+if __name__ == "__main__":
+    csv2rdf = CSV2RDF(dataFolderPath, outputFolderPath, csvFileName, rdfFileName, overwriteFiles, csvFileEncoding)
+    csv2rdf.create_rdf(namespace, function_generate_rdf, streamFormat, batchSize, workers, incremental, materializeViews,
+                       appendDelta, storePath)
\ No newline at end of file
@@ -5,6 +5,7 @@ from utils import \
     separer_nom_prenom, \
     normalize_string, \
     capitalize_words, \
+    local_name, \
     check_and_create_file, \
     write_in_file
 
@@ -27,12 +28,25 @@ from constants import \
     pathToVenueData
 
 
+from dates import parse_medal_dates
 from ConstructRDF import ConstructRDF
 from venues_og_24 import generate_discipline_to_venue_dictionary_from_csv
 
 
-def function_for_medal_og_24(reader, constructorRDF):
-    dicionaryDisciplineToVenue = generate_discipline_to_venue_dictionary_from_csv(pathToVenueData)
+def read_discipline_venues():
+    """
+    Lit le CSV des sites (pathToVenueData) : dictionnaire discipline -> liste de sites.
+    """
+    return generate_discipline_to_venue_dictionary_from_csv(pathToVenueData)
+
+
+def function_for_medal_og_24(reader, constructorRDF, dicionaryDisciplineToVenue=None):
+    """
+    :param dicionaryDisciplineToVenue: Sites de chaque discipline (voir read_discipline_venues),
+        lus dans le CSV des sites s'ils ne sont pas donnés.
+    """
+    if dicionaryDisciplineToVenue is None:
+        dicionaryDisciplineToVenue = read_discipline_venues()
 
     olympicsTrial = []
     olympicsVenue = []
@@ -40,10 +54,13 @@ def function_for_medal_og_24(reader, constructorRDF):
     disciplineToTrialDict = {}
     disciplineToParametersDict = {}
     globalOperation = ConstructRDF.ADD_OPERATION
-    for row in reader:
+    # Dates xsd:dateTime et dates des noms locaux de toute la colonne, analysées une fois par jour de compétition
+    rows = list(reader)
+    medalDates = parse_medal_dates(row["Medal_date"] for row in rows)
+    for row, (date, dateWritting) in zip(rows, medalDates):
         is_team_event = normalize_string(row["Name"]) == normalize_string(row["Country"])
-        countryName = capitalize_words(normalize_string(row["Country"])).replace(" ", separator)
-        discplineName = capitalize_words(normalize_string(row["Discipline"])).replace(" ", separator)
+        countryName = local_name(row["Country"], separator)
+        discplineName = local_name(row["Discipline"], separator)
         countryCode = row["Country_code"]
         athleteName = row["Name"].replace(" ", separator)
         personWritting = row["Name"].replace(" ", separator) + "_person"
@@ -54,16 +71,15 @@ def function_for_medal_og_24(reader, constructorRDF):
             gender = "Male"
         else :
             gender = "Female"
-        date = convertir_en_rdf_dateTime(row["Medal_date"])
         medalName = row["Medal_type"].replace(" ", separator)
         medalWritting = obtenir_premier_terme(row["Medal_type"])
         rank = row["Medal_code"]
-        performanceWritting = trialName + "_" + athleteName + "_" + transformer_date(date)
-        performanceName = row["Medal_type"] + " " + row["Event"] + " " + row["Name"] + " " + transformer_date(date)
-        performanceDescription = "Performance of " + row["Name"] + " in " + row["Event"] + " at the " + row["Medal_type"] + " on " + transformer_date(date)
-        eventWritting = discplineName + "_" + trialName + "_" + transformer_date(date)
-        eventName = capitalize_words(normalize_string(row["Discipline"])) + " " + row["Event"] + " " + transformer_date(date)
-        eventDescription = "Event " + row["Event"] + " on " + transformer_date(date)
+        performanceWritting = trialName + "_" + athleteName + "_" + dateWritting
+        performanceName = row["Medal_type"] + " " + row["Event"] + " " + row["Name"] + " " + dateWritting
+        performanceDescription = "Performance of " + row["Name"] + " in " + row["Event"] + " at the " + row["Medal_type"] + " on " + dateWritting
+        eventWritting = discplineName + "_" + trialName + "_" + dateWritting
+        eventName = capitalize_words(normalize_string(row["Discipline"])) + " " + row["Event"] + " " + dateWritting
+        eventDescription = "Event " + row["Event"] + " on " + dateWritting
         eventParticipants =[]
         eventPerformances = [performanceWritting]
         eventHostedBy = []
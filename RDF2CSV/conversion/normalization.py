@@ -0,0 +1,69 @@
+import re
+from functools import lru_cache
+
+from cache_stats import cache_info_stats
+
+# Les mêmes pays, disciplines et noms d'athlètes reviennent sur des milliers de lignes :
+# les expressions régulières sont compilées une seule fois et les résultats sont mémorisés.
+CACHE_SIZE = 100000
+
+DIGITS = re.compile(r'\d+')
+NOT_WORD = re.compile(r'[^\w\s-]')
+SEPARATORS = re.compile(r'[-\s]+')
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_string(s):
+    s = s.lower()  # Mettre en minuscule
+    s = DIGITS.sub('', s)  # Supprimer les chiffres
+    return ' '.join(s.split())  # Supprimer les espaces avant, après et multiples
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def capitalize_words(s):
+    # Mettre en majuscule chaque début de mot
+    return ' '.join(word.capitalize() for word in s.lower().split())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def separer_nom_prenom(chaine):
+    # Le prénom est la première partie, le nom tout ce qui reste en majuscule
+    parts = chaine.split()
+    return parts[0].capitalize(), " ".join(parts[1:]).upper()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def local_name(name, separator):
+    """
+    Nom local d'URI d'un pays, d'une discipline ou d'un site :
+    capitalize_words(normalize_string(name)) avec les espaces remplacés par separator.
+    """
+    return capitalize_words(normalize_string(name)).replace(" ", separator)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def clean_text(text):
+    # Identifiant de ressource du mapping du texte (extractTexte/map_rdf.py)
+    text = NOT_WORD.sub('', text.lower().strip())
+    return SEPARATORS.sub('_', text)
+
+
+CACHED_FUNCTIONS = {
+    "normalize_string": normalize_string,
+    "capitalize_words": capitalize_words,
+    "separer_nom_prenom": separer_nom_prenom,
+    "local_name": local_name,
+    "clean_text": clean_text,
+}
+
+
+def stats():
+    """
+    Retourne les hits, misses, taille et taux de hits du cache de chaque fonction.
+    """
+    return {name: cache_info_stats(function) for name, function in CACHED_FUNCTIONS.items()}
+
+
+def clear():
+    for function in CACHED_FUNCTIONS.values():
+        function.cache_clear()
@@ -0,0 +1,49 @@
+import os
+
+from rdflib import URIRef
+
+PERSON_SUFFIX = "_person"
+
+
+def person_keys_file(rdf_file):
+    """Fichier des personnes du fichier RDF, écrit à côté de celui-ci"""
+    return rdf_file + ".persons"
+
+
+def person_keys_from_graph(g, base):
+    """
+    Noms locaux (ex. "Leon_MARCHAND_person") de toutes les personnes du graphe,
+    en un seul parcours des sujets.
+
+    :param g: Le graphe rdflib (ou un GraphBufferSink).
+    :param base: Le namespace des noms locaux.
+    """
+    base = str(base)
+    return {
+        str(subject)[len(base):]
+        for subject in g.subjects(unique=True)
+        if isinstance(subject, URIRef) and subject.startswith(base) and subject.endswith(PERSON_SUFFIX)
+    }
+
+
+def write_person_keys(keys, rdf_file):
+    path = person_keys_file(rdf_file)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        f.writelines(f"{key}\n" for key in sorted(keys))
+    os.replace(path + ".tmp", path)
+
+
+def read_person_keys(rdf_file):
+    """
+    Lit le fichier des personnes du fichier RDF.
+
+    :return: L'ensemble des noms locaux, ou None si le fichier n'existe pas
+        ou est plus ancien que le fichier RDF.
+    """
+    path = person_keys_file(rdf_file)
+    if not os.path.isfile(path) or not os.path.isfile(rdf_file):
+        return None
+    if os.path.getmtime(path) < os.path.getmtime(rdf_file):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
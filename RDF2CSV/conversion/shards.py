@@ -0,0 +1,153 @@
+import heapq
+import os
+from itertools import chain, islice
+
+from rdflib.plugins.parsers.ntriples import W3CNTriplesParser
+
+from TripleSink import NTriplesSink
+
+# Lines sorted in memory at a time by sort_shard_file
+SORT_RUN_SIZE = 1000000
+
+
+def split_csv_byte_ranges(file_path: str, shard_count: int):
+    """
+    Split the data lines of a CSV file into byte ranges of about the same size.
+
+    The ranges start after the header line. A range does not need to start on a
+    line boundary: a line belongs to the range containing its first byte
+    (see read_csv_shard). Quoted fields containing line breaks are not supported.
+
+    Parameters:
+        file_path (str): The CSV file path.
+        shard_count (int): The number of ranges.
+
+    Returns:
+        list: The (start, end) byte offsets of each range.
+    """
+    with open(file_path, 'rb') as f:
+        f.readline()
+        data_start = f.tell()
+    size = os.path.getsize(file_path)
+    shard_count = max(1, min(shard_count, size - data_start))
+    step = (size - data_start) / shard_count
+    bounds = [data_start + round(i * step) for i in range(shard_count)] + [size]
+    return [(bounds[i], bounds[i + 1]) for i in range(shard_count) if bounds[i] < bounds[i + 1]]
+
+
+def read_csv_shard(file_path: str, encoding: str, start: int, end: int):
+    """
+    Return the header line followed by the lines starting in [start, end).
+    """
+    with open(file_path, 'rb') as f:
+        header = f.readline()
+        # Se placer au début de la première ligne qui commence dans l'intervalle
+        if start > f.tell():
+            f.seek(start - 1)
+            f.readline()
+        position = f.tell()
+        lines = []
+        while position < end:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+            lines.append(line)
+    return [line.decode(encoding) for line in chain([header], lines)]
+
+
+def convert_shard(file_path: str, encoding: str, start: int, end: int, callable_function: callable,
+                  namespace: dict, shard_file: str):
+    """
+    Convert one shard of the CSV file with its own ConstructRDF (created by callable_function)
+    and write the triples to an N-Triples file, sorted and without duplicate lines
+    (see merge_shards).
+
+    Returns:
+        tuple: The shard file path and its number of triples.
+    """
+    lines = read_csv_shard(file_path, encoding, start, end)
+    with NTriplesSink(shard_file) as sink:
+        callable_function(sink, lines, namespace, file_path)
+    return shard_file, sort_shard_file(shard_file)
+
+
+def sort_shard_file(shard_file: str, run_size: int = SORT_RUN_SIZE):
+    """
+    Sort the lines of an N-Triples shard file in place and drop the duplicate lines.
+
+    The file is sorted by runs of at most run_size lines, each run sorted in memory and
+    written to a temporary file, then the runs are merged line by line (see merge_shards):
+    the memory used does not depend on the size of the shard.
+
+    Returns:
+        int: The number of lines.
+    """
+    run_files = []
+    count = 0
+    try:
+        with open(shard_file, encoding='utf-8') as f:
+            while True:
+                lines = sorted(set(islice(f, run_size)))
+                if not lines:
+                    break
+                run_file = f"{shard_file}.run{len(run_files)}"
+                with open(run_file, 'w', encoding='utf-8') as run:
+                    run.writelines(lines)
+                run_files.append(run_file)
+                count = len(lines)
+        if len(run_files) == 1:
+            os.replace(run_files.pop(), shard_file)
+            return count
+        return merge_shards(run_files, shard_file)
+    finally:
+        for run_file in run_files:
+            os.remove(run_file)
+
+
+def merge_shards(shard_files: list, destination: str):
+    """
+    Merge the sorted shard files (see sort_shard_file) into one N-Triples file, line by line.
+
+    The same country, discipline, trial or event emitted by several shards produces the same
+    N-Triples lines: a k-way merge of the sorted files writes each distinct line once, with a
+    single line per shard in memory and without parsing the triples. The merged file is
+    sorted, so it holds the same triples as a sequential conversion in another order.
+    Blank node labels are unique per process (rdflib generates them randomly), so the
+    shards do not share blank nodes by mistake.
+
+    Returns:
+        int: The number of triples written.
+    """
+    files = [open(shard_file, encoding='utf-8') for shard_file in shard_files]
+    count = 0
+    try:
+        with open(destination, 'w', encoding='utf-8') as out:
+            previous = None
+            for line in heapq.merge(*files):
+                if line != previous:
+                    out.write(line)
+                    previous = line
+                    count += 1
+    finally:
+        for f in files:
+            f.close()
+    return count
+
+
+class SinkTriples:
+    """Adapter giving the triples read by the N-Triples parser to a sink or a Graph"""
+
+    def __init__(self, sink):
+        self.sink = sink
+
+    def triple(self, s, p, o):
+        self.sink.add((s, p, o))
+
+
+def stream_ntriples(nt_file: str, sink):
+    """
+    Add the triples of an N-Triples file to a sink, as they are read (no intermediate graph).
+    """
+    with open(nt_file, 'rb') as f:
+        W3CNTriplesParser(SinkTriples(sink)).parse(f)
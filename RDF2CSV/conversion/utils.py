@@ -1,8 +1,10 @@
 import json
 import os
-import re
 from datetime import datetime, timedelta
 
+# Fonctions de normalisation des noms, mémorisées (voir normalization.py)
+from normalization import separer_nom_prenom, normalize_string, capitalize_words, local_name
+
 def addXDays(date_str, x : int):
     date_obj = datetime.strptime(date_str, "%Y-%m-%d")
 
@@ -35,31 +37,6 @@ def obtenir_premier_terme(chaine):
     # Séparer la chaîne par des espaces et retourner le premier terme
     return chaine.split()[0]
 
-def separer_nom_prenom(chaine):
-    # Séparer la chaîne par des espaces
-    parts = chaine.split()
-
-    # Le prénom est toujours la première partie, tout en minuscule
-    prenom = parts[0].capitalize()
-
-    # Le nom est tout ce qui reste, tout en majuscule
-    nom = " ".join(parts[1:]).upper()
-
-    # Retourner les deux valeurs
-    return prenom, nom
-
-def normalize_string(s):
-    s = s.lower()  # Mettre en minuscule
-    s = re.sub(r'\d+', '', s)  # Supprimer les chiffres
-    s = s.strip()  # Supprimer les espaces avant et après
-    s = ' '.join(s.split())  # Supprimer les espaces multiples
-    return s
-
-def capitalize_words(s):
-    # Mettre en majuscule chaque début de mot
-    s = s.lower()
-    return ' '.join(word.capitalize() for word in s.split())
-
 def check_and_create_file(file_path : str):
     """
     Check if the file exists, if not create it.
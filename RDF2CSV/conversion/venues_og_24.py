@@ -8,6 +8,7 @@ from utils import \
     separer_nom_prenom, \
     normalize_string, \
     capitalize_words, \
+    local_name, \
     check_and_create_file, \
     write_in_file
 
@@ -47,14 +48,14 @@ def generate_discipline_to_venue_dictionary_from_csv(file_path):
 
             for row in reader:
 
-                venue = capitalize_words(normalize_string(row["venue"])).replace(" ", separator)
+                venue = local_name(row["venue"], separator)
                 discipline_row = row["sports"]
 
                 # Convertir la chaîne de caractères en liste Python
                 discipline_list = ast.literal_eval(discipline_row)
 
                 for discipline in discipline_list:
-                    disciplineFormatted = capitalize_words(normalize_string(discipline)).replace(" ", separator)
+                    disciplineFormatted = local_name(discipline, separator)
                     if disciplineFormatted in dictionary:
                         continue
                         #dictionary[disciplineFormatted].append(venue)
@@ -0,0 +1,49 @@
+import json
+import os
+import sys
+
+from rdflib import Literal
+
+# Requêtes d'agrégation et hash partagés avec l'application (streamlit/queriesRfd.py, streamlit/query_keys.py) :
+# l'application n'utilise une table que si le hash de sa requête correspond.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "streamlit"))
+from queriesRfd import VIEW_QUERIES, VIEWS_FILE
+from query_keys import query_hash, file_hash
+
+
+def to_json_value(term):
+    if term is None:
+        return None
+    if isinstance(term, Literal):
+        value = term.toPython()
+        if isinstance(value, (bool, int, float)):
+            return value
+    return str(term)
+
+
+def materialize_views(g, rdf_file: str, view_queries: dict = VIEW_QUERIES, views_file: str = VIEWS_FILE):
+    """
+    Run the aggregation queries on the graph and save their results to the views file read
+    by the application (queriesRfd.VIEWS_FILE), with the hash of the RDF file they
+    were computed from: the application uses them for any copy of the same RDF file.
+
+    Parameters:
+        g (Graph): The graph of the RDF file.
+        rdf_file (str): The RDF file path.
+        view_queries (dict): The queries to materialize, by name.
+        views_file (str): The views file path.
+    """
+    views = {}
+    for name, query in view_queries.items():
+        results = g.query(query)
+        views[name] = {
+            "query": query_hash(query),
+            "columns": [str(var) for var in results.vars],
+            "rows": [[to_json_value(term) for term in row] for row in results],
+        }
+
+    tmp_file = views_file + ".tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump({"source": file_hash(rdf_file), "views": views}, f, ensure_ascii=False)
+    os.replace(tmp_file, views_file)
+    print(f"{len(views)} vues matérialisées dans {views_file}")
@@ -1,16 +1,11 @@
 import requests
-import urllib.parse
 
-# Définir l'URL de l'endpoint SPARQL µService
-endpoint_url = "http://localhost/service/JO/getInfosStade"
+from stadiumClient import StadiumServiceClient, enrich_venues
 
 # Nom du stade à rechercher
 stade_name = "STADE DE FRANCE"
 #stade_name = "I930660048"
 
-# Encodage correct du nom du stade
-stade_name_encoded = urllib.parse.quote(stade_name)  # encodage correct une seule fois
-
 # Requête SPARQL
 sparql_query = """
 SELECT * WHERE {
@@ -18,30 +13,23 @@ SELECT * WHERE {
 }
 """
 
-# Configuration de la requête HTTP
-params = {"name": stade_name}  # Utiliser le nom encodé correctement
-headers = {
-    "Accept": "application/sparql-results+json",
-    "Content-Type": "application/x-www-form-urlencoded"
-}
+client = StadiumServiceClient()
 
-# Effectuer la requête HTTP POST
+# Effectuer la requête HTTP (connexion réutilisée, timeout et nouvelles tentatives)
 try:
-    response = requests.post(
-        endpoint_url, 
-        params=params, 
-        data={"query": sparql_query}, 
-        headers=headers)
-
-    # Vérifier le statut de la réponse
-    if response.status_code == 200:
-        # Afficher les résultats
-        results = response.json()
-        print("Résultats de la requête SPARQL :")
-        for binding in results.get("results", {}).get("bindings", []):
-            print(binding)
-    else:
-        print(f"Erreur HTTP {response.status_code}: {response.text}")
+    bindings = client.get_bindings(stade_name, sparql_query)
+    print("Résultats de la requête SPARQL :")
+    for binding in bindings:
+        print(binding)
 
+except requests.HTTPError as e:
+    print(f"Erreur HTTP {e.response.status_code}: {e.response.text}")
 except requests.RequestException as e:
     print(f"Erreur lors de la requête : {e}")
+
+# Interroger le service pour tous les sites des JO en parallèle
+for venue, result in enrich_venues(client=client).items():
+    if isinstance(result, Exception):
+        print(f"{venue} : erreur {result}")
+    else:
+        print(f"{venue} : {len(result)} résultats")
@@ -0,0 +1,178 @@
+"""
+Serveur local qui remplace la pile Docker (Corese + MongoDB + sparql-micro-service)
+pour tester et mesurer les clients des SPARQL µServices sans réseau.
+
+Il rejoue des réponses de l'API enregistrées dans recordings/<api>/<service>/<nom>.json,
+leur applique le contexte profile.jsonld et la requête construct.sparql du service
+(dossier services/), puis évalue la requête du client sur le graphe obtenu.
+Les résultats sont servis sur la même URL que le µService :
+
+    http://localhost:<port>/service/JO/getInfosStade?name=STADE DE FRANCE&query=...
+
+Usage :
+    python localService.py --port 8080 --latency 0.2
+    python localService.py --record   # enregistre les réponses manquantes depuis l'API réelle
+"""
+import argparse
+import configparser
+import json
+import os
+import random
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, quote
+
+import requests
+from rdflib import Graph
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVICES_DIR = os.path.join(BASE_DIR, "services")
+RECORDINGS_DIR = os.path.join(BASE_DIR, "recordings")
+
+DEFAULT_QUERY = "SELECT * WHERE { ?s ?p ?o }"
+
+
+class LocalService:
+    """Un SPARQL µService (ex. JO/getInfosStade) rejoué à partir de réponses enregistrées"""
+
+    def __init__(self, service_path, record=False):
+        self.service_path = service_path
+        self.service_dir = os.path.join(SERVICES_DIR, service_path)
+        self.recordings_dir = os.path.join(RECORDINGS_DIR, service_path)
+        self.record = record
+
+        config = configparser.ConfigParser(interpolation=None, strict=False)
+        with open(os.path.join(self.service_dir, "config.ini"), encoding='utf-8') as f:
+            config.read_string("[service]\n" + f.read())
+        self.api_query = config["service"]["api_query"].strip('"')
+        self.parameters = [value.strip() for key, value in config["service"].items()
+                           if key.startswith("custom_parameter")]
+
+        with open(os.path.join(self.service_dir, "profile.jsonld"), encoding='utf-8') as f:
+            self.context = json.load(f)["@context"]
+        with open(os.path.join(self.service_dir, "construct.sparql"), encoding='utf-8') as f:
+            self.construct_query = f.read()
+
+    def recording_path(self, arguments):
+        name = "_".join(quote(arguments[parameter], safe='') for parameter in self.parameters)
+        return os.path.join(self.recordings_dir, name + ".json")
+
+    def api_response(self, arguments):
+        """Réponse enregistrée de l'API (enregistrée depuis l'API réelle en mode record)"""
+        path = self.recording_path(arguments)
+        if os.path.isfile(path):
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        if not self.record:
+            return {"total_count": 0, "results": []}
+
+        url = self.api_query
+        for parameter in self.parameters:
+            url = url.replace("{" + parameter + "}", quote(arguments[parameter]))
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+        content = response.json()
+        os.makedirs(self.recordings_dir, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(content, f, ensure_ascii=False, indent=2)
+        return content
+
+    def graph(self, arguments):
+        """Graphe du service : réponse de l'API -> JSON-LD (profile.jsonld) -> construct.sparql"""
+        document = {"@context": self.context, "@graph": self.api_response(arguments).get("results", [])}
+        api_graph = Graph()
+        api_graph.parse(data=json.dumps(document), format="json-ld")
+
+        g = Graph()
+        for triple in api_graph.query(self.construct_query):
+            g.add(triple)
+        return g
+
+    def execute(self, arguments, query):
+        """Évalue la requête du client et retourne (type de contenu, corps de la réponse)"""
+        missing = [parameter for parameter in self.parameters if not arguments.get(parameter)]
+        if missing:
+            raise ValueError(f"Paramètre(s) manquant(s) : {', '.join(missing)}")
+        results = self.graph(arguments).query(query or DEFAULT_QUERY)
+        if results.type == "CONSTRUCT" or results.type == "DESCRIBE":
+            return "text/turtle", results.serialize(format="turtle")
+        return "application/sparql-results+json", results.serialize(format="json")
+
+
+def make_handler(services, latency=0., jitter=0.):
+    """Classe de gestion des requêtes HTTP, avec une latence injectée de latency ± jitter secondes"""
+
+    class ServiceHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.handle_query(parse_qs(urlparse(self.path).query))
+
+        def do_POST(self):
+            arguments = parse_qs(urlparse(self.path).query)
+            length = int(self.headers.get("Content-Length", 0))
+            arguments.update(parse_qs(self.rfile.read(length).decode('utf-8')))
+            self.handle_query(arguments)
+
+        def handle_query(self, arguments):
+            path = urlparse(self.path).path.rstrip("/")
+            if not path.startswith("/service/") or path[len("/service/"):] not in services:
+                self.send(404, "text/plain", f"Service inconnu : {path}".encode('utf-8'))
+                return
+
+            if latency or jitter:
+                time.sleep(max(0., latency + random.uniform(-jitter, jitter)))
+
+            service = services[path[len("/service/"):]]
+            arguments = {key: values[0] for key, values in arguments.items()}
+            try:
+                content_type, body = service.execute(arguments, arguments.get("query"))
+            except ValueError as e:
+                self.send(400, "text/plain", str(e).encode('utf-8'))
+                return
+            except Exception as e:
+                self.send(500, "text/plain", str(e).encode('utf-8'))
+                return
+            self.send(200, content_type, body)
+
+        def send(self, status, content_type, body):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ServiceHandler
+
+
+def create_server(host="localhost", port=80, service_paths=("JO/getInfosStade",), latency=0., jitter=0.,
+                  record=False):
+    services = {service_path: LocalService(service_path, record) for service_path in service_paths}
+    return ThreadingHTTPServer((host, port), make_handler(services, latency, jitter))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur local des SPARQL µServices (réponses enregistrées)")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=80)
+    parser.add_argument("--service", action="append", dest="services",
+                        help="Service à servir (par défaut JO/getInfosStade), peut être répété")
+    parser.add_argument("--latency", type=float, default=0., help="Latence injectée, en secondes")
+    parser.add_argument("--jitter", type=float, default=0., help="Variation aléatoire de la latence, en secondes")
+    parser.add_argument("--record", action="store_true", help="Enregistrer les réponses manquantes depuis l'API réelle")
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, args.services or ["JO/getInfosStade"],
+                           args.latency, args.jitter, args.record)
+    print(f"Service local démarré sur http://{args.host}:{args.port}/service/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
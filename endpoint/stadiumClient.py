@@ -0,0 +1,151 @@
+import asyncio
+import csv
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# URL du SPARQL µService getInfosStade
+ENDPOINT_URL = "http://localhost/service/JO/getInfosStade"
+
+DEFAULT_QUERY = """
+SELECT DISTINCT * WHERE {
+    ?x ?y ?z
+}
+"""
+
+
+class StadiumServiceClient:
+    """
+    Client réutilisable du SPARQL µService getInfosStade.
+
+    - une session HTTP avec connexions keep-alive (pool de connexions)
+    - un timeout et des nouvelles tentatives (avec délai croissant) sur les erreurs réseau et 5xx
+    - un cache des bindings de chaque stade, valable ttl secondes
+    - un mode asyncio pour interroger plusieurs stades en parallèle
+    """
+
+    def __init__(self, endpoint_url=ENDPOINT_URL, timeout=(3.05, 15), retries=3, backoff_factor=0.5,
+                 ttl=3600, cache_size=1024, concurrency=8):
+        """
+        :param endpoint_url: URL du service.
+        :param timeout: Timeout (connexion, lecture) de chaque requête, en secondes.
+        :param retries: Nombre de nouvelles tentatives en cas d'erreur.
+        :param backoff_factor: Facteur du délai entre deux tentatives.
+        :param ttl: Durée de validité du cache, en secondes (0 pour désactiver le cache).
+        :param cache_size: Nombre maximal de stades gardés en cache.
+        :param concurrency: Nombre de requêtes parallèles par défaut de get_many_bindings, qui fixe
+            la taille du pool de connexions (une connexion par requête parallèle).
+        """
+        self.endpoint_url = endpoint_url
+        self.timeout = timeout
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+        )
+        self.session = requests.Session()
+        self.session.headers.update({"Accept": "application/sparql-results+json"})
+        self.concurrency = 0
+        self.resize_pool(concurrency)
+
+    def resize_pool(self, concurrency):
+        """
+        Agrandit le pool de connexions à concurrency connexions : au-delà de la taille du pool,
+        les requêtes parallèles ouvriraient des connexions qui ne sont pas gardées (sans keep-alive).
+        """
+        if concurrency <= self.concurrency:
+            return
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency, max_retries=self.retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.concurrency = concurrency
+
+    def get_bindings(self, stade_name, query=DEFAULT_QUERY):
+        """
+        Retourne les bindings (résultats SPARQL JSON) du service pour un stade.
+
+        :raises requests.RequestException: Si le service ne répond pas ou répond une erreur.
+        :raises ValueError: Si la réponse n'est pas du JSON.
+        :raises KeyError: Si la réponse n'a pas la forme d'un résultat SPARQL JSON.
+        """
+        key = (stade_name, " ".join(query.split()))
+        with self.lock:
+            if key in self.cache:
+                expires, bindings = self.cache[key]
+                if expires > time.monotonic():
+                    self.cache.move_to_end(key)
+                    return bindings
+                del self.cache[key]
+
+        response = self.session.get(
+            self.endpoint_url,
+            params={"query": query, "name": stade_name, "querymode": "sparql"},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        bindings = response.json()["results"]["bindings"]
+
+        if self.ttl:
+            with self.lock:
+                self.cache[key] = (time.monotonic() + self.ttl, bindings)
+                self.cache.move_to_end(key)
+                while len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+        return bindings
+
+    async def get_many_bindings_async(self, stade_names, concurrency=None, query=DEFAULT_QUERY):
+        """
+        Interroge le service pour plusieurs stades en parallèle (au plus concurrency requêtes à la fois,
+        par défaut la concurrence du client ; le pool de connexions est agrandi si besoin).
+
+        :return: Dictionnaire nom du stade -> bindings, ou l'exception levée pour ce stade
+                 (erreur réseau ou réponse mal formée) : un stade en erreur n'interrompt pas les autres.
+        """
+        concurrency = concurrency or self.concurrency
+        self.resize_pool(concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(stade_name):
+            async with semaphore:
+                try:
+                    return stade_name, await asyncio.to_thread(self.get_bindings, stade_name, query)
+                except (requests.RequestException, ValueError, KeyError) as e:
+                    return stade_name, e
+
+        return dict(await asyncio.gather(*(fetch(stade_name) for stade_name in stade_names)))
+
+    def get_many_bindings(self, stade_names, concurrency=None, query=DEFAULT_QUERY):
+        """Version synchrone de get_many_bindings_async"""
+        return asyncio.run(self.get_many_bindings_async(stade_names, concurrency, query))
+
+    def clear_cache(self):
+        with self.lock:
+            self.cache.clear()
+
+    def close(self):
+        self.session.close()
+
+
+def read_venue_names(file_path="../RDF2CSV/data/venues_og_24.csv"):
+    """
+    Lit les noms des sites dans le CSV des sites des JO.
+    Les noms sont mis en majuscules comme les noms d'installation (inst_nom) de l'API.
+    """
+    with open(file_path, encoding='utf-8-sig') as f:
+        return [row["venue"].upper() for row in csv.DictReader(f)]
+
+
+def enrich_venues(file_path="../RDF2CSV/data/venues_og_24.csv", concurrency=8, client=None):
+    """Interroge le service pour tous les sites du CSV en parallèle"""
+    client = client or StadiumServiceClient(concurrency=concurrency)
+    return client.get_many_bindings(read_venue_names(file_path), concurrency)
@@ -0,0 +1,156 @@
+import math
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Clés (16 caractères) de hash_pandas_object pour les deux hash du filtre de Bloom
+BLOOM_HASH_KEYS = ("bloom-index-h1--", "bloom-index-h2--")
+
+
+def key_hashes(keys, hash_key=None):
+    """
+    Hash 64 bits de chaque clé d'un bloc, calculés par pandas pour toute la colonne d'un coup.
+
+    :param keys: DataFrame dont chaque ligne est une clé (colonnes de chaînes).
+    :return: Tableau numpy uint64, un hash par ligne.
+    """
+    if hash_key is None:
+        return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+    return pd.util.hash_pandas_object(keys, index=False, hash_key=hash_key).to_numpy()
+
+
+def first_occurrences(hashes):
+    """Hash distincts d'un bloc et position de leur première occurrence"""
+    return np.unique(hashes, return_index=True)
+
+
+class SetIndex:
+    """Index de dédoublonnage exact qui garde les clés dans un set (comportement historique)"""
+
+    def __init__(self, capacity=None):
+        self.keys = set()
+
+    def add_many(self, keys):
+        """
+        Ajoute les clés d'un bloc (DataFrame, une clé par ligne).
+
+        :return: Masque numpy des lignes dont la clé n'était pas déjà présente
+            (ni plus haut dans le bloc).
+        """
+        new = np.zeros(len(keys), dtype=bool)
+        for i, key in enumerate(keys.itertuples(index=False, name=None)):
+            if key not in self.keys:
+                self.keys.add(key)
+                new[i] = True
+        return new
+
+    def __len__(self):
+        return len(self.keys)
+
+    def memory_bytes(self):
+        return sys.getsizeof(self.keys) + sum(
+            sys.getsizeof(key) + sum(sys.getsizeof(part) for part in key) for key in self.keys
+        )
+
+
+class HashIndex:
+    """
+    Index de dédoublonnage qui ne garde qu'un hash 64 bits par clé, dans un tableau numpy trié.
+
+    Deux clés différentes dont les hash 64 bits sont égaux sont confondues : la seconde est
+    prise pour un doublon (probabilité ~n² / 2^65, négligeable mais non nulle). Chaque bloc
+    est recherché par searchsorted puis fusionné dans le tableau, sans boucle Python.
+    """
+
+    def __init__(self, capacity=None):
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    def add_many(self, keys):
+        """
+        Ajoute les clés d'un bloc (DataFrame, une clé par ligne).
+
+        :return: Masque numpy des lignes dont la clé n'était pas déjà présente
+            (ni plus haut dans le bloc).
+        """
+        new = np.zeros(len(keys), dtype=bool)
+        if not len(keys):
+            return new
+        hashes, first = first_occurrences(key_hashes(keys))
+        positions = np.searchsorted(self.hashes, hashes)
+        found = np.zeros(len(hashes), dtype=bool)
+        inside = positions < len(self.hashes)
+        found[inside] = self.hashes[positions[inside]] == hashes[inside]
+        new[first[~found]] = True
+        if not found.all():
+            self.hashes = np.sort(np.concatenate((self.hashes, hashes[~found])))
+        return new
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def memory_bytes(self):
+        return self.hashes.nbytes
+
+
+class BloomIndex:
+    """
+    Index de dédoublonnage approché : filtre de Bloom dimensionné pour capacity clés
+    avec un taux de faux positifs fp_rate. Une clé nouvelle peut être prise pour un doublon
+    (avec une probabilité ~fp_rate), jamais l'inverse. La mémoire est fixe.
+
+    Les clés d'un bloc sont testées ensemble contre le filtre tel qu'il était avant le bloc.
+    """
+
+    def __init__(self, capacity=1000000, fp_rate=0.001):
+        self.size = max(64, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    def add_many(self, keys):
+        """
+        Ajoute les clés d'un bloc (DataFrame, une clé par ligne).
+
+        :return: Masque numpy des lignes dont la clé n'était (probablement) pas déjà présente
+            (ni plus haut dans le bloc).
+        """
+        new = np.zeros(len(keys), dtype=bool)
+        if not len(keys):
+            return new
+        h1 = key_hashes(keys, BLOOM_HASH_KEYS[0])
+        h2 = key_hashes(keys, BLOOM_HASH_KEYS[1])
+        h1, first = first_occurrences(h1)
+        h2 = h2[first]
+        # Double hachage : positions h1 + i * h2 (modulo 2^64 puis modulo size)
+        steps = np.arange(self.hash_count, dtype=np.uint64)
+        positions = (h1[:, None] + steps * h2[:, None]) % np.uint64(self.size)
+        byte = (positions >> np.uint64(3)).astype(np.intp)
+        bit = np.left_shift(np.uint8(1), (positions & np.uint64(7)).astype(np.uint8))
+        present = (self.bits[byte] & bit).all(axis=1)
+        np.bitwise_or.at(self.bits, byte[~present].ravel(), bit[~present].ravel())
+        new[first[~present]] = True
+        self.count += int((~present).sum())
+        return new
+
+    def __len__(self):
+        return self.count
+
+    def memory_bytes(self):
+        return self.bits.nbytes
+
+
+DEDUP_INDEXES = {
+    "set": SetIndex,
+    "hash64": HashIndex,
+    "bloom": BloomIndex,
+}
+
+
+def make_dedup_index(mode="hash64", capacity=100000, fp_rate=0.001):
+    """Crée l'index de dédoublonnage : "set" (exact), "hash64" (hash 64 bits) ou "bloom" (approché)"""
+    if mode not in DEDUP_INDEXES:
+        raise ValueError(f"Mode de dédoublonnage inconnu : {mode} (choix : {', '.join(DEDUP_INDEXES)})")
+    if mode == "bloom":
+        return BloomIndex(capacity, fp_rate)
+    return DEDUP_INDEXES[mode](capacity)
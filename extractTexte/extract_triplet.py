@@ -1,12 +1,20 @@
 import nltk
 from nltk.tokenize import sent_tokenize
 from pathlib import Path
+import os
 from transformers import pipeline
 import pandas as pd
+import torch
+
+from generation_cache import GenerationCache
+from text_chunks import iter_chunks
 
 class TripletExtractor:
-    def __init__(self, model_name='Babelscape/rebel-large'):
-        """Initialize the triplet extractor with REBEL model"""
+    def __init__(self, model_name='Babelscape/rebel-large', cache_path=None):
+        """
+        Initialize the triplet extractor with REBEL model.
+        With cache_path, the generations are kept in a persistent cache (see GenerationCache).
+        """
         # Download required NLTK data
         nltk.download("punkt", quiet=True)
         
@@ -14,6 +22,8 @@ class TripletExtractor:
         self.triplet_extractor = pipeline('text2text-generation', 
                                         model=model_name, 
                                         tokenizer=model_name)
+        self.model_name = model_name
+        self.cache = GenerationCache(cache_path) if cache_path else None
         print("Triplet extractor loaded successfully")
 
     def extract_triplets(self, text):
@@ -64,35 +74,96 @@ class TripletExtractor:
             
         return triplets
 
-    def process_text_file(self, input_file_path, output_csv_path):
-        """Process a text file and save extracted triplets to CSV"""
+    def make_batches(self, chunks, batch_size):
+        """Group chunks of similar token length together to limit padding"""
+        lengths = [len(ids) for ids in self.triplet_extractor.tokenizer(chunks, truncation=True)["input_ids"]]
+        order = sorted(range(len(chunks)), key=lambda i: lengths[i])
+        return [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+
+    def extract_triplets_batched(self, chunks, batch_size=8, max_length=None, **generate_kwargs):
+        """
+        Extract triplets from several chunks with padded batches of generation.
+        Yields (chunk index, triplets) as soon as each batch is decoded, so the
+        chunks are not returned in their original order.
+        The chunks are truncated to max_length tokens (by default the maximum input length of the model).
+        """
+        # The chunks already in cache are not generated again
+        todo = list(range(len(chunks)))
+        if self.cache:
+            cached = self.cache.get_many(self.model_name, chunks, generate_kwargs)
+            for i, extracted_text in cached.items():
+                yield i, self.extract_triplets(extracted_text)
+            todo = [i for i in todo if i not in cached]
+        if not todo:
+            return
+
+        tokenizer = self.triplet_extractor.tokenizer
+        model = self.triplet_extractor.model
+        for batch in self.make_batches([chunks[i] for i in todo], batch_size):
+            batch = [todo[j] for j in batch]
+            inputs = tokenizer([chunks[i] for i in batch], padding=True, truncation=True, max_length=max_length,
+                               return_tensors="pt").to(model.device)
+            with torch.no_grad():
+                generated_token_ids = model.generate(**inputs, **generate_kwargs)
+
+            # Padding tokens are removed by extract_triplets
+            extracted_texts = tokenizer.batch_decode(generated_token_ids)
+            if self.cache:
+                self.cache.put_many(self.model_name, [(chunks[i], text) for i, text in zip(batch, extracted_texts)],
+                                    generate_kwargs)
+            for i, extracted_text in zip(batch, extracted_texts):
+                yield i, self.extract_triplets(extracted_text)
+
+    def generate(self, chunk):
+        """Generated text of REBEL for one chunk, from the cache when possible"""
+        extracted_text = self.cache.get(self.model_name, chunk) if self.cache else None
+        if extracted_text is None:
+            extracted_text = self.triplet_extractor.tokenizer.batch_decode(
+                [self.triplet_extractor(chunk, return_tensors=True, return_text=False)[0]["generated_token_ids"]]
+            )[0]
+            if self.cache:
+                self.cache.put(self.model_name, chunk, extracted_text)
+        return extracted_text
+
+    def process_text_file(self, input_file_path, output_csv_path, batch_size=8):
+        """
+        Process a text file and save extracted triplets to CSV.
+        With batch_size > 1, the chunks are processed in batches (see extract_triplets_batched).
+        """
         # Read input text
         input_path = Path(input_file_path)
         if not input_path.exists():
             raise FileNotFoundError(f"Input file not found: {input_file_path}")
 
-        text = input_path.read_text(encoding='utf-8')
-        
         # Split text into chunks
-        chunks = text.split("\n\n")
+        chunks = [chunk for _, chunk in iter_chunks(input_path)]
         print(f"Processing {len(chunks)} text chunks...")
 
         all_triplets = []
-        
-        # Process each chunk
-        for i, chunk in enumerate(chunks):
-            if chunk.strip():  # Skip empty chunks
-                # Extract triplets using REBEL
-                extracted_text = self.triplet_extractor.tokenizer.batch_decode(
-                    [self.triplet_extractor(chunk, return_tensors=True, return_text=False)[0]["generated_token_ids"]]
-                )
+
+        if batch_size > 1:
+            chunks = [chunk for chunk in chunks if chunk.strip()]
+            chunk_triplets = {}
+            for i, triplets in self.extract_triplets_batched(chunks, batch_size):
+                chunk_triplets[i] = triplets
+                if len(chunk_triplets) % 10 == 0:
+                    print(f"Processed {len(chunk_triplets)}/{len(chunks)} chunks")
+            # Keep the order of the text in the CSV
+            for i in range(len(chunks)):
+                all_triplets.extend(chunk_triplets[i])
+        else:
+            # Process each chunk
+            for i, chunk in enumerate(chunks):
+                if chunk.strip():  # Skip empty chunks
+                    # Extract triplets using REBEL
+                    extracted_text = self.generate(chunk)
                 
-                # Parse the extracted triplets
-                chunk_triplets = self.extract_triplets(extracted_text[0])
-                all_triplets.extend(chunk_triplets)
+                    # Parse the extracted triplets
+                    chunk_triplets = self.extract_triplets(extracted_text)
+                    all_triplets.extend(chunk_triplets)
                 
-                if (i + 1) % 10 == 0:
-                    print(f"Processed {i + 1}/{len(chunks)} chunks")
+                    if (i + 1) % 10 == 0:
+                        print(f"Processed {i + 1}/{len(chunks)} chunks")
 
         # Convert to DataFrame and save to CSV
         if all_triplets:
@@ -102,11 +173,17 @@ class TripletExtractor:
         else:
             print("No triplets were extracted from the text")
 
+        if self.cache:
+            print(f"Generation cache: {self.cache.stats()}")
+
         return all_triplets
 
 def main():
+    # Threads used by torch for the generation, set once for the process
+    torch.set_num_threads(os.cpu_count())
+
     # Example usage
-    extractor = TripletExtractor()
+    extractor = TripletExtractor(cache_path="rebel_cache.sqlite")
     
     input_file = "text.txt"  
     output_file = "extracted_triplets.csv" 
@@ -0,0 +1,205 @@
+import csv
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from pathlib import Path
+
+import pandas as pd
+
+from text_chunks import iter_chunks
+
+SHARD_FIELDS = ['chunk_id', 'head', 'type', 'tail']
+
+
+def shard_paths(output_dir, shard_id):
+    output_dir = Path(output_dir)
+    return output_dir / f"triplets_shard_{shard_id}.csv", output_dir / f"checkpoint_shard_{shard_id}.txt"
+
+
+def existing_shards(output_dir):
+    """Ids of the shards that have an output or a checkpoint in output_dir, whatever the worker count"""
+    shard_ids = set()
+    for pattern in ("triplets_shard_*.csv", "checkpoint_shard_*.txt"):
+        for path in Path(output_dir).glob(pattern):
+            suffix = path.stem.rsplit("_", 1)[-1]
+            if suffix.isdigit():
+                shard_ids.add(int(suffix))
+    return sorted(shard_ids)
+
+
+def load_checkpoint(checkpoint_path):
+    """Return the ids of the chunks already processed by a shard"""
+    if not checkpoint_path.exists():
+        return set()
+    with open(checkpoint_path, encoding='utf-8') as f:
+        return {int(line) for line in f if line.strip()}
+
+
+def load_done(output_dir):
+    """
+    Return the ids of the chunks already processed by any shard. The chunk ids are global
+    (position in the text), so the run can be resumed with a different worker count.
+    """
+    done = set()
+    for shard_id in existing_shards(output_dir):
+        done |= load_checkpoint(shard_paths(output_dir, shard_id)[1])
+    return done
+
+
+def clean_shard_output(output_path, done):
+    """
+    Remove from the shard output the triplets of the chunks missing from the checkpoint
+    (written just before a crash), as these chunks will be processed again.
+    """
+    if not output_path.exists():
+        return
+    with open(output_path, encoding='utf-8', newline='') as f:
+        rows = [row for row in csv.DictReader(f) if row['chunk_id'] and int(row['chunk_id']) in done]
+    tmp_path = output_path.with_suffix(".tmp")
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=SHARD_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp_path, output_path)
+
+
+def clean_shards(output_dir):
+    """
+    Clean the outputs of all the shards of a previous run (see clean_shard_output), including
+    the shards above the current worker count. Done in the parent, before the workers start.
+    """
+    for shard_id in existing_shards(output_dir):
+        output_path, checkpoint_path = shard_paths(output_dir, shard_id)
+        clean_shard_output(output_path, load_checkpoint(checkpoint_path))
+
+
+def run_shard(input_file_path, output_dir, shard_id, shard_count, model_name, batch_size, num_threads,
+              cache_path=None):
+    """
+    Extract the triplets of the chunks of one shard (chunk_id % shard_count == shard_id).
+
+    The REBEL model is loaded once per worker. After each group of batch_size chunks, the
+    triplets are appended to the shard CSV, then the chunk ids are appended to the checkpoint,
+    so a restart skips the chunks already processed, by this shard or by any shard of a
+    previous run. Empty chunks are skipped, as in process_text_file.
+    """
+    # Imported in the worker so the parent process does not load transformers
+    import torch
+    from extract_triplet import TripletExtractor
+
+    if num_threads:
+        torch.set_num_threads(num_threads)
+
+    output_path, checkpoint_path = shard_paths(output_dir, shard_id)
+    done = load_done(output_dir)
+
+    todo = ((chunk_id, chunk) for chunk_id, chunk in iter_chunks(input_file_path)
+            if chunk_id % shard_count == shard_id and chunk_id not in done and chunk.strip())
+    first = next(todo, None)
+    if first is None:
+        print(f"Shard {shard_id}: nothing to do ({len(done)} chunks already processed)")
+        return shard_id, 0
+
+    extractor = TripletExtractor(model_name, cache_path)
+    processed = 0
+    new_file = not output_path.exists()
+    with open(output_path, 'a', encoding='utf-8', newline='') as output, \
+            open(checkpoint_path, 'a', encoding='utf-8') as checkpoint:
+        writer = csv.DictWriter(output, fieldnames=SHARD_FIELDS)
+        if new_file:
+            writer.writeheader()
+
+        group = []
+        for item in chain([first], todo):
+            group.append(item)
+            if len(group) >= batch_size:
+                processed += write_group(extractor, group, batch_size, writer, output, checkpoint)
+                group = []
+                print(f"Shard {shard_id}: processed {processed} chunks")
+        if group:
+            processed += write_group(extractor, group, batch_size, writer, output, checkpoint)
+
+    print(f"Shard {shard_id}: done ({processed} new chunks)")
+    return shard_id, processed
+
+
+def write_group(extractor, group, batch_size, writer, output, checkpoint):
+    chunk_ids = [chunk_id for chunk_id, _ in group]
+    chunks = [chunk for _, chunk in group]
+    for i, triplets in extractor.extract_triplets_batched(chunks, batch_size):
+        for triplet in triplets:
+            writer.writerow({'chunk_id': chunk_ids[i], **triplet})
+
+    # The triplets must be on disk before the chunks are marked as done
+    output.flush()
+    os.fsync(output.fileno())
+    checkpoint.write("".join(f"{chunk_id}\n" for chunk_id in chunk_ids))
+    checkpoint.flush()
+    os.fsync(checkpoint.fileno())
+    return len(group)
+
+
+def merge_shards(output_dir, output_csv_path):
+    """
+    Merge the outputs of all the shards found in output_dir into one CSV (head, type, tail)
+    in the order of the text
+    """
+    frames = []
+    for shard_id in existing_shards(output_dir):
+        output_path, _ = shard_paths(output_dir, shard_id)
+        if output_path.exists():
+            frames.append(pd.read_csv(output_path, keep_default_na=False))
+    if not frames:
+        print("No triplets were extracted from the text")
+        return 0
+
+    df = pd.concat(frames).sort_values('chunk_id', kind='stable')
+    df[['head', 'type', 'tail']].to_csv(output_csv_path, index=False)
+    print(f"Extracted {len(df)} triplets and saved to {output_csv_path}")
+    return len(df)
+
+
+def process_text_file_sharded(input_file_path, output_csv_path, output_dir="extraction_shards", workers=None,
+                              model_name='Babelscape/rebel-large', batch_size=8, cache_path=None):
+    """
+    Process a text file with a pool of processes and save extracted triplets to CSV.
+
+    The chunks are distributed between `workers` shards. Each shard writes its triplets and its
+    checkpoint (global chunk ids) in output_dir as it goes: running the function again after a
+    crash, with any number of workers, only processes the chunks that were not finished, then
+    merges all the shards found in output_dir into output_csv_path.
+    output_dir must be emptied when input_file_path changes, as the chunk ids are positions in the text.
+    The shards share the generation cache at cache_path, if given.
+    """
+    if not Path(input_file_path).exists():
+        raise FileNotFoundError(f"Input file not found: {input_file_path}")
+    os.makedirs(output_dir, exist_ok=True)
+    clean_shards(output_dir)
+
+    workers = workers or os.cpu_count()
+    num_threads = max(1, os.cpu_count() // workers)
+
+    # spawn: torch does not support being forked after its initialisation
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = [
+            executor.submit(run_shard, input_file_path, output_dir, shard_id, workers,
+                            model_name, batch_size, num_threads, cache_path)
+            for shard_id in range(workers)
+        ]
+        for future in futures:
+            future.result()
+
+    return merge_shards(output_dir, output_csv_path)
+
+
+def main():
+    try:
+        process_text_file_sharded("text.txt", "extracted_triplets.csv", cache_path="rebel_cache.sqlite")
+    except Exception as e:
+        print(f"Error processing file: {str(e)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+# Cache statistics shared with the converters (RDF2CSV/conversion/cache_stats.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "RDF2CSV", "conversion"))
+from cache_stats import cache_stats
+
+
+class GenerationCache:
+    """
+    Persistent cache of the REBEL generations, stored in a SQLite file.
+
+    The key is a hash of (model name, chunk text, generation parameters), so an
+    unchanged chunk is never generated twice, whatever its position in the corpus.
+    The decoded generated text is stored, as it is what extract_triplets parses.
+    """
+
+    def __init__(self, path="rebel_cache.sqlite"):
+        self.path = path
+        self.lock = threading.Lock()
+        # timeout: the shards of extract_triplet_sharded may write at the same time
+        self.connection = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS generations (key TEXT PRIMARY KEY, model TEXT, text TEXT)"
+        )
+        self.connection.commit()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model_name, chunk, params=None):
+        content = json.dumps([model_name, chunk, params or {}], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def get_many(self, model_name, chunks, params=None):
+        """Return a dictionary chunk index -> cached generated text, for the chunks in cache"""
+        keys = [self.key(model_name, chunk, params) for chunk in chunks]
+        found = {}
+        with self.lock:
+            # 500 keys per query stay under the SQLite limit of variables
+            for start in range(0, len(keys), 500):
+                part = keys[start:start + 500]
+                rows = self.connection.execute(
+                    f"SELECT key, text FROM generations WHERE key IN ({','.join('?' * len(part))})", part
+                ).fetchall()
+                found.update(rows)
+        cached = {i: found[key] for i, key in enumerate(keys) if key in found}
+        self.hits += len(cached)
+        self.misses += len(chunks) - len(cached)
+        return cached
+
+    def get(self, model_name, chunk, params=None):
+        return self.get_many(model_name, [chunk], params).get(0)
+
+    def put_many(self, model_name, items, params=None):
+        """Store the generated texts of a list of (chunk, generated text)"""
+        rows = [(self.key(model_name, chunk, params), model_name, text) for chunk, text in items]
+        with self.lock:
+            self.connection.executemany("INSERT OR REPLACE INTO generations VALUES (?, ?, ?)", rows)
+            self.connection.commit()
+
+    def put(self, model_name, chunk, text, params=None):
+        self.put_many(model_name, [(chunk, text)], params)
+
+    def stats(self):
+        return cache_stats(self.hits, self.misses)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
@@ -1,28 +1,92 @@
 from rdflib import Graph, Namespace, Literal, URIRef
 from rdflib.namespace import RDF, RDFS, XSD
+from rdflib.plugins.serializers.nt import _nt_row
 import pandas as pd
-import re
+import os
+import sys
+
+from dedup_index import make_dedup_index
+
+# Normalisation des noms partagée avec les convertisseurs CSV (RDF2CSV/conversion/normalization.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "RDF2CSV", "conversion"))
+import normalization
+
+class NTriplesWriter:
+    """Écrit les triplets dans un fichier N-Triples au fur et à mesure, sans garder de graphe en mémoire"""
+
+    def __init__(self, output_path, buffer_size=10000):
+        self.file = open(output_path, 'w', encoding='utf-8')
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.count = 0
+
+    def add(self, triple):
+        self.buffer.append(_nt_row(triple))
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        self.file.write("".join(self.buffer))
+        self.count += len(self.buffer)
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+        self.file.close()
 
 class OlympicsRDFConverter:
-    def __init__(self):
+    def __init__(self, dedup="hash64", dedup_capacity=100000, dedup_fp_rate=0.001):
+        """
+        dedup : index des triplets déjà traités, "set" (exact), "hash64" (hash 64 bits)
+        ou "bloom" (approché, taux de faux positifs dedup_fp_rate), voir dedup_index.py ;
+        en streaming, il garde aussi les triplets de description écrits (dedup_capacity les compte)
+        """
         self.olympics = Namespace("http://example.org/olympics#")
         self.g = Graph()
         self.g.bind("olympics", self.olympics)
-        self.processed_triplets = set()
+        self.processed_triplets = make_dedup_index(dedup, dedup_capacity, dedup_fp_rate)
         self.current_olympics = None
+        # Destination des triplets : le graphe, ou un NTriplesWriter en mode streaming
+        self.out = self.g
+        # En streaming, triplets de description du bloc en cours, en attente de dédoublonnage
+        self.pending = []
 
     def clean_text(self, text):
-        text = text.lower().strip()
-        text = re.sub(r'[^\w\s-]', '', text)
-        text = re.sub(r'[-\s]+', '_', text)
-        return text
+        return normalization.clean_text(text)
+
+    def clean_series(self, series):
+        # Même normalisation que clean_text, sur toute une colonne
+        return (series.str.lower().str.strip()
+                .str.replace(normalization.NOT_WORD, '', regex=True)
+                .str.replace(normalization.SEPARATORS, '_', regex=True))
+
+    def add_once(self, triple):
+        # En streaming, les triplets de description (type, label...) ne sont écrits qu'une fois :
+        # ils sont gardés jusqu'à la fin du bloc puis dédoublonnés ensemble (voir flush_pending)
+        if self.out is self.g:
+            self.out.add(triple)
+        else:
+            self.pending.append(triple)
 
-    def create_resource_uri(self, text, class_type=None):
-        clean_id = self.clean_text(text)
+    def flush_pending(self):
+        # Dédoublonnage des triplets de description du bloc dans processed_triplets
+        # (clé : ligne N-Triples, une seule colonne, donc distincte des clés des triplets extraits)
+        if not self.pending:
+            return
+        lines = pd.DataFrame({'line': [_nt_row(triple) for triple in self.pending]})
+        new = self.processed_triplets.add_many(lines)
+        for triple, is_new in zip(self.pending, new):
+            if is_new:
+                self.out.add(triple)
+        self.pending = []
+
+    def create_resource_uri(self, text, class_type=None, clean_id=None):
+        if clean_id is None:
+            clean_id = self.clean_text(text)
         uri = self.olympics[clean_id]
         if class_type:
-            self.g.add((uri, RDF.type, class_type))
-        self.g.add((uri, RDFS.label, Literal(text)))
+            self.add_once((uri, RDF.type, class_type))
+        self.add_once((uri, RDFS.label, Literal(text)))
         return uri
 
     def get_olympics_uri(self, name):
@@ -34,50 +98,85 @@ class OlympicsRDFConverter:
             return self.current_olympics
         return self.create_resource_uri(name, self.olympics.Olympics)
 
-    def is_valid_triplet(self, head, relation, tail):
-        # Pour les JO 2024, on vérifie si on n'a pas déjà traité ce type de relation
-        if "2024" in head:
-            relation_key = (self.clean_text("Jeux olympiques d'été de 2024"), relation, tail.lower())
-            if relation_key in self.processed_triplets:
-                return False
-            self.processed_triplets.add(relation_key)
-            return True
-
-        # Pour les autres triplets, vérification simple des doublons
-        triplet_key = (head.lower(), relation, tail.lower())
-        if triplet_key in self.processed_triplets:
-            return False
-        self.processed_triplets.add(triplet_key)
-        return True
+    def triplet_keys(self, df):
+        # Clés de dédoublonnage de toute une colonne de triplets : pour les JO 2024, on ne
+        # garde qu'un triplet par type de relation et valeur, pour les autres les doublons simples
+        olympics_2024 = df['head'].str.contains("2024", regex=False)
+        head_keys = df['head'].str.lower().where(~olympics_2024, self.clean_text("Jeux olympiques d'été de 2024"))
+        return pd.DataFrame({'head': head_keys, 'relation': df['type'], 'tail': df['tail'].str.lower()})
 
-    def convert_triplets_to_rdf(self, csv_path):
-        df = pd.read_csv(csv_path)
-        
-        for _, row in df.iterrows():
-            head, relation, tail = row['head'], row['type'], row['tail']
-            
-            # Ignorer les Jeux d'été sans année
-            if head == "Jeux olympiques d'été":
-                continue
-
-            if not self.is_valid_triplet(head, relation, tail):
-                continue
-
-            if "Jeux olympiques" in head:
-                olympics_uri = self.get_olympics_uri(head)
-                if relation == "point in time":
-                    year = tail
-                    self.g.add((olympics_uri, self.olympics.startDate, 
+    def dedup_stats(self):
+        index = self.processed_triplets
+        return {
+            "index": type(index).__name__,
+            "keys": len(index),
+            "memory_bytes": index.memory_bytes(),
+        }
+
+    def add_triplet(self, head, relation, tail, head_id=None, tail_id=None):
+        # Les Jeux d'été sans année et les doublons sont écartés par convert_chunk
+        if "Jeux olympiques" in head:
+            olympics_uri = self.get_olympics_uri(head)
+            if relation == "point in time":
+                year = tail
+                self.out.add((olympics_uri, self.olympics.startDate, 
                               Literal(f"{year}-07-26", datatype=XSD.date)))
-                elif relation == "country":
-                    country_uri = self.create_resource_uri(tail, self.olympics.Country)
-                    self.g.add((olympics_uri, self.olympics.hostCountry, country_uri))
-
-            elif relation == "sport":
-                athlete_uri = self.create_resource_uri(head, self.olympics.Athlete)
-                discipline_uri = self.create_resource_uri(tail, self.olympics.Discipline)
-                self.g.add((athlete_uri, self.olympics.belongsToDiscipline, discipline_uri))
-                self.g.add((athlete_uri, self.olympics.isDisabled, Literal(False)))
+            elif relation == "country":
+                country_uri = self.create_resource_uri(tail, self.olympics.Country, tail_id)
+                self.out.add((olympics_uri, self.olympics.hostCountry, country_uri))
+
+        elif relation == "sport":
+            athlete_uri = self.create_resource_uri(head, self.olympics.Athlete, head_id)
+            discipline_uri = self.create_resource_uri(tail, self.olympics.Discipline, tail_id)
+            self.out.add((athlete_uri, self.olympics.belongsToDiscipline, discipline_uri))
+            self.add_once((athlete_uri, self.olympics.isDisabled, Literal(False)))
+
+    def convert_chunk(self, df):
+        # Ignorer les Jeux d'été sans année, puis les triplets déjà traités (dédoublonnage du bloc d'un coup)
+        df = df[df['head'] != "Jeux olympiques d'été"]
+        df = df[self.processed_triplets.add_many(self.triplet_keys(df))]
+        # Les identifiants des ressources sont calculés pour toute la colonne d'un coup
+        head_ids = self.clean_series(df['head'])
+        tail_ids = self.clean_series(df['tail'])
+        for head, relation, tail, head_id, tail_id in zip(df['head'], df['type'], df['tail'], head_ids, tail_ids):
+            self.add_triplet(head, relation, tail, head_id, tail_id)
+        self.flush_pending()
+
+    def convert_triplets_to_rdf(self, csv_path):
+        df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+        self.convert_chunk(df)
+
+    def iter_chunks(self, source, chunksize):
+        # source : chemin d'un CSV (head, type, tail) ou itérable de triplets {'head', 'type', 'tail'}
+        if isinstance(source, str):
+            yield from pd.read_csv(source, dtype=str, keep_default_na=False, chunksize=chunksize)
+            return
+        triplets = []
+        for triplet in source:
+            triplets.append(triplet)
+            if len(triplets) == chunksize:
+                yield pd.DataFrame(triplets, columns=['head', 'type', 'tail'])
+                triplets = []
+        if triplets:
+            yield pd.DataFrame(triplets, columns=['head', 'type', 'tail'])
+
+    def stream_triplets_to_rdf(self, source, output_path, chunksize=100000):
+        """
+        Convertit les triplets par blocs de chunksize lignes et écrit le RDF en N-Triples
+        au fur et à mesure, sans charger tout le CSV ni le graphe en mémoire.
+        """
+        self.out = NTriplesWriter(output_path)
+        try:
+            for df in self.iter_chunks(source, chunksize):
+                self.convert_chunk(df)
+            self.out.flush()
+            print(f"{self.out.count} triplets écrits dans {output_path}")
+            print(f"Index de dédoublonnage : {self.dedup_stats()}")
+            print(f"Cache de normalisation : {normalization.stats()}")
+        finally:
+            self.out.close()
+            self.out = self.g
+            self.pending = []
 
     def save_rdf(self, output_path):
         self.g.serialize(destination=output_path, format="turtle")
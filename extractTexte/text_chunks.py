@@ -0,0 +1,28 @@
+CHUNK_SEPARATOR = "\n\n"
+
+# Characters read at a time by iter_chunks
+READ_SIZE = 1 << 16
+
+
+def iter_chunks(input_file_path):
+    """
+    Stream the chunks of a text file without reading the whole file in memory.
+
+    The chunks are exactly the items of text.split(CHUNK_SEPARATOR), in order, with the
+    text read as by Path.read_text (universal newlines): a chunk has the same text, so the
+    same generation cache key, in process_text_file and in the sharded extraction.
+    Yields (chunk id, chunk text); the ids count the empty chunks too.
+    """
+    chunk_id = 0
+    pending = ""
+    with open(input_file_path, encoding='utf-8') as f:
+        while True:
+            block = f.read(READ_SIZE)
+            if not block:
+                break
+            parts = (pending + block).split(CHUNK_SEPARATOR)
+            pending = parts.pop()
+            for part in parts:
+                yield chunk_id, part
+                chunk_id += 1
+    yield chunk_id, pending
@@ -5,10 +5,29 @@ from rdflib import Graph, Namespace, URIRef, OWL, RDF, RDFS
 from pyvis.network import Network
 import networkx as nx
 import json
+import os
+import sys
 import tempfile
 from streamlit_folium import folium_static
 import folium
 from queriesRfd import *
+from graph_snapshot import load_turtle_with_snapshot, file_version
+from query_cache import QueryResultCache, QUERY_CACHE_DIR
+from materialized_views import load_views, find_view
+from columnar_index import ColumnarIndex
+from columnar_queries import find_plan
+from graph_layout import RelationGraph
+from prepared_queries import prepare_all, run_query
+from pagination import (PAGE_SIZE, fetch_page, slice_page, iter_rows, iter_frame_rows,
+                        stream_csv, stream_parquet, parquet_available)
+
+# Client du µService getInfosStade (dossier endpoint/)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "endpoint"))
+from stadiumClient import StadiumServiceClient
+
+# Store SQLite du graphe (dossier RDF2CSV/conversion)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "RDF2CSV", "conversion"))
+from SQLiteStore import open_sqlite_graph, bulk_load
 
 # Configuration de la page
 st.set_page_config(
@@ -17,75 +36,75 @@ st.set_page_config(
     layout="wide"
 )
 
-# Map item_choice to the corresponding queries
-query_mapping = {
-    "Stades": STADES_QUERIES,
-    "Equipes": EQUIPES_QUERIES,
-    "Medailles": MEDAILLES_QUERIES,
-    "Athletes": ATHLETES_QUERIES,
-    "Disciplines": DISCIPLINES_QUERIES,
-    "Visualisation": {
-        "Relations": """
+# Relations entre ressources affichées dans l'onglet Visualisation
+RELATIONS_QUERY = """
         PREFIX : <http://example.org/olympics#>
+        PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
         CONSTRUCT {
             ?s ?p ?o
         }
         WHERE {
             ?s ?p ?o .
-            FILTER(!isBlank(?s))
-            FILTER(!isBlank(?o))
+            FILTER(isIRI(?s) && isIRI(?o))
+            FILTER(?p != rdf:type)
         }
-        LIMIT 1000
         """
+
+# Map item_choice to the corresponding queries
+query_mapping = {
+    "Stades": STADES_QUERIES,
+    "Equipes": EQUIPES_QUERIES,
+    "Medailles": MEDAILLES_QUERIES,
+    "Athletes": ATHLETES_QUERIES,
+    "Disciplines": DISCIPLINES_QUERIES,
+    # Vues calculées côté serveur (graph_layout.py) sur les relations décrites par cette requête
+    "Visualisation": {
+        "Vue d'ensemble": RELATIONS_QUERY,
+        "Voisinage d'une entité": RELATIONS_QUERY
     }
 }
 
-def create_graph_visualization(construct_results):
-    """Crée une visualisation du graphe avec pyvis"""
-    if construct_results is None:
+def create_graph_visualization(view):
+    """
+    Affiche une vue de graph_layout.RelationGraph avec pyvis. Les positions sont calculées
+    côté serveur : la simulation physique est désactivée dans le navigateur.
+    """
+    if view is None or not view["nodes"]:
         st.error("Pas de données à visualiser")
         return
-        
+
     net = Network(height="750px", width="100%", bgcolor="#ffffff", font_color="black")
-    net.toggle_hide_edges_on_drag(True)
-    net.barnes_hut()
-    
-    # Ajout des nœuds et des arêtes
-    added_nodes = set()
-    for s, p, o in construct_results:
-        # Conversion des URIs en chaînes plus lisibles
-        s_label = str(s).split('#')[-1].replace('%20', ' ')
-        p_label = str(p).split('#')[-1].replace('%20', ' ')
-        o_label = str(o).split('#')[-1].replace('%20', ' ')
-        
-        # Ajout des nœuds s'ils n'existent pas déjà
-        if s_label not in added_nodes:
-            net.add_node(s_label, label=s_label, title=str(s))
-            added_nodes.add(s_label)
-        if o_label not in added_nodes:
-            net.add_node(o_label, label=o_label, title=str(o))
-            added_nodes.add(o_label)
-            
-        # Ajout de l'arête
-        net.add_edge(s_label, o_label, label=p_label, title=str(p))
-    
+
+    for node in view["nodes"]:
+        net.add_node(
+            node["id"],
+            label=node["label"],
+            title=node["title"],
+            group=node["group"],
+            size=node["size"],
+            shape=node.get("shape", "dot"),
+            x=node["x"],
+            y=node["y"],
+            physics=False
+        )
+    for edge in view["edges"]:
+        net.add_edge(edge["source"], edge["target"], label=edge["label"], title=edge["title"],
+                     value=edge["count"])
+
     net.set_options("""
     {
         "physics": {
-            "barnesHut": {
-                "gravitationalConstant": -2000,
-                "centralGravity": 0.3,
-                "springLength": 200
-            },
-            "maxVelocity": 50,
-            "minVelocity": 0.75,
-            "solver": "barnesHut"
+            "enabled": false
         },
         "edges": {
-            "smooth": {
-                "type": "continuous",
-                "forceDirection": "none"
+            "smooth": false,
+            "scaling": {
+                "min": 1,
+                "max": 8
             }
+        },
+        "interaction": {
+            "hideEdgesOnDrag": true
         }
     }
     """)
@@ -122,153 +141,248 @@ def create_map(df):
     except Exception as e:
         st.error(f"Erreur lors de la création de la carte: {str(e)}")
 
+# Fichiers Turtle chargés dans le graphe
+GRAPH_FILES = [
+    ("../data/data/output_og_24.ttl", "fichier des JO"),
+    ("../data/data/simulate.ttl", "Pour Endpoint")
+]
+
+# Fichier SQLite du graphe partagé par tous les processus Streamlit, par exemple
+# ".graph_store/graph.sqlite" (None : chaque processus garde le graphe en mémoire)
+GRAPH_STORE = None
+
+def graph_version():
+    """Version des fichiers du graphe (date de modification et taille), vérifiée à chaque rerun"""
+    versions = []
+    for file_path, _ in GRAPH_FILES:
+        try:
+            versions.append(file_version(file_path))
+        except OSError:
+            versions.append(None)
+    return tuple(versions)
+
+@st.cache_resource(show_spinner="Chargement des données RDF...")
+def load_shared_graph(version):
+    """
+    Charge le graphe une seule fois pour toutes les sessions et tous les reruns.
+    Il est rechargé quand la version des fichiers change.
+    """
+    if GRAPH_STORE:
+        return load_graph_store(version)
+
+    g = Graph()
+    status = []
+    for file_path, description in GRAPH_FILES:
+        try:
+            load_turtle_with_snapshot(g, file_path)
+            status.append((description, None))
+        except Exception as e:
+            status.append((description, str(e)))
+    return g, status
+
+@st.cache_resource
+def open_graph_store():
+    """
+    Connexion unique du processus au store GRAPH_STORE, réutilisée pour toutes les versions
+    des fichiers : aucune connexion ne reste ouverte sur une version abandonnée.
+    """
+    return open_sqlite_graph(GRAPH_STORE)
+
+def load_graph_store(version):
+    """
+    Ouvre le graphe persisté dans GRAPH_STORE. Les fichiers Turtle n'y sont chargés que
+    si le store a été rempli avec une autre version des fichiers : les autres processus
+    et les redémarrages réutilisent le store sans parser les fichiers.
+
+    Le rechargement se fait en une seule transaction (SQLiteStore.rebuild) : les autres
+    processus continuent de lire l'ancien graphe jusqu'au commit, et un processus qui
+    démarre pendant le chargement attend puis réutilise le store au lieu de le recharger.
+    """
+    g = open_graph_store()
+    status = []
+
+    def load():
+        for file_path, description in GRAPH_FILES:
+            try:
+                bulk_load(g, file_path)
+                status.append((description, None))
+            except Exception as e:
+                status.append((description, str(e)))
+
+    if not g.store.rebuild(repr(version), load):
+        status = [(description, None) for _, description in GRAPH_FILES]
+    return g, status
+
+@st.cache_resource
+def get_query_cache():
+    """Cache des résultats de requêtes partagé entre toutes les sessions"""
+    return QueryResultCache(maxsize=128, persist_dir=QUERY_CACHE_DIR)
+
+@st.cache_resource
+def load_shared_views(version):
+    """Tables d'agrégation calculées par la conversion, rechargées quand les fichiers changent"""
+    return load_views(GRAPH_FILES[0][0])
+
+@st.cache_resource(show_spinner="Construction de l'index en colonnes...")
+def load_columnar_index(version):
+    """Index en colonnes du graphe (requêtes d'agrégation), reconstruit quand les fichiers changent"""
+    g, _ = load_shared_graph(version)
+    return ColumnarIndex.from_graph(g)
+
+@st.cache_resource(show_spinner="Extraction des relations du graphe...")
+def load_relation_graph(version):
+    """Relations entre ressources pour l'onglet Visualisation, une fois par version du graphe"""
+    return RelationGraph(load_columnar_index(version))
+
+@st.cache_resource(show_spinner="Calcul de la vue d'ensemble...")
+def load_overview(version):
+    """Vue d'ensemble et sa mise en page, calculées une fois par version du graphe"""
+    return load_relation_graph(version).overview()
+
+@st.cache_resource(max_entries=64, show_spinner="Calcul du voisinage...")
+def load_neighborhood(version, center, depth):
+    return load_relation_graph(version).neighborhood(center, depth)
+
+@st.cache_resource
+def prepare_registered_queries():
+    """Analyse une seule fois toutes les requêtes des thèmes, pour tous les reruns et sessions"""
+    return prepare_all(query_mapping.values()) + prepare_all([{"events": STADIUM_EVENTS_QUERY}])
+
+@st.cache_resource
+def get_stadium_client():
+    """Client du service des stades (connexions et cache partagés entre toutes les sessions)"""
+    return StadiumServiceClient()
+
 def load_graph():
     """Charge les données RDF depuis les deux fichiers Turtle"""
-    g = Graph()
     try:
-        # Liste des fichiers à charger
-        files = [
-            ("../data/data/output_og_24.ttl", "fichier des JO"),
-            ("../data/data/simulate.ttl", "Pour Endpoint")        
-            ]
-        
-        for file_path, description in files:
-            try:
-                g.parse(file_path, format="turtle")
+        g, status = load_shared_graph(graph_version())
+
+        for description, error in status:
+            if error is None:
                 st.sidebar.success(f"{description} chargé avec succès")
-            except Exception as e:
-                st.sidebar.error(f"Erreur lors du chargement de {description}: {str(e)}")
+            else:
+                st.sidebar.error(f"Erreur lors du chargement de {description}: {error}")
                 st.sidebar.info("Tentative de continuer avec les données disponibles...")
-        
+
         return g
     except Exception as e:
         st.error(f"Erreur critique lors du chargement des données: {str(e)}")
         return None
 
-def execute_query(g, query):
-    """Exécute une requête SPARQL avec gestion des appels service"""
+def execute_query(g, query, query_name=None, parameters=None):
+    """
+    Exécute une requête SPARQL avec gestion des appels service.
+    Les paramètres (ex. {"stadium": "STADE DE FRANCE"}) sont liés à la requête préparée
+    sans modifier son texte.
+    """
     if g is None:
         st.error("Graphe non initialisé")
         return None
         
     try:
         if "SERVICE" in query:
-            import re
-            match = re.search(r'getInfosStade\?name=(.*?)>', query)
-            if match:
-                stade_name = match.group(1)
+            stade_name = (parameters or {}).get("stadium")
+            if not stade_name:
+                import re
+                match = re.search(r'getInfosStade\?name=(.*?)>', query)
+                stade_name = match.group(1) if match else None
+            if stade_name:
                 
                 # Définir le format de sortie selon la requête
                 is_event_query = "Event" in query or "event" in query
                 
-                params = {
-                    'query': """
-                    SELECT DISTINCT * WHERE {
-                        ?x ?y ?z
-                    }
-                    """,
-                    'name': stade_name,
-                    'querymode': 'sparql'
-                }
-                
-                headers = {
-                    'Accept': 'application/sparql-results+json'
-                }
-                
-                response = requests.get(
-                    "http://localhost/service/JO/getInfosStade",
-                    params=params,
-                    headers=headers
-                )
-                
-                if response.status_code == 200:
-                    json_data = response.json()
+                try:
+                    bindings = get_stadium_client().get_bindings(stade_name)
+                except requests.HTTPError as e:
+                    st.error(f"Erreur lors de l'appel au service: {e.response.status_code}")
+                    st.error(f"Réponse du service: {e.response.text}")
+                    return None
+                except requests.RequestException as e:
+                    st.error(f"Erreur lors de l'appel au service: {str(e)}")
+                    return None
+
+                if not bindings:
+                    st.warning(f"Aucun résultat trouvé pour le stade '{stade_name}'")
+                    return pd.DataFrame()
+
+                if is_event_query:
+                    # Pour la requête des événements
+                    events_data = []
+                    stadium_info = {}
                     
-                    if not json_data['results']['bindings']:
-                        st.warning(f"Aucun résultat trouvé pour le stade '{stade_name}'")
-                        return pd.DataFrame()
-
-                    if is_event_query:
-                        # Pour la requête des événements
-                        events_data = []
-                        stadium_info = {}
+                    # D'abord extraire les infos du stade du service
+                    for binding in bindings:
+                        y_value = binding['y']['value'].split('#')[-1]
+                        z_value = binding['z']['value']
                         
-                        # D'abord extraire les infos du stade du service
-                        for binding in json_data['results']['bindings']:
-                            y_value = binding['y']['value'].split('#')[-1]
-                            z_value = binding['z']['value']
-                            
-                            if 'name' in y_value.lower():
-                                stadium_info['name'] = z_value
-                            elif 'capacity' in y_value.lower():
-                                stadium_info['capacity'] = int(z_value)
-
-                        # Ensuite exécuter la requête locale pour les événements
-                        local_query = """
-                        PREFIX : <http://example.org/olympics#>
-                        SELECT ?event ?discipline ?date WHERE {
-                            ?eventUri a :Event ;
-                                     :name ?event ;
-                                     :belongsToDiscipline ?discipline ;
-                                     :isScheduledAtTime ?date ;
-                                     :takesPlaceAt ?venueUri .
-                            ?venueUri :name ?stadiumName .
-                            FILTER(str(?stadiumName) = "%s")
-                        }
-                        ORDER BY ?date
-                        """ % stadium_info['name']
-
-                        local_results = g.query(local_query)
-                        
-                        # Combiner les résultats
-                        for row in local_results:
-                            events_data.append({
-                                'stadium': stadium_info['name'],
-                                'event': str(row[0]),
-                                'discipline': str(row[1]).split('#')[-1],
-                                'date': str(row[2]),
-                                'capacity': stadium_info['capacity']
-                            })
-                        
-                        return pd.DataFrame(events_data)
-                    else:
-                        # Pour les requêtes standard de stade
-                        records = []
-                        current_record = {}
+                        if 'name' in y_value.lower():
+                            stadium_info['name'] = z_value
+                        elif 'capacity' in y_value.lower():
+                            stadium_info['capacity'] = int(z_value)
+
+                    # Ensuite exécuter la requête locale pour les événements
+                    local_results = run_query(g, STADIUM_EVENTS_QUERY, {"stadium": stadium_info['name']})
+                    
+                    # Combiner les résultats
+                    for row in local_results:
+                        events_data.append({
+                            'stadium': stadium_info['name'],
+                            'event': str(row[0]),
+                            'discipline': str(row[1]).split('#')[-1],
+                            'date': str(row[2]),
+                            'capacity': stadium_info['capacity']
+                        })
+                    
+                    return pd.DataFrame(events_data)
+                else:
+                    # Pour les requêtes standard de stade
+                    records = []
+                    current_record = {}
+                    
+                    for binding in bindings:
+                        x_value = binding['x']['value'].split('#')[-1]
+                        y_value = binding['y']['value'].split('#')[-1]
+                        z_value = binding['z']['value']
                         
-                        for binding in json_data['results']['bindings']:
-                            x_value = binding['x']['value'].split('#')[-1]
-                            y_value = binding['y']['value'].split('#')[-1]
-                            z_value = binding['z']['value']
-                            
-                            if 'name' in y_value.lower():
-                                current_record['name'] = z_value
-                            elif 'capacity' in y_value.lower():
-                                current_record['capacity'] = int(z_value)
-                            elif 'description' in y_value.lower():
-                                current_record['description'] = z_value
-                            elif 'latitude' in y_value.lower():
-                                current_record['lat'] = float(z_value)
-                            elif 'longitude' in y_value.lower():
-                                current_record['lon'] = float(z_value)
-                            
-                            if len(current_record) > 0 and 'name' in current_record:
-                                if current_record not in records:
-                                    records.append(current_record.copy())
+                        if 'name' in y_value.lower():
+                            current_record['name'] = z_value
+                        elif 'capacity' in y_value.lower():
+                            current_record['capacity'] = int(z_value)
+                        elif 'description' in y_value.lower():
+                            current_record['description'] = z_value
+                        elif 'latitude' in y_value.lower():
+                            current_record['lat'] = float(z_value)
+                        elif 'longitude' in y_value.lower():
+                            current_record['lon'] = float(z_value)
                         
-                        return pd.DataFrame(records)
+                        if len(current_record) > 0 and 'name' in current_record:
+                            if current_record not in records:
+                                records.append(current_record.copy())
                     
-                else:
-                    st.error(f"Erreur lors de l'appel au service: {response.status_code}")
-                    st.error(f"Réponse du service: {response.text}")
-                    return None
+                    return pd.DataFrame(records)
         
-        # Pour les autres requêtes
+        # Requêtes d'agrégation déjà calculées lors de la conversion,
+        # ou jointures en étoile et agrégations évaluées en colonnes (numpy)
+        version = graph_version()
+        result = precomputed_result(query, query_name, version)
+        if result is not None:
+            return result
+
+        # Pour les autres requêtes (résultats mis en cache jusqu'au changement des fichiers du graphe)
+        cache = get_query_cache()
+        cache_key = query + (f"\n# {sorted(parameters.items())}" if parameters else "")
+        cached = cache.get(cache_key, version)
+        if cached is not None:
+            return cached
+
         if "CONSTRUCT" in query:
-            return g.query(query)
-            
-        results = g.query(query)
-        return pd.DataFrame(results, columns=results.vars)
+            results = list(run_query(g, query, parameters))
+        else:
+            results = run_query(g, query, parameters)
+            results = pd.DataFrame(results, columns=results.vars)
+        cache.put(cache_key, version, results)
+        return results
         
     except Exception as e:
         st.error(f"Erreur lors de l'exécution de la requête: {str(e)}")
@@ -276,12 +390,88 @@ def execute_query(g, query):
         st.error(f"Détails de l'erreur: {traceback.format_exc()}")
         return None
 
+def precomputed_result(query, query_name, version):
+    """Résultat complet déjà disponible (table d'agrégation ou plan en colonnes), sinon None"""
+    view = find_view(load_shared_views(version), query_name, query)
+    if view is not None:
+        return view
+    plan = find_plan(query)
+    if plan is not None:
+        return plan(load_columnar_index(version))
+    return None
+
+def execute_query_page(g, query, query_name=None, parameters=None, page=0, page_size=PAGE_SIZE):
+    """
+    Une page du résultat d'une requête SELECT : la requête préparée est découpée après
+    l'exécution, seules les lignes de la page sont construites. Les pages sont mises en cache.
+
+    :return: Tuple (DataFrame de la page, True s'il existe une page suivante), ou (None, False).
+    """
+    try:
+        version = graph_version()
+        result = precomputed_result(query, query_name, version)
+        if result is not None:
+            return slice_page(result, page, page_size)
+
+        cache = get_query_cache()
+        cache_key = query + (f"\n# {sorted(parameters.items())}" if parameters else "") + f"\n# page {page} {page_size}"
+        page_df = cache.get(cache_key, version)
+        if page_df is None:
+            page_df, has_next = fetch_page(g, query, page, page_size, parameters)
+            page_df.attrs["has_next"] = has_next
+            cache.put(cache_key, version, page_df)
+        return page_df, page_df.attrs.get("has_next", False)
+    except Exception as e:
+        st.error(f"Erreur lors de l'exécution de la requête: {str(e)}")
+        return None, False
+
+def export_row_batches(g, query, query_name=None, parameters=None):
+    """Lignes du résultat complet par blocs (en-tête en premier), pour les exports"""
+    result = precomputed_result(query, query_name, graph_version())
+    if result is not None:
+        return iter_frame_rows(result)
+    return iter_rows(g, query, parameters)
+
+def export_widget(export_key, file_stem, make_row_batches):
+    """
+    Bouton de téléchargement du résultat complet. L'export n'est construit (en flux, bloc par bloc)
+    que lorsqu'il est demandé, et non à chaque rerun. Il est écrit dans un fichier temporaire :
+    la session ne garde que son chemin, pas son contenu.
+    """
+    formats = ["CSV"] + (["Parquet"] if parquet_available() else [])
+    export_format = st.sidebar.radio("Format d'export", formats, horizontal=True)
+    export_key = (export_key, export_format)
+    extension, mime = ("parquet", "application/octet-stream") if export_format == "Parquet" else ("csv", "text/csv")
+
+    if st.sidebar.button("Préparer l'export"):
+        previous = st.session_state.pop("export", None)
+        if previous is not None and os.path.exists(previous[1]):
+            os.remove(previous[1])
+        with tempfile.NamedTemporaryFile(suffix=f".{extension}", delete=False) as f:
+            if export_format == "Parquet":
+                stream_parquet(make_row_batches(), f)
+            else:
+                for block in stream_csv(make_row_batches()):
+                    f.write(block)
+        st.session_state["export"] = (export_key, f.name)
+
+    export = st.session_state.get("export")
+    if export is not None and export[0] == export_key and os.path.exists(export[1]):
+        with open(export[1], 'rb') as f:
+            st.sidebar.download_button(
+                label=f"📥 Télécharger les résultats ({export_format})",
+                data=f,
+                file_name=f"{file_stem}.{extension}",
+                mime=mime
+            )
+
 def main():
    st.title("🏅 Explorateur SPARQL - JO Paris 2024")
    
    try:
        # Chargement du graphe
        g = load_graph()
+       prepare_registered_queries()
        st.sidebar.success("Données chargées avec succès!")
    except Exception as e:
        st.sidebar.error(f"Erreur lors du chargement des données: {str(e)}")
@@ -310,41 +500,66 @@ def main():
            list(query_mapping.get(item_choice).keys())
        )
 
+       # Le nom du stade est un paramètre de la requête, jamais inséré dans son texte
+       parameters = {"stadium": stade_name} if item_choice == "Stades" and stade_name else None
+
        with st.expander("Voir la requête SPARQL"):
            base_query = query_mapping.get(item_choice)[query_choice]
-           if item_choice == "Stades" and stade_name:
-               # Remplacer le nom du stade dans la requête
-               query = base_query.replace("STADE DE FRANCE", stade_name)
-               st.code(query, language="sparql")
-           else:
-               st.code(base_query, language="sparql")
+           st.code(base_query, language="sparql")
+           if parameters:
+               st.caption(f"Paramètre ?stadium = {stade_name!r}")
 
+       file_stem = f"jo_paris_2024_{query_choice.lower().replace(' ', '_')}"
        try:
-           results = None
-           if item_choice == "Stades" and stade_name:
-               results = execute_query(g, query)
-           else:
-               results = execute_query(g, base_query)
-
            # Traitement spécial pour la visualisation
            if item_choice == "Visualisation":
-               create_graph_visualization(results)
-           else:
-               # Affichage standard des résultats
+               version = graph_version()
+               if query_choice == "Voisinage d'une entité":
+                   search = st.sidebar.text_input("Rechercher une entité", "France")
+                   matches = load_relation_graph(version).find_entities(search)
+                   if not matches:
+                       st.warning(f"Aucune entité ne correspond à '{search}'")
+                   else:
+                       choice = st.sidebar.selectbox("Entité", range(len(matches)),
+                                                     format_func=lambda i: matches[i][1])
+                       depth = st.sidebar.slider("Profondeur", 1, 3, 1)
+                       view = load_neighborhood(version, matches[choice][0], depth)
+                       if view["truncated"]:
+                           st.caption(f"{view['truncated']} voisins de plus faible degré ne sont pas affichés")
+                       create_graph_visualization(view)
+               else:
+                   st.caption("Les nœuds de faible degré sont regroupés par classe")
+                   create_graph_visualization(load_overview(version))
+           elif item_choice == "Stades":
+               results = execute_query(g, base_query, query_choice, parameters)
                if isinstance(results, pd.DataFrame) and not results.empty:
                    st.dataframe(results, use_container_width=True)
 
                    # Affichage de la carte pour les requêtes de stades avec coordonnées
-                   if item_choice == "Stades" and "lat" in results.columns and "lon" in results.columns:
+                   if "lat" in results.columns and "lon" in results.columns:
                        create_map(results)
 
-                   # Export des données
-                   st.sidebar.download_button(
-                       label="📥 Télécharger les résultats (CSV)",
-                       data=results.to_csv(index=False).encode('utf-8'),
-                       file_name=f"jo_paris_2024_{query_choice.lower().replace(' ', '_')}.csv",
-                       mime="text/csv"
-                   )
+                   export_widget((item_choice, query_choice, stade_name), file_stem,
+                                 lambda: iter_frame_rows(results))
+           else:
+               # Affichage des résultats page par page
+               page_size = st.sidebar.selectbox("Lignes par page", [100, 500, 1000, 5000],
+                                                index=[100, 500, 1000, 5000].index(PAGE_SIZE))
+               page = st.sidebar.number_input("Page", min_value=1, value=1, step=1,
+                                              key=f"page_{item_choice}_{query_choice}_{page_size}")
+               results, has_next = execute_query_page(g, base_query, query_choice, parameters,
+                                                      page - 1, page_size)
+               if isinstance(results, pd.DataFrame) and not results.empty:
+                   st.dataframe(results, use_container_width=True)
+                   first_row = (page - 1) * page_size + 1
+                   st.caption(f"Page {page} : lignes {first_row} à {first_row + len(results) - 1}"
+                              + (" (page suivante disponible)" if has_next else " (dernière page)"))
+
+                   # Export des données (résultat complet)
+                   export_widget((item_choice, query_choice), file_stem,
+                                 lambda: export_row_batches(g, base_query, query_choice, parameters))
+               elif isinstance(results, pd.DataFrame) and page > 1:
+                   st.info("Aucun résultat sur cette page")
 
        except Exception as e:
            st.error(f"Erreur lors de l'exécution de la requête: {str(e)}")
@@ -0,0 +1,262 @@
+import numpy as np
+import pandas as pd
+from rdflib import Literal
+from rdflib.term import Identifier
+
+
+def is_variable(item):
+    """Les variables des motifs sont des chaînes "?nom", les termes sont des termes rdflib"""
+    return isinstance(item, str) and not isinstance(item, Identifier)
+
+
+def factorize_terms(values):
+    """Codes entiers et dictionnaire (tableau numpy d'objets) d'une suite de termes"""
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    codes, terms = pd.factorize(array)
+    return codes.astype(np.int64), np.asarray(terms, dtype=object)
+
+
+def term_sort_key(term):
+    """Clé de tri d'un terme : IRIs par texte, littéraux par valeur (dates, nombres...)"""
+    if isinstance(term, Literal):
+        value = term.toPython()
+        if not isinstance(value, Literal):
+            return 2, value
+        return 1, str(term)
+    return 0, str(term)
+
+
+def expand_join(left_keys, right_keys):
+    """
+    Jointure de left_keys avec right_keys (triées) : indices des lignes gauche et droite
+    de toutes les paires de clés égales, sans boucle Python.
+    """
+    lo = np.searchsorted(right_keys, left_keys, side='left')
+    hi = np.searchsorted(right_keys, left_keys, side='right')
+    counts = hi - lo
+    total = int(counts.sum())
+    left_index = np.repeat(np.arange(len(left_keys)), counts)
+    starts = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+    right_index = starts + np.arange(total)
+    return left_index, right_index
+
+
+def group_rows(columns):
+    """
+    Numéro de groupe de chaque ligne (lignes égales sur toutes les colonnes de codes),
+    numérotés dans l'ordre de première apparition, et indice de la première ligne de chaque groupe.
+    Hachage (pd.factorize) plutôt que tri : linéaire en nombre de lignes.
+    """
+    groups = np.zeros(len(columns[0]), dtype=np.int64)
+    for codes in columns:
+        groups, _ = pd.factorize(groups * (int(codes.max(initial=0)) + 1) + codes)
+    is_first = np.diff(np.maximum.accumulate(groups), prepend=-1) > 0
+    return groups.astype(np.int64), np.flatnonzero(is_first)
+
+
+class ColumnarIndex:
+    """
+    Représentation en colonnes du graphe pour les requêtes d'agrégation du tableau de bord.
+
+    Les termes sont encodés en entiers (dictionnaire self.terms) et les triplets rangés dans
+    trois tableaux numpy triés par (prédicat, sujet, objet) : les triplets d'un prédicat sont
+    une tranche contiguë, triée par sujet. Les jointures en étoile sur ces tranches se font
+    par recherche dichotomique vectorisée (voir Bindings).
+    """
+
+    def __init__(self, subjects, predicates, objects, terms):
+        order = np.lexsort((objects, subjects, predicates))
+        self.subjects = subjects[order]
+        self.predicates = predicates[order]
+        self.objects = objects[order]
+        self.terms = terms
+        self.codes = {term: code for code, term in enumerate(terms)}
+        predicate_codes = np.unique(self.predicates)
+        starts = np.searchsorted(self.predicates, predicate_codes, side='left')
+        ends = np.searchsorted(self.predicates, predicate_codes, side='right')
+        self.ranges = {int(code): (int(start), int(end)) for code, start, end in zip(predicate_codes, starts, ends)}
+        self.by_object = {}
+
+    @classmethod
+    def from_graph(cls, g):
+        """Construit l'index en un seul parcours des triplets du graphe"""
+        triples = list(g.triples((None, None, None)))
+        codes, terms = factorize_terms([term for triple in triples for term in triple])
+        codes = codes.reshape(len(triples), 3)
+        return cls(codes[:, 0].copy(), codes[:, 1].copy(), codes[:, 2].copy(), terms)
+
+    def __len__(self):
+        return len(self.subjects)
+
+    def code(self, term):
+        """Code entier d'un terme, ou -1 s'il n'est pas dans le graphe"""
+        return self.codes.get(term, -1)
+
+    def pairs(self, predicate):
+        """Sujets (triés) et objets des triplets d'un prédicat"""
+        start, end = self.ranges.get(self.code(predicate), (0, 0))
+        return self.subjects[start:end], self.objects[start:end]
+
+    def pairs_by_object(self, predicate):
+        """Objets (triés) et sujets des triplets d'un prédicat, calculés une fois par prédicat"""
+        if predicate not in self.by_object:
+            subjects, objects = self.pairs(predicate)
+            order = np.argsort(objects, kind='stable')
+            self.by_object[predicate] = (objects[order], subjects[order])
+        return self.by_object[predicate]
+
+    def match(self, patterns):
+        """
+        Évalue un motif de graphe (liste de triplets (sujet, prédicat, objet) où le sujet et l'objet
+        sont des variables "?nom" ou des termes) et retourne ses solutions.
+        Les motifs sont joints dans l'ordre donné : le premier doit être le plus sélectif.
+        """
+        bindings = None
+        for subject, predicate, obj in patterns:
+            bindings = self.match_pattern(bindings, subject, predicate, obj)
+        return bindings
+
+    def match_pattern(self, bindings, subject, predicate, obj):
+        bound = bindings.columns if bindings is not None else {}
+        join_on_subject = is_variable(subject) and subject in bound
+        join_on_object = not join_on_subject and is_variable(obj) and obj in bound
+        if join_on_object:
+            objects, subjects = self.pairs_by_object(predicate)
+        else:
+            subjects, objects = self.pairs(predicate)
+        if not is_variable(subject):
+            keep = subjects == self.code(subject)
+            subjects, objects = subjects[keep], objects[keep]
+        if not is_variable(obj):
+            keep = objects == self.code(obj)
+            subjects, objects = subjects[keep], objects[keep]
+        if subject == obj:
+            keep = subjects == objects
+            subjects, objects = subjects[keep], objects[keep]
+
+        if bindings is None:
+            left_index = right_index = np.arange(len(subjects))
+            bindings = Bindings({}, {}, len(subjects))
+        elif join_on_subject:
+            left_index, right_index = expand_join(bound[subject], subjects)
+        elif join_on_object:
+            left_index, right_index = expand_join(bound[obj], objects)
+        else:
+            # Produit cartésien (motif sans variable commune)
+            left_index = np.repeat(np.arange(len(bindings)), len(subjects))
+            right_index = np.tile(np.arange(len(subjects)), len(bindings))
+
+        bindings = bindings.take(left_index)
+        subjects, objects = subjects[right_index], objects[right_index]
+        if join_on_subject and is_variable(obj) and obj in bound:
+            # Sujet et objet déjà liés : filtre sur l'égalité de l'objet
+            keep = np.flatnonzero(bindings.columns[obj] == objects)
+            bindings, subjects, objects = bindings.take(keep), subjects[keep], objects[keep]
+        for item, values in ((subject, subjects), (obj, objects)):
+            if is_variable(item) and item not in bindings.columns:
+                bindings.columns[item] = values
+                bindings.dictionaries[item] = self.terms
+        return bindings
+
+
+class Bindings:
+    """
+    Solutions d'une requête : une colonne de codes par variable, avec le dictionnaire
+    (tableau de termes) qui décode chaque colonne.
+    """
+
+    def __init__(self, columns, dictionaries, size):
+        self.columns = columns
+        self.dictionaries = dictionaries
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def take(self, index):
+        return Bindings(
+            {var: codes[index] for var, codes in self.columns.items()},
+            dict(self.dictionaries),
+            len(index),
+        )
+
+    def bind(self, target, function, source=None):
+        """
+        BIND(function(source) AS target) : la fonction est appelée une fois par valeur distincte.
+        Les valeurs égales après transformation partagent le même code (pour GROUP BY et DISTINCT).
+        """
+        source = source or target
+        codes = self.columns[source]
+        inverse, distinct = pd.factorize(codes)
+        source_terms = self.dictionaries[source]
+        new_codes, terms = factorize_terms([function(source_terms[code]) for code in distinct])
+        columns = dict(self.columns)
+        dictionaries = dict(self.dictionaries)
+        columns[target] = new_codes[inverse]
+        dictionaries[target] = terms
+        return Bindings(columns, dictionaries, self.size)
+
+    def distinct(self, variables):
+        """SELECT DISTINCT variables"""
+        if self.size == 0:
+            return self.project(variables)
+        _, first = group_rows([self.columns[var] for var in variables])
+        return self.take(first).project(variables)
+
+    def project(self, variables):
+        return Bindings(
+            {var: self.columns[var] for var in variables},
+            {var: self.dictionaries[var] for var in variables},
+            self.size,
+        )
+
+    def group_count(self, keys, counted, name, distinct=False):
+        """
+        SELECT keys (COUNT([DISTINCT] counted) AS name) ... GROUP BY keys
+        """
+        if self.size == 0:
+            bindings = self.project(keys)
+            bindings.columns[name] = np.empty(0, dtype=np.int64)
+            bindings.dictionaries[name] = np.empty(0, dtype=object)
+            return bindings
+        source = self.distinct(keys + [counted]) if distinct else self
+        groups, first = group_rows([source.columns[var] for var in keys])
+        counts = np.bincount(groups, minlength=len(first))
+        count_codes, count_terms = factorize_terms([Literal(int(count)) for count in counts])
+        columns = {var: source.columns[var][first] for var in keys}
+        columns[name] = count_codes
+        dictionaries = {var: source.dictionaries[var] for var in keys}
+        dictionaries[name] = count_terms
+        return Bindings(columns, dictionaries, len(first))
+
+    def ranks(self, var):
+        """Rang de chaque ligne selon l'ordre SPARQL des termes de la variable"""
+        codes = self.columns[var]
+        inverse, distinct = pd.factorize(codes)
+        terms = self.dictionaries[var]
+        try:
+            order = sorted(range(len(distinct)), key=lambda i: term_sort_key(terms[distinct[i]]))
+        except TypeError:
+            order = sorted(range(len(distinct)), key=lambda i: str(terms[distinct[i]]))
+        rank = np.empty(len(distinct), dtype=np.int64)
+        rank[order] = np.arange(len(distinct))
+        return rank[inverse]
+
+    def order_by(self, *keys):
+        """ORDER BY keys ; une clé "-?var" trie par ordre décroissant"""
+        sort_keys = []
+        for key in reversed(keys):
+            descending = key.startswith("-")
+            ranks = self.ranks(key.lstrip("-"))
+            sort_keys.append(-ranks if descending else ranks)
+        if not sort_keys or self.size == 0:
+            return self
+        return self.take(np.lexsort(sort_keys))
+
+    def to_frame(self, variables):
+        """DataFrame des termes rdflib, avec les mêmes colonnes que g.query()"""
+        return pd.DataFrame({
+            var.lstrip("?"): self.dictionaries[var][self.columns[var]]
+            for var in variables
+        })
@@ -0,0 +1,147 @@
+from rdflib import Literal, Namespace, RDF
+from rdflib.term import URIRef
+
+from query_keys import query_hash
+from queriesRfd import MEDAILLES_QUERIES, ATHLETES_QUERIES, DISCIPLINES_QUERIES
+
+# Plans vectorisés (voir columnar_index.py) des requêtes d'agrégation du tableau de bord.
+# Chaque plan reproduit exactement sa requête SPARQL, y compris les BIND :
+# il n'est utilisé que si le texte de la requête est celui pour lequel il a été écrit.
+
+OLYMPICS = Namespace("http://example.org/olympics#")
+
+
+def local_label(term):
+    """REPLACE(STRAFTER(STR(?x), "#"), "%20", " ")"""
+    return Literal(str(term).partition("#")[2].replace("%20", " "))
+
+
+def replace_spaces(term):
+    """REPLACE(?x, "%20", " ") : sans effet (erreur SPARQL) sur une IRI"""
+    if isinstance(term, URIRef):
+        return term
+    return Literal(str(term).replace("%20", " "), lang=term.language, datatype=term.datatype)
+
+
+def gold_medalists(index):
+    bindings = index.match([
+        ("?performance", OLYMPICS.awarded, OLYMPICS.Gold),
+        ("?performance", OLYMPICS.hasEvent, "?event"),
+        ("?performance", OLYMPICS.playedBy, "?Athlete_Or_Team"),
+        ("?performance", OLYMPICS.isScheduledAtTime, "?Date"),
+        ("?event", OLYMPICS.name, "?Trial"),
+        ("?event", OLYMPICS.belongsToDiscipline, "?Discipline"),
+    ])
+    bindings = bindings.bind("?Athlete_Or_Team", local_label).bind("?Trial", replace_spaces)
+    return bindings.order_by("?Discipline", "?Date").to_frame(["?Athlete_Or_Team", "?Discipline", "?Trial", "?Date"])
+
+
+def medal_details(index):
+    bindings = index.match([
+        ("?performance", OLYMPICS.awarded, "?medal"),
+        ("?performance", OLYMPICS.playedBy, "?athlete"),
+        ("?performance", OLYMPICS.hasEvent, "?trail"),
+        ("?performance", OLYMPICS.isScheduledAtTime, "?date"),
+        ("?athlete", OLYMPICS.isPersonOf, "?person"),
+        ("?athlete", OLYMPICS.represent, "?country"),
+        ("?trail", OLYMPICS.belongsToDiscipline, "?discipline"),
+        ("?person", OLYMPICS.name, "?athleteName"),
+        ("?person", OLYMPICS.surname, "?surname"),
+    ])
+    bindings = (bindings.bind("?medalType", local_label, "?medal")
+                .bind("?discipline", local_label)
+                .bind("?trail", local_label))
+    return bindings.order_by("-?date").to_frame(
+        ["?athleteName", "?surname", "?medalType", "?country", "?discipline", "?trail", "?date"])
+
+
+def athletes_by_country(index):
+    bindings = index.match([
+        ("?athlete", RDF.type, OLYMPICS.Athlete),
+        ("?athlete", OLYMPICS.represent, "?country"),
+        ("?athlete", OLYMPICS.isPersonOf, "?person"),
+        ("?person", OLYMPICS.name, "?Name"),
+        ("?person", OLYMPICS.surname, "?surname"),
+        ("?person", OLYMPICS.gender, "?gender"),
+        ("?person", OLYMPICS.birthDate, "?birthDate"),
+    ])
+    bindings = bindings.bind("?country", replace_spaces)
+    return bindings.order_by("?country").to_frame(["?country", "?Name", "?surname", "?gender", "?birthDate"])
+
+
+def athletes_by_discipline(index):
+    bindings = index.match([
+        ("?performance", OLYMPICS.playedBy, "?athlete"),
+        ("?performance", OLYMPICS.hasEvent, "?trial"),
+        ("?trial", OLYMPICS.belongsToDiscipline, "?discipline"),
+        ("?athlete", OLYMPICS.isPersonOf, "?person"),
+        ("?person", OLYMPICS.name, "?athleteName"),
+        ("?person", OLYMPICS.surname, "?surname"),
+    ])
+    variables = ["?discipline", "?athleteName", "?surname"]
+    return bindings.distinct(variables).order_by("?discipline").to_frame(variables)
+
+
+def medalled_athletes_by_country(index):
+    bindings = index.match([
+        ("?athlete", RDF.type, OLYMPICS.Athlete),
+        ("?athlete", OLYMPICS.represent, "?country"),
+    ])
+    bindings = bindings.bind("?country", local_label)
+    bindings = bindings.group_count(["?country"], "?athlete", "?total", distinct=True)
+    return bindings.order_by("-?total").to_frame(["?country", "?total"])
+
+
+def athletes_per_discipline(index):
+    bindings = index.match([
+        ("?performance", OLYMPICS.playedBy, "?athlete"),
+        ("?performance", OLYMPICS.hasEvent, "?trial"),
+        ("?trial", OLYMPICS.belongsToDiscipline, "?discipline"),
+    ])
+    bindings = bindings.bind("?discipline", local_label)
+    return bindings.group_count(["?discipline"], "?athlete", "?total", distinct=True).to_frame(
+        ["?discipline", "?total"])
+
+
+def medals_per_discipline(index):
+    bindings = index.match([
+        ("?performance", OLYMPICS.awarded, "?medal"),
+        ("?performance", OLYMPICS.hasEvent, "?trial"),
+        ("?trial", OLYMPICS.belongsToDiscipline, "?discipline"),
+    ])
+    bindings = bindings.bind("?discipline", local_label)
+    bindings = bindings.group_count(["?discipline"], "?medal", "?totalMedals")
+    return bindings.order_by("-?totalMedals").to_frame(["?discipline", "?totalMedals"])
+
+
+def medals_per_discipline_and_country(index):
+    bindings = index.match([
+        ("?performance", OLYMPICS.awarded, "?medal"),
+        ("?performance", OLYMPICS.playedBy, "?athlete"),
+        ("?performance", OLYMPICS.hasEvent, "?trial"),
+        ("?athlete", OLYMPICS.represent, "?country"),
+        ("?trial", OLYMPICS.belongsToDiscipline, "?discipline"),
+    ])
+    bindings = bindings.bind("?discipline", local_label).bind("?country", local_label)
+    bindings = bindings.group_count(["?discipline", "?country"], "?medal", "?medals")
+    return bindings.order_by("?discipline", "?medals").to_frame(["?discipline", "?country", "?medals"])
+
+
+# "Nombre de femmes et homme par discipline" n'a pas de plan : elle sélectionne ?gender
+# sans le grouper, son résultat SPARQL n'est pas déterministe.
+COLUMNAR_PLANS = {
+    query_hash(MEDAILLES_QUERIES["Médaillé d'or par discipline"]): gold_medalists,
+    query_hash(MEDAILLES_QUERIES["Medaille details (type, athlete , event, date..) "]): medal_details,
+    query_hash(ATHLETES_QUERIES["Athletes par pays"]): athletes_by_country,
+    query_hash(ATHLETES_QUERIES["Athletes par discipline"]): athletes_by_discipline,
+    query_hash(ATHLETES_QUERIES["Athletes par medaille"]): medal_details,
+    query_hash(ATHLETES_QUERIES["Nombre d'athlètes médaillés par pays"]): medalled_athletes_by_country,
+    query_hash(DISCIPLINES_QUERIES["Nombre d'athletes par discipline"]): athletes_per_discipline,
+    query_hash(DISCIPLINES_QUERIES["Nombre de medailles par discipline"]): medals_per_discipline,
+    query_hash(DISCIPLINES_QUERIES["Pays le plus medaille par discipline"]): medals_per_discipline_and_country,
+}
+
+
+def find_plan(query):
+    """Plan vectorisé de la requête, ou None si elle doit être évaluée par rdflib"""
+    return COLUMNAR_PLANS.get(query_hash(query))
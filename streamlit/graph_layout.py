@@ -0,0 +1,216 @@
+import math
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+from rdflib import RDF, URIRef
+
+from columnar_index import group_rows
+
+# Nombre maximal de nœuds et d'arêtes envoyés au navigateur
+MAX_NODES = 150
+MAX_EDGES = 400
+
+# Taille (pixels) de la mise en page calculée côté serveur
+LAYOUT_SCALE = 1000
+
+OTHER_CLASS = "Autres"
+
+
+def local_label(term):
+    """Nom lisible d'une IRI (partie après '#', %20 remplacés par des espaces)"""
+    return str(term).split('#')[-1].replace('%20', ' ')
+
+
+def compute_layout(nodes, edges, fixed=None, seed=42):
+    """
+    Mise en page force-directed (networkx) calculée une fois côté serveur :
+    le navigateur affiche les positions sans simulation physique.
+
+    :param nodes: Liste des identifiants de nœuds.
+    :param edges: Liste de (source, cible, poids).
+    :param fixed: Dictionnaire nœud -> position imposée (ex. l'entité au centre).
+    :return: Dictionnaire nœud -> (x, y) en pixels.
+    """
+    graph = nx.Graph()
+    graph.add_nodes_from(nodes)
+    for source, target, weight in edges:
+        if source == target:
+            continue
+        if graph.has_edge(source, target):
+            graph[source][target]["weight"] += weight
+        else:
+            graph.add_edge(source, target, weight=weight)
+    if not nodes:
+        return {}
+    # Poids en log : un lien agrégé très fréquent ne doit pas écraser la mise en page
+    for _, _, data in graph.edges(data=True):
+        data["weight"] = 1 + math.log(data["weight"])
+    positions = nx.spring_layout(
+        graph,
+        pos=fixed,
+        fixed=list(fixed) if fixed else None,
+        seed=seed,
+        iterations=100,
+        weight="weight",
+    )
+    return {node: (float(x) * LAYOUT_SCALE, float(y) * LAYOUT_SCALE) for node, (x, y) in positions.items()}
+
+
+class RelationGraph:
+    """
+    Relations entre ressources du graphe (triplets dont le sujet et l'objet sont des IRIs,
+    hors rdf:type), extraites de l'index en colonnes pour la visualisation.
+
+    Deux vues sont produites, chacune limitée à MAX_NODES nœuds :
+    - overview : les nœuds les plus connectés, les autres regroupés par classe en nœuds de synthèse ;
+    - neighborhood : le voisinage d'une entité, expansible en profondeur.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.terms = index.terms
+        is_uri = np.fromiter((isinstance(term, URIRef) for term in index.terms), dtype=bool,
+                             count=len(index.terms))
+        type_code = index.code(RDF.type)
+        keep = is_uri[index.subjects] & is_uri[index.objects] & (index.predicates != type_code)
+        self.sources = index.subjects[keep]
+        self.predicates = index.predicates[keep]
+        self.targets = index.objects[keep]
+
+        size = len(index.terms)
+        self.degrees = np.bincount(self.sources, minlength=size) + np.bincount(self.targets, minlength=size)
+        self.node_classes = np.full(size, -1, dtype=np.int64)
+        typed, classes = index.pairs(RDF.type)
+        self.node_classes[typed] = classes
+        self.labels = None
+
+    def class_label(self, node):
+        class_code = self.node_classes[node]
+        return OTHER_CLASS if class_code < 0 else local_label(self.terms[class_code])
+
+    def node_entry(self, node, max_degree):
+        degree = int(self.degrees[node])
+        return {
+            "id": int(node),
+            "label": local_label(self.terms[node]),
+            "title": f"{self.terms[node]}\nClasse : {self.class_label(node)}\nDegré : {degree}",
+            "group": self.class_label(node),
+            "size": 10 + 30 * math.sqrt(degree / max(max_degree, 1)),
+        }
+
+    def aggregate_edges(self, source_nodes, predicates, target_nodes, max_edges):
+        """Regroupe les arêtes parallèles (même source, prédicat, cible) en une arête comptée"""
+        if len(source_nodes) == 0:
+            return []
+        groups, first = group_rows([source_nodes, predicates, target_nodes])
+        counts = np.bincount(groups, minlength=len(first))
+        top = np.argsort(-counts, kind='stable')[:max_edges]
+        edges = []
+        for group in top:
+            row = first[group]
+            predicate = local_label(self.terms[predicates[row]])
+            count = int(counts[group])
+            edges.append({
+                "source": source_nodes[row],
+                "target": target_nodes[row],
+                "label": predicate if count == 1 else f"{predicate} ×{count}",
+                "title": str(self.terms[predicates[row]]),
+                "count": count,
+            })
+        return edges
+
+    def overview(self, max_nodes=MAX_NODES, max_edges=MAX_EDGES):
+        """
+        Vue d'ensemble du graphe complet : les max_nodes nœuds de plus haut degré sont affichés,
+        les autres sont regroupés par classe (un nœud de synthèse par classe, avec leur nombre).
+        """
+        connected = np.flatnonzero(self.degrees > 0)
+        order = np.argsort(-self.degrees[connected], kind='stable')
+        hubs = connected[order[:max_nodes]]
+        others = connected[order[max_nodes:]]
+
+        representative = np.full(len(self.terms), -1, dtype=np.int64)
+        representative[hubs] = hubs
+        nodes = [self.node_entry(node, self.degrees[hubs[0]] if len(hubs) else 1) for node in hubs]
+        if len(others):
+            class_slots, class_codes = pd.factorize(self.node_classes[others])
+            # Les nœuds de synthèse ont des identifiants négatifs (codes de termes >= 0)
+            representative[others] = -2 - class_slots
+            counts = np.bincount(class_slots, minlength=len(class_codes))
+            for slot, (class_code, count) in enumerate(zip(class_codes, counts)):
+                label = OTHER_CLASS if class_code < 0 else local_label(self.terms[class_code])
+                nodes.append({
+                    "id": -2 - slot,
+                    "label": f"{label} ({count})",
+                    "title": f"{count} nœuds {label} de faible degré regroupés",
+                    "group": label,
+                    "size": 15 + 5 * math.log(count + 1),
+                    "shape": "box",
+                })
+
+        # Les relations internes à un nœud de synthèse ne sont pas affichées
+        sources, targets = representative[self.sources], representative[self.targets]
+        between = sources != targets
+        edges = self.aggregate_edges(sources[between], self.predicates[between], targets[between], max_edges)
+        return self.with_layout(nodes, edges)
+
+    def find_entities(self, text, limit=20):
+        """
+        Entités dont le nom contient text (sans tenir compte de la casse),
+        les noms exacts en premier puis par degré décroissant.
+
+        :return: Liste de (code, nom).
+        """
+        if self.labels is None:
+            connected = np.flatnonzero(self.degrees > 0)
+            self.labels = [(int(node), local_label(self.terms[node])) for node in connected]
+        text = text.strip().lower()
+        if not text:
+            return []
+        matches = [(node, label) for node, label in self.labels if text in label.lower()]
+        matches.sort(key=lambda match: (match[1].lower() != text, -self.degrees[match[0]]))
+        return matches[:limit]
+
+    def neighborhood(self, center, depth=1, max_nodes=MAX_NODES, max_edges=MAX_EDGES):
+        """
+        Voisinage d'une entité jusqu'à depth relations. À chaque niveau, si le nombre de nœuds
+        dépasse max_nodes, les voisins de plus haut degré sont gardés.
+        """
+        visited = np.array([center], dtype=np.int64)
+        frontier = visited
+        truncated = 0
+        for _ in range(depth):
+            touching = np.isin(self.sources, frontier) | np.isin(self.targets, frontier)
+            neighbours = np.unique(np.concatenate([self.sources[touching], self.targets[touching]]))
+            neighbours = neighbours[~np.isin(neighbours, visited)]
+            room = max_nodes - len(visited)
+            if len(neighbours) > room:
+                truncated += len(neighbours) - room
+                neighbours = neighbours[np.argsort(-self.degrees[neighbours], kind='stable')[:room]]
+            if len(neighbours) == 0:
+                break
+            visited = np.concatenate([visited, neighbours])
+            frontier = neighbours
+
+        inside = np.isin(self.sources, visited) & np.isin(self.targets, visited)
+        max_degree = int(self.degrees[visited].max())
+        nodes = [self.node_entry(node, max_degree) for node in visited]
+        nodes[0]["shape"] = "star"
+        edges = self.aggregate_edges(self.sources[inside], self.predicates[inside],
+                                     self.targets[inside], max_edges)
+        view = self.with_layout(nodes, edges, fixed={int(center): (0., 0.)})
+        view["truncated"] = truncated
+        return view
+
+    def with_layout(self, nodes, edges, fixed=None):
+        for edge in edges:
+            edge["source"], edge["target"] = int(edge["source"]), int(edge["target"])
+        positions = compute_layout(
+            [node["id"] for node in nodes],
+            [(edge["source"], edge["target"], edge["count"]) for edge in edges],
+            fixed=fixed,
+        )
+        for node in nodes:
+            node["x"], node["y"] = positions[node["id"]]
+        return {"nodes": nodes, "edges": edges}
@@ -0,0 +1,101 @@
+import glob
+import hashlib
+import os
+import pickle
+
+import numpy as np
+from rdflib import Graph
+
+SNAPSHOT_DIR = ".graph_snapshots"
+
+# Lignes du tableau des triplets copiées en mémoire à la fois
+SNAPSHOT_BATCH_SIZE = 100000
+
+
+def file_version(file_path):
+    """Version rapide d'un fichier (date de modification et taille), sans lire son contenu"""
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def snapshot_key(file_path):
+    """Clé du snapshot d'un fichier : date de modification, taille et hash du contenu"""
+    mtime, size = file_version(file_path)
+    digest = hashlib.sha1(f"{mtime}:{size}:".encode())
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def snapshot_prefix(file_path, snapshot_dir):
+    path_id = hashlib.sha1(os.path.abspath(file_path).encode()).hexdigest()[:12]
+    return os.path.join(snapshot_dir, path_id)
+
+
+def write_snapshot(g, base_path):
+    """
+    Enregistre un graphe sous forme binaire :
+    - base_path.terms.pkl : la liste des termes (URIs, littéraux) et les préfixes
+    - base_path.triples.npy : les triplets encodés par les indices des termes (uint32, n x 3)
+    """
+    term_ids = {}
+    triples = np.empty((len(g), 3), dtype=np.uint32)
+    for i, triple in enumerate(g):
+        triples[i] = [term_ids.setdefault(term, len(term_ids)) for term in triple]
+    terms = list(term_ids)
+    namespaces = list(g.namespaces())
+
+    # Écriture dans des fichiers temporaires pour ne jamais laisser un snapshot incomplet
+    with open(base_path + ".triples.npy.tmp", 'wb') as f:
+        np.save(f, triples)
+    with open(base_path + ".terms.pkl.tmp", 'wb') as f:
+        pickle.dump((terms, namespaces), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(base_path + ".triples.npy.tmp", base_path + ".triples.npy")
+    os.replace(base_path + ".terms.pkl.tmp", base_path + ".terms.pkl")
+
+
+def iter_snapshot_triples(triples, terms, batch_size=SNAPSHOT_BATCH_SIZE):
+    """
+    Triplets décodés d'un tableau mappé en mémoire, lu par tranches de batch_size lignes :
+    seule une tranche est copiée en mémoire à la fois.
+    """
+    for start in range(0, len(triples), batch_size):
+        for s, p, o in triples[start:start + batch_size].tolist():
+            yield terms[s], terms[p], terms[o]
+
+
+def read_snapshot(g, base_path):
+    """Ajoute au graphe les triplets d'un snapshot (le tableau des triplets est mappé en mémoire)"""
+    with open(base_path + ".terms.pkl", 'rb') as f:
+        terms, namespaces = pickle.load(f)
+    triples = np.load(base_path + ".triples.npy", mmap_mode='r')
+    for prefix, namespace in namespaces:
+        g.bind(prefix, namespace)
+    g.addN((s, p, o, g) for s, p, o in iter_snapshot_triples(triples, terms))
+
+
+def load_turtle_with_snapshot(g, file_path, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Charge un fichier Turtle dans le graphe, depuis son snapshot binaire s'il est à jour.
+    Sinon le fichier est parsé et son snapshot est (re)créé.
+    """
+    os.makedirs(snapshot_dir, exist_ok=True)
+    prefix = snapshot_prefix(file_path, snapshot_dir)
+    base_path = f"{prefix}-{snapshot_key(file_path)}"
+
+    if os.path.isfile(base_path + ".terms.pkl") and os.path.isfile(base_path + ".triples.npy"):
+        read_snapshot(g, base_path)
+        return
+
+    file_graph = Graph()
+    file_graph.parse(file_path, format="turtle")
+
+    # Suppression des snapshots des versions précédentes du fichier
+    for old_file in glob.glob(prefix + "-*"):
+        os.remove(old_file)
+    write_snapshot(file_graph, base_path)
+
+    for prefix_name, namespace in file_graph.namespaces():
+        g.bind(prefix_name, namespace)
+    g.addN((s, p, o, g) for s, p, o in file_graph)
@@ -0,0 +1,36 @@
+import json
+import os
+
+import pandas as pd
+
+from query_keys import query_hash, file_hash
+from queriesRfd import VIEWS_FILE
+
+
+def load_views(rdf_file, views_file=VIEWS_FILE):
+    """
+    Charge les tables d'agrégation calculées à la fin de la conversion (views_file).
+    Les tables sont ignorées si elles ont été calculées pour un autre contenu du fichier RDF.
+
+    :return: Dictionnaire nom de la requête -> (hash de la requête, DataFrame)
+    """
+    if not os.path.isfile(views_file) or not os.path.isfile(rdf_file):
+        return {}
+    with open(views_file, encoding='utf-8') as f:
+        content = json.load(f)
+    if content.get("source") != file_hash(rdf_file):
+        return {}
+    return {
+        name: (view["query"], pd.DataFrame(view["rows"], columns=view["columns"]))
+        for name, view in content["views"].items()
+    }
+
+
+def find_view(views, query_name, query):
+    """Retourne la table de la requête si elle a été matérialisée avec le même texte, sinon None"""
+    if query_name not in views:
+        return None
+    view_query_hash, df = views[query_name]
+    if view_query_hash != query_hash(query):
+        return None
+    return df
@@ -0,0 +1,113 @@
+import csv
+import io
+from itertools import islice
+
+import pandas as pd
+
+from prepared_queries import run_query
+
+PAGE_SIZE = 500
+
+# Lignes écrites par bloc dans les exports
+EXPORT_BATCH_SIZE = 10000
+
+def fetch_page(g, query, page, page_size=PAGE_SIZE, parameters=None):
+    """
+    Exécute une page de la requête : la requête de base est préparée une seule fois
+    (le même texte pour toutes les pages, voir prepared_queries.prepare) et seules
+    page_size + 1 lignes sont construites (la ligne supplémentaire indique s'il existe
+    une page suivante). rdflib évalue les lignes au fil de l'itération : l'évaluation
+    s'arrête après la page, sauf si la requête doit trier ou grouper tout le résultat.
+
+    Sans ORDER BY, l'ordre des lignes est celui de l'évaluation par rdflib, stable
+    tant que le graphe ne change pas.
+
+    :return: Tuple (DataFrame de la page, True s'il existe une page suivante).
+    """
+    offset = page * page_size
+    results = run_query(g, query, parameters)
+    rows = list(islice(results, offset, offset + page_size + 1))
+    return pd.DataFrame(rows[:page_size], columns=results.vars), len(rows) > page_size
+
+
+def slice_page(df, page, page_size=PAGE_SIZE):
+    """Page d'un résultat déjà calculé (tables d'agrégation, plans en colonnes)"""
+    offset = page * page_size
+    return df.iloc[offset:offset + page_size].reset_index(drop=True), len(df) > offset + page_size
+
+
+def iter_rows(g, query, parameters=None, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Lignes du résultat complet par blocs de batch_size, sans construire de DataFrame.
+    Le premier bloc est précédé des noms de colonnes.
+    """
+    results = run_query(g, query, parameters)
+    yield [str(var) for var in results.vars]
+    batch = []
+    for row in results:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_frame_rows(df, batch_size=EXPORT_BATCH_SIZE):
+    """Même format que iter_rows pour un résultat déjà calculé"""
+    yield [str(column) for column in df.columns]
+    for start in range(0, len(df), batch_size):
+        yield df.iloc[start:start + batch_size].itertuples(index=False, name=None)
+
+
+def stream_csv(row_batches):
+    """
+    Export CSV en flux : un bloc d'octets UTF-8 par bloc de lignes, l'en-tête en premier.
+
+    :param row_batches: Générateur de iter_rows ou iter_frame_rows.
+    """
+    row_batches = iter(row_batches)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(next(row_batches))
+    for batch in row_batches:
+        writer.writerows(["" if value is None else str(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def stream_parquet(row_batches, destination):
+    """
+    Export Parquet (pyarrow) : un groupe de lignes par bloc, les valeurs converties en texte
+    comme dans le CSV. destination est un chemin ou un fichier binaire.
+
+    :return: Le nombre de lignes écrites.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    row_batches = iter(row_batches)
+    columns = next(row_batches)
+    schema = pa.schema([(column, pa.string()) for column in columns])
+    count = 0
+    with pq.ParquetWriter(destination, schema) as writer:
+        for batch in row_batches:
+            rows = list(batch)
+            arrays = [
+                pa.array([None if row[i] is None else str(row[i]) for row in rows], type=pa.string())
+                for i in range(len(columns))
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            count += len(rows)
+    return count
@@ -0,0 +1,43 @@
+from functools import lru_cache
+
+from rdflib import Literal
+from rdflib.plugins.sparql import prepareQuery
+from rdflib.term import Identifier
+
+
+@lru_cache(maxsize=256)
+def prepare(query):
+    """
+    Requête analysée et traduite en algèbre SPARQL une seule fois par processus :
+    la même requête préparée sert à tous les reruns et à toutes les sessions.
+    """
+    return prepareQuery(query)
+
+
+def run_query(g, query, parameters=None):
+    """
+    Exécute une requête préparée. Les paramètres (nom de variable -> valeur) sont liés
+    par initBindings : ils ne sont jamais insérés dans le texte de la requête.
+    Les valeurs qui ne sont pas des termes rdflib sont converties en littéraux.
+    """
+    bindings = {
+        name: value if isinstance(value, Identifier) else Literal(value)
+        for name, value in (parameters or {}).items()
+    }
+    return g.query(prepare(query), initBindings=bindings)
+
+
+def prepare_all(query_sets):
+    """
+    Prépare toutes les requêtes des thèmes (dictionnaires nom -> texte) au démarrage.
+    Les requêtes SERVICE sont exécutées par le client du µService, pas par rdflib.
+
+    :return: Le nombre de requêtes préparées.
+    """
+    count = 0
+    for queries in query_sets:
+        for query in queries.values():
+            if "SERVICE" not in query:
+                prepare(query)
+                count += 1
+    return count
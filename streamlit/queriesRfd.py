@@ -1,3 +1,5 @@
+import os
+
 STADES_QUERIES = {
     "Informations complètes des stades": """
     PREFIX : <http://example.org/olympics#>
@@ -229,4 +231,33 @@ DISCIPLINES_QUERIES={
         GROUP BY ?discipline ?country
         ORDER BY ?discipline ASC(?medals)
     """
-}
\ No newline at end of file
+}
+
+# Événements d'un stade, exécutée avec le nom renvoyé par le µService (paramètre ?stadium)
+STADIUM_EVENTS_QUERY = """
+    PREFIX : <http://example.org/olympics#>
+    SELECT ?event ?discipline ?date WHERE {
+        ?eventUri a :Event ;
+                 :name ?event ;
+                 :belongsToDiscipline ?discipline ;
+                 :isScheduledAtTime ?date ;
+                 :takesPlaceAt ?venueUri .
+        ?venueUri :name ?stadiumName .
+        FILTER(str(?stadiumName) = str(?stadium))
+    }
+    ORDER BY ?date
+    """
+
+# Requêtes d'agrégation du tableau de bord calculées à la fin de la conversion
+# (RDF2CSV/conversion/views.py) et lues par materialized_views.py. "Nombre de femmes et homme
+# par discipline" n'en fait pas partie : son résultat n'est pas déterministe (voir columnar_queries.py).
+VIEW_QUERIES = {
+    "Nombre d'athlètes médaillés par pays": ATHLETES_QUERIES["Nombre d'athlètes médaillés par pays"],
+    "Nombre d'athletes par discipline": DISCIPLINES_QUERIES["Nombre d'athletes par discipline"],
+    "Nombre de medailles par discipline": DISCIPLINES_QUERIES["Nombre de medailles par discipline"],
+    "Pays le plus medaille par discipline": DISCIPLINES_QUERIES["Pays le plus medaille par discipline"],
+}
+
+# Le fichier des tables est le même pour la conversion et pour l'application : le fichier RDF converti
+# est copié dans data/data, ses tables restent valides tant que son contenu (hash) est le même.
+VIEWS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "data", "views.json")
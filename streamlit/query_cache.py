@@ -0,0 +1,105 @@
+import glob
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from query_keys import query_hash
+
+# Statistiques des caches partagées avec les convertisseurs (RDF2CSV/conversion/cache_stats.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "RDF2CSV", "conversion"))
+from cache_stats import cache_stats
+
+QUERY_CACHE_DIR = ".query_cache"
+
+
+def graph_fingerprint(version):
+    """Empreinte courte de la version du graphe (voir graph_version dans app.py)"""
+    return hashlib.sha1(repr(version).encode()).hexdigest()[:16]
+
+
+class QueryResultCache:
+    """
+    Cache LRU des résultats de requêtes, indexé par (texte normalisé de la requête, version du graphe).
+
+    Quand persist_dir est donné, les DataFrames sont aussi enregistrés sur disque (pickle pandas)
+    et survivent donc au redémarrage de l'application. Les fichiers d'une ancienne version
+    du graphe sont supprimés dès qu'une nouvelle version est utilisée.
+    """
+
+    def __init__(self, maxsize=128, persist_dir=None):
+        self.maxsize = maxsize
+        self.persist_dir = persist_dir
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.current_fingerprint = None
+        self.hits = 0
+        self.misses = 0
+        if persist_dir:
+            os.makedirs(persist_dir, exist_ok=True)
+
+    def key(self, query, version):
+        return graph_fingerprint(version), query_hash(query)
+
+    def file_path(self, key):
+        return os.path.join(self.persist_dir, f"{key[0]}-{key[1]}.pkl")
+
+    def get(self, query, version):
+        """Retourne le résultat en cache, ou None"""
+        key = self.key(query, version)
+        with self.lock:
+            self.switch_version(key[0])
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+        if self.persist_dir and os.path.isfile(self.file_path(key)):
+            try:
+                result = pd.read_pickle(self.file_path(key))
+            except Exception:
+                result = None
+            if result is not None:
+                with self.lock:
+                    self.hits += 1
+                    self.store(key, result)
+                return result
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, query, version, result):
+        key = self.key(query, version)
+        with self.lock:
+            self.switch_version(key[0])
+            self.store(key, result)
+        if self.persist_dir and isinstance(result, pd.DataFrame):
+            tmp_path = self.file_path(key) + ".tmp"
+            result.to_pickle(tmp_path)
+            os.replace(tmp_path, self.file_path(key))
+
+    def store(self, key, result):
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def switch_version(self, fingerprint):
+        """Oublie les résultats des versions précédentes du graphe"""
+        if fingerprint == self.current_fingerprint:
+            return
+        self.current_fingerprint = fingerprint
+        for key in [key for key in self.entries if key[0] != fingerprint]:
+            del self.entries[key]
+        if self.persist_dir:
+            for file_path in glob.glob(os.path.join(self.persist_dir, "*.pkl")):
+                if not os.path.basename(file_path).startswith(fingerprint):
+                    try:
+                        os.remove(file_path)
+                    except FileNotFoundError:
+                        pass
+
+    def stats(self):
+        return cache_stats(self.hits, self.misses, len(self.entries))
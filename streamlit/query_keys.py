@@ -0,0 +1,20 @@
+import hashlib
+
+
+def normalize_query(query):
+    """Texte de la requête sans les différences d'espaces et d'indentation"""
+    return " ".join(query.split())
+
+
+def query_hash(query):
+    """Hash du texte normalisé de la requête"""
+    return hashlib.sha1(normalize_query(query).encode('utf-8')).hexdigest()
+
+
+def file_hash(file_path):
+    """Hash du contenu d'un fichier, lu par blocs de 1 Mo"""
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
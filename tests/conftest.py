@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The modules of each component are imported by name from their own folder
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in ("RDF2CSV/conversion", "extractTexte", "streamlit"):
+    sys.path.insert(0, os.path.join(ROOT, folder))
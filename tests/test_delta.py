@@ -0,0 +1,45 @@
+from rdflib import Graph, Literal, Namespace
+
+from delta import DeltaSink, compact, delta_files, load_graph_with_deltas, next_delta_file
+
+EX = Namespace("http://example.org/olympics#")
+
+
+def base_graph():
+    g = Graph()
+    for name, weight in (("alice", 60), ("bob", 80)):
+        g.add((EX[name], EX.name, Literal(name)))
+        g.add((EX[name], EX.weight, Literal(weight)))
+    return g
+
+
+def first_update(sink):
+    sink.set((EX.alice, EX.weight, Literal(61)))
+    sink.add((EX.carol, EX.name, Literal("carol")))
+    sink.set((EX.carol, EX.weight, Literal(55)))
+    # The last SET of a pass replaces the previous ones
+    sink.set((EX.carol, EX.weight, Literal(56)))
+
+
+def second_update(sink):
+    sink.set((EX.bob, EX.weight, Literal(79)))
+    sink.set((EX.alice, EX.weight, Literal(62)))
+    sink.add((EX.bob, EX.name, Literal("bob")))
+
+
+def test_compacted_deltas_equal_the_updates_applied_to_the_graph(tmp_path):
+    rdf_file = str(tmp_path / "output.ttl")
+    base_graph().serialize(destination=rdf_file, format="turtle")
+
+    expected = base_graph()
+    for update in (first_update, second_update):
+        update(expected)
+        with DeltaSink(next_delta_file(rdf_file)) as sink:
+            update(sink)
+
+    assert len(delta_files(rdf_file)) == 2
+    assert set(load_graph_with_deltas(rdf_file)) == set(expected)
+
+    assert compact(rdf_file) == 2
+    assert delta_files(rdf_file) == []
+    assert set(Graph().parse(rdf_file, format="turtle")) == set(expected)
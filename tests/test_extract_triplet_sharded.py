@@ -0,0 +1,76 @@
+import sys
+import types
+
+import pandas as pd
+import pytest
+
+import extract_triplet_sharded
+from extract_triplet_sharded import load_done, merge_shards, run_shard, shard_paths
+
+
+class Crash(Exception):
+    pass
+
+
+class FakeExtractor:
+    """Extractor without a model: one triplet per chunk, and a crash after crash_after chunks"""
+    crash_after = None
+    extracted = []
+
+    def __init__(self, model_name, cache_path=None):
+        pass
+
+    def extract_triplets_batched(self, chunks, batch_size):
+        for i, chunk in enumerate(chunks):
+            if FakeExtractor.crash_after is not None and len(FakeExtractor.extracted) >= FakeExtractor.crash_after:
+                raise Crash()
+            FakeExtractor.extracted.append(chunk)
+            yield i, [{'head': chunk, 'type': 'mention', 'tail': 'x'}]
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'extract_triplet', types.SimpleNamespace(TripletExtractor=FakeExtractor))
+    monkeypatch.setitem(sys.modules, 'torch', types.SimpleNamespace(set_num_threads=lambda n: None))
+    FakeExtractor.crash_after = None
+    FakeExtractor.extracted = []
+
+
+@pytest.fixture
+def text_file(tmp_path):
+    path = tmp_path / "text.txt"
+    path.write_text("\n\n".join(f"chunk {i}" for i in range(10)), encoding='utf-8')
+    return path
+
+
+def test_checkpoint_lists_the_chunks_processed_before_a_crash(fake_model, text_file, tmp_path):
+    FakeExtractor.crash_after = 3
+    with pytest.raises(Crash):
+        run_shard(text_file, tmp_path, 0, 1, 'model', 1, None)
+
+    assert load_done(tmp_path) == {0, 1, 2}
+    output_path, _ = shard_paths(tmp_path, 0)
+    assert list(pd.read_csv(output_path)['chunk_id']) == [0, 1, 2]
+
+
+def test_resume_with_another_worker_count(fake_model, text_file, tmp_path):
+    FakeExtractor.crash_after = 4
+    for shard_id in range(3):
+        try:
+            run_shard(text_file, tmp_path, shard_id, 3, 'model', 1, None)
+        except Crash:
+            pass
+    done = load_done(tmp_path)
+    assert len(done) == 4
+
+    FakeExtractor.crash_after = None
+    FakeExtractor.extracted = []
+    extract_triplet_sharded.clean_shards(tmp_path)
+    for shard_id in range(2):
+        run_shard(text_file, tmp_path, shard_id, 2, 'model', 2, None)
+
+    # Only the chunks missing from the checkpoints are processed again
+    assert len(FakeExtractor.extracted) == 10 - len(done)
+    output_csv = tmp_path / "triplets.csv"
+    assert merge_shards(tmp_path, output_csv) == 10
+    assert list(pd.read_csv(output_csv)['head']) == [f"chunk {i}" for i in range(10)]
@@ -0,0 +1,79 @@
+import csv
+
+import pytest
+from rdflib import Graph, Literal, URIRef
+
+from incremental import convert_incremental
+
+EX = "http://example.org/"
+
+
+def medal_rows(sink, f, namespace, fileName, context=None):
+    """One triple per row, plus the country triple shared by the rows of the same country."""
+    context["calls"] = context.get("calls", 0) + 1
+    for row in csv.DictReader(f):
+        name, country = row["name"], row["country"]
+        athlete = URIRef(EX + name)
+        sink.add((athlete, URIRef(EX + "country"), URIRef(EX + country)))
+        sink.add((URIRef(EX + country), URIRef(EX + "label"), Literal(country)))
+
+
+def write_csv(path, rows):
+    path.write_text("name,country\n" + "".join(f"{name},{country}\n" for name, country in rows), encoding="utf-8")
+
+
+def convert(tmp_path, rows):
+    csv_file = tmp_path / "medals.csv"
+    write_csv(csv_file, rows)
+    rdf_file = str(tmp_path / "medals.nt")
+    convert_incremental(str(csv_file), "utf-8", rdf_file, rdf_file + ".manifest.json", medal_rows, {})
+    return Graph().parse(rdf_file, format="nt")
+
+
+def full_conversion(rows):
+    g = Graph()
+    for name, country in rows:
+        medal_rows(g, ["name,country\n", f"{name},{country}\n"], {}, "medals.csv", {})
+    return g
+
+
+def test_adding_and_removing_rows_gives_the_full_conversion(tmp_path):
+    first = [("alice", "FRA"), ("bob", "FRA"), ("carol", "USA")]
+    assert set(convert(tmp_path, first)) == set(full_conversion(first))
+
+    second = [("alice", "FRA"), ("carol", "USA"), ("dave", "JPN")]
+    g = convert(tmp_path, second)
+    assert set(g) == set(full_conversion(second))
+    # FRA is still produced by alice, so removing bob keeps it
+    assert (URIRef(EX + "FRA"), URIRef(EX + "label"), Literal("FRA")) in g
+
+    third = [("carol", "USA"), ("dave", "JPN")]
+    g = convert(tmp_path, third)
+    assert set(g) == set(full_conversion(third))
+    assert (URIRef(EX + "FRA"), None, None) not in g
+
+
+def test_unchanged_rows_are_not_converted_again(tmp_path):
+    rows = [("alice", "FRA"), ("bob", "FRA")]
+    convert(tmp_path, rows)
+    calls = []
+
+    def counting_rows(sink, f, namespace, fileName, context=None):
+        calls.append(context)
+        medal_rows(sink, f, namespace, fileName, context)
+
+    csv_file = tmp_path / "medals.csv"
+    write_csv(csv_file, rows + [("carol", "USA"), ("dave", "JPN")])
+    rdf_file = str(tmp_path / "medals.nt")
+    convert_incremental(str(csv_file), "utf-8", rdf_file, rdf_file + ".manifest.json", counting_rows, {})
+    assert len(calls) == 2
+    # the rows of one file share the same context
+    assert calls[0] is calls[1] and calls[0]["calls"] == 2
+
+
+def test_turtle_output_is_refused(tmp_path):
+    csv_file = tmp_path / "medals.csv"
+    write_csv(csv_file, [("alice", "FRA")])
+    rdf_file = str(tmp_path / "medals.ttl")
+    with pytest.raises(ValueError):
+        convert_incremental(str(csv_file), "utf-8", rdf_file, rdf_file + ".manifest.json", medal_rows, {})
@@ -0,0 +1,29 @@
+import random
+
+from shards import sort_shard_file
+
+
+def test_sort_by_runs_gives_the_sorted_distinct_lines(tmp_path):
+    random.seed(0)
+    lines = [f"<http://example.org/{random.randint(0, 50)}> <http://example.org/p> \"{i % 7}\" .\n"
+             for i in range(200)]
+    shard_file = tmp_path / "shard_0.nt"
+    shard_file.write_text("".join(lines), encoding="utf-8")
+
+    count = sort_shard_file(str(shard_file), run_size=16)
+
+    expected = sorted(set(lines))
+    assert count == len(expected)
+    assert shard_file.read_text(encoding="utf-8") == "".join(expected)
+    assert [path.name for path in tmp_path.iterdir()] == ["shard_0.nt"]
+
+
+def test_single_run_and_empty_shard(tmp_path):
+    shard_file = tmp_path / "shard_0.nt"
+    shard_file.write_text("b .\na .\nb .\n", encoding="utf-8")
+    assert sort_shard_file(str(shard_file)) == 2
+    assert shard_file.read_text(encoding="utf-8") == "a .\nb .\n"
+
+    shard_file.write_text("", encoding="utf-8")
+    assert sort_shard_file(str(shard_file), run_size=4) == 0
+    assert shard_file.read_text(encoding="utf-8") == ""